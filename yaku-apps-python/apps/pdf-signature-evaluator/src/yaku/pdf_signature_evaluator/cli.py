@@ -8,9 +8,14 @@ from typing import Optional
 import click
 from loguru import logger
 from yaku.autopilot_utils.cli_base import make_autopilot_app, read_version_from_package
+from yaku.autopilot_utils.lazy import lazy_callable
 from yaku.autopilot_utils.results import ResultsCollector
 
-from .digital_signature_verification import digital_signature_verification
+# pyhanko takes long to import, so only import it when evaluating signatures
+digital_signature_verification = lazy_callable(
+    "yaku.pdf_signature_evaluator.digital_signature_verification"
+    ":digital_signature_verification"
+)
 
 
 class CLI:
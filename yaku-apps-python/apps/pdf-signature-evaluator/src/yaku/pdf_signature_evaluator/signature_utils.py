@@ -17,7 +17,7 @@ from pyhanko.sign.validation.pdf_embedded import EmbeddedPdfSignature
 from pyhanko.sign.validation.settings import KeyUsageConstraints
 from pyhanko.sign.validation.status import PdfSignatureStatus
 from pyhanko_certvalidator import ValidationContext
-from yaku.autopilot_utils.checks import check
+from yaku.autopilot_utils.checks import check_many
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
 from yaku.autopilot_utils.results import RESULTS, Result
 from yaku.pdf_signature_evaluator.constants import ERROR_MESSAGES
@@ -125,15 +125,11 @@ def verifiy_signature_date(
 
     logger.debug(f"Signature dates: {signature_dates}")
 
-    signature_date_checks = list()
-    for date in signature_dates:
-        signature_date_checks.append(
-            check(
-                checked_value=str(date),
-                operator=rule.operator,
-                other_value=str(rule.other_value),
-            )
-        )
+    signature_date_checks = check_many(
+        [str(date) for date in signature_dates],
+        operator=rule.operator,
+        other_value=str(rule.other_value),
+    )
 
     any_all = rule.property
     outcome = any(signature_date_checks) if any_all == "one-of" else all(signature_date_checks)
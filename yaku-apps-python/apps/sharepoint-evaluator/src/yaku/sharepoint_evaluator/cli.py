@@ -3,17 +3,19 @@
 # SPDX-License-Identifier: MIT
 
 import os
+from pathlib import Path
+from typing import Dict, List
 
 import click
 from loguru import logger
-from yaku.autopilot_utils.checks import check
+from yaku.autopilot_utils.checks import conversion_cache_info
 from yaku.autopilot_utils.cli_base import make_autopilot_app, read_version_from_package
 from yaku.autopilot_utils.errors import AutopilotConfigurationError
-from yaku.autopilot_utils.results import RESULTS, Result
+from yaku.autopilot_utils.results import RESULTS, CompactResult
 
 from .config import ConfigFile, Settings
 from .rules import read_file_rules
-from .utils import PropertiesReader
+from .utils import MANIFEST_FILE_NAME, MISSING, PROPERTIES_FILE_SUFFIX, PropertiesReader
 
 
 def configure_properties_reader(reader: PropertiesReader, mapping_config: str):
@@ -57,6 +59,8 @@ class CLI:
     click_help_text = (
         "An evaluator to evaluate properties of files downloaded by the sharepoint-fetcher."
     )
+    # one result per file and rule, so don't keep them all in memory
+    click_stream_results = True
 
     click_setup = [
         click.option(
@@ -126,11 +130,16 @@ def sharepoint_evaluator(settings: Settings, config_file: ConfigFile):
     global all_green, some_yellow
     all_green = True
     some_yellow = False
+    found_files_by_filter: Dict[Path, List[Path]] = {}
     for file_rule in file_rules:
         file_filter = file_rule.file
-        # TODO: rewrite the glob here to properly deal with wildcards in folder names
-        # TODO: rewrite the glob here to find files for which only a properties json file was downloaded
-        found_files = list(file_filter.parent.glob(file_filter.name))
+        if file_filter not in found_files_by_filter:
+            # TODO: rewrite the glob here to properly deal with wildcards in folder names
+            # TODO: rewrite the glob here to find files for which only a properties json file was downloaded
+            found_files_by_filter[file_filter] = list(
+                file_filter.parent.glob(file_filter.name)
+            )
+        found_files = found_files_by_filter[file_filter]
         if not found_files:
             msg = (
                 f"File filter `{file_filter.relative_to(settings.evidence_path)}` mentioned in the config file "
@@ -144,31 +153,38 @@ def sharepoint_evaluator(settings: Settings, config_file: ConfigFile):
                 msg += ", ".join([r.nice() for r in file_rule.rules])
                 msg += ")"
             raise AutopilotConfigurationError(msg)
-        for file in found_files:
-            if file.name.endswith(".__properties__.json"):
-                # TODO: remove once the TODOs above are resolved and new glob doesn't match properties json files
-                continue
+        # TODO: remove filter once the TODOs above are resolved and new glob doesn't match properties json files
+        found_files = [
+            f
+            for f in found_files
+            if not f.name.endswith(PROPERTIES_FILE_SUFFIX) and f.name != MANIFEST_FILE_NAME
+        ]
+        property_columns = [
+            reader.get_property_column(found_files, rule.property) for rule in file_rule.rules
+        ]
+        compiled_checks = [rule.compile() for rule in file_rule.rules]
+        nice_rules = [rule.nice() for rule in file_rule.rules]
+        for index, file in enumerate(found_files):
+            relative_file = file.relative_to(settings.evidence_path)
             if not file_rule.rules:
                 some_yellow = True
-                logger.warning(
-                    "Config has no rules for file {}",
-                    file.relative_to(settings.evidence_path),
-                )
+                logger.warning("Config has no rules for file {}", relative_file)
                 RESULTS.append(
-                    Result(
-                        criterion=f"Config has no rules for file `{file.relative_to(settings.evidence_path)}`",
+                    CompactResult(
+                        criterion=f"Config has no rules for file `{relative_file}`",
                         fulfilled=False,
-                        justification=f"Config has no rules for file `{file.relative_to(settings.evidence_path)}`",
+                        justification=f"Config has no rules for file `{relative_file}`",
                     )
                 )
-            for rule in file_rule.rules:
-                property_value = reader.get_file_property(file, rule.property)
-                success = check(
-                    checked_value=property_value,
-                    operator=rule.operator,
-                    other_value=rule.other_value,
-                )
-                justification = f"Check of rule ({rule.nice()}) for `{file.relative_to(settings.evidence_path)}` with value `{property_value}` "
+            for rule, compiled_check, nice_rule, property_column in zip(
+                file_rule.rules, compiled_checks, nice_rules, property_columns
+            ):
+                property_value = property_column[index]
+                if property_value is MISSING:
+                    # raises the appropriate error
+                    property_value = reader.get_file_property(file, rule.property)
+                success = compiled_check(property_value)
+                justification = f"Check of rule ({nice_rule}) for `{relative_file}` with value `{property_value}` "
                 fulfilled = False
                 if not success:
                     justification += "was not successful!"
@@ -177,12 +193,13 @@ def sharepoint_evaluator(settings: Settings, config_file: ConfigFile):
                     justification += "was successful."
                     fulfilled = True
                 RESULTS.append(
-                    Result(
-                        criterion=f"Check of {rule.nice()} must be successful",
+                    CompactResult(
+                        criterion=f"Check of {nice_rule} must be successful",
                         fulfilled=fulfilled,
                         justification=justification,
                     )
                 )
+    logger.debug("Conversion cache statistics: {}", conversion_cache_info())
 
 
 main = make_autopilot_app(
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Union
 
-from yaku.autopilot_utils.checks import checks_dict
+from yaku.autopilot_utils.checks import CompiledCheck, checks_dict, compile_check
 from yaku.autopilot_utils.errors import AutopilotConfigurationError
 
 from .config import ConfigFileContent
@@ -36,6 +36,14 @@ class Rule:
         except Exception:
             return str(self)
 
+    def compile(self) -> CompiledCheck:
+        """
+        Return a function which checks a property value against this rule.
+
+        See `compile_check` for details.
+        """
+        return compile_check(self.operator, self.other_value)
+
 
 @dataclass
 class FileRules:
@@ -3,15 +3,26 @@
 # SPDX-License-Identifier: MIT
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from loguru import logger
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, FileNotFoundError
 
+PROPERTIES_FILE_SUFFIX = ".__properties__.json"
+
+# written by the sharepoint-fetcher in incremental mode, it isn't evidence itself
+MANIFEST_FILE_NAME = "__manifest__.json"
+
+# marks values in a property column which are not available
+MISSING = object()
+
 
 class PropertiesReader:
     def __init__(self, custom_property_definitions_file: Path):
         self._cache: Dict[str, Any] = {}
+        self._columns: Dict[str, Dict[str, Any]] = {}
         self._property_map: Optional[Dict[str, Dict[str, str]]] = None
         self._property_name_map: Dict[str, str] = {}
         self._custom_property_definitions_file = custom_property_definitions_file
@@ -61,6 +72,83 @@ class PropertiesReader:
         """
         self._property_name_map[list_name] = property_name
 
+    @staticmethod
+    def _read_properties_file(properties_file: Path) -> Dict[str, Any]:
+        with properties_file.open("r") as fh:
+            return json.load(fh)  # type: ignore
+
+    def _try_read_properties_file(self, properties_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return self._read_properties_file(properties_file)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read properties file `{}`: {}", properties_file, e)
+            return None
+
+    def load_files(self, file_paths: Sequence[Path], max_workers: int = 1) -> int:
+        """
+        Read the properties files of the given files at once.
+
+        Files without properties file and files which were already read are
+        skipped. Properties files which cannot be read are skipped with a
+        warning, `get_file_property` reports the error if the properties are
+        needed. With `max_workers > 1`, the files are read by a pool of threads.
+        Returns the number of read files.
+        """
+        properties_files = []
+        for file_path in file_paths:
+            properties_file = file_path.with_suffix(file_path.suffix + PROPERTIES_FILE_SUFFIX)
+            if str(properties_file) not in self._cache and properties_file.is_file():
+                properties_files.append(properties_file)
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(self._try_read_properties_file, properties_files))
+        else:
+            contents = [self._try_read_properties_file(f) for f in properties_files]
+        read_count = 0
+        for properties_file, properties in zip(properties_files, contents):
+            if properties is not None:
+                self._cache[str(properties_file)] = properties
+                read_count += 1
+        if read_count:
+            self._columns.clear()
+        return read_count
+
+    def _get_column(self, name: str) -> Dict[str, Any]:
+        """Return the values of the raw property `name` for all loaded files."""
+        if name not in self._columns:
+            self._columns[name] = {
+                cache_key: properties.get(name, MISSING)
+                for cache_key, properties in self._cache.items()
+            }
+        return self._columns[name]
+
+    def get_property_column(self, file_paths: Sequence[Path], property_name: str) -> List[Any]:
+        """
+        Get the values of a property for many files at once.
+
+        The values are looked up in a column index of all loaded properties
+        (see `load_files`), so the property name and its list mapping are only
+        resolved once. Files which were not loaded yet are read on demand.
+
+        Values which cannot be retrieved are returned as `MISSING`. To get a
+        proper error message, call `get_file_property` for those files.
+        """
+        name = self._property_name_map.get(property_name, property_name)
+        is_mapped = property_name in self._property_name_map
+        self.load_files(file_paths)
+        column = self._get_column(name)
+
+        values = []
+        for file_path in file_paths:
+            properties_file = file_path.with_suffix(file_path.suffix + PROPERTIES_FILE_SUFFIX)
+            value = column.get(str(properties_file), MISSING)
+            if value is None:
+                value = ""
+            elif value is not MISSING and is_mapped:
+                value = self.property_map.get(property_name, {}).get(str(value), MISSING)
+            values.append(value)
+        return values
+
     def get_file_property(self, file_path: Path, property_name: str) -> Any:
         """
         Get property of a file.
@@ -70,9 +158,12 @@ class PropertiesReader:
         the id is automatically replaced by the list value, e.g. instead
         of a `Status=1`, you'll get a `Status="Draft"` or similar.
         """
-        properties_file = file_path.with_suffix(file_path.suffix + ".__properties__.json")
+        properties_file = file_path.with_suffix(file_path.suffix + PROPERTIES_FILE_SUFFIX)
 
-        if not file_path.exists() and not properties_file.exists():
+        cache_key = str(properties_file)
+        if cache_key not in self._cache and (
+            not file_path.exists() and not properties_file.exists()
+        ):
             other_possible_files = file_path.parent.glob("*")
             alternatives_list = "".join([f"- {p}\n" for p in other_possible_files])
             raise AutopilotConfigurationError(
@@ -81,11 +172,9 @@ class PropertiesReader:
                 f"{alternatives_list}"
             )
 
-        cache_key = str(properties_file)
         if cache_key not in self._cache:
-            with properties_file.open("r") as fh:
-                properties = json.load(fh)
-            self._cache[cache_key] = properties
+            self._cache[cache_key] = self._read_properties_file(properties_file)
+            self._columns.clear()
 
         try:
             if property_name in self._property_name_map:
@@ -450,6 +450,76 @@ def test_cli_finds_file_in_rule_with_wildcard(tmp_path: Path):
     assert '"result": {"criterion":' in result.output
 
 
+def test_cli_ignores_invalid_properties_files_of_other_files(tmp_path: Path):
+    (tmp_path / "some.docx").touch()
+    (tmp_path / "some.docx.__properties__.json").write_text(json.dumps({"prop1": "value1"}))
+    (tmp_path / "other.txt").touch()
+    (tmp_path / "other.txt.__properties__.json").write_text("{no json")
+
+    rule_file = tmp_path / "config.yaml"
+    rule_file.write_text(
+        """\
+        - file: "some.docx"
+          rules:
+            - property: prop1
+              equals: value1
+    """
+    )
+
+    options = [
+        "--config-file",
+        str(rule_file),
+        "--evidence-path",
+        str(tmp_path),
+    ]
+    runner = click.testing.CliRunner()
+    app = make_autopilot_app(
+        version_callback=read_version_from_package(__package__),
+        provider=CLI,
+    )
+
+    result = runner.invoke(app, options)
+    assert result.exit_code == 0
+    assert '"status": "GREEN"' in result.output
+
+
+def test_cli_ignores_manifest_of_fetcher(tmp_path: Path):
+    evidence_path = tmp_path / "evidence"
+    evidence_path.mkdir()
+    (evidence_path / "some.docx").touch()
+    (evidence_path / "some.docx.__properties__.json").write_text(
+        json.dumps({"prop1": "value1"})
+    )
+    (evidence_path / "__manifest__.json").write_text(json.dumps({"some.docx": {"id": "1"}}))
+
+    rule_file = tmp_path / "config.yaml"
+    rule_file.write_text(
+        """\
+        - file: "*"
+          rules:
+            - property: prop1
+              equals: value1
+    """
+    )
+
+    options = [
+        "--config-file",
+        str(rule_file),
+        "--evidence-path",
+        str(evidence_path),
+    ]
+    runner = click.testing.CliRunner()
+    app = make_autopilot_app(
+        version_callback=read_version_from_package(__package__),
+        provider=CLI,
+    )
+
+    result = runner.invoke(app, options)
+    assert result.exit_code == 0
+    assert '"status": "GREEN"' in result.output
+    assert "__manifest__.json" not in result.output
+
+
 def test_cli_treats_as_failure_if_wildcard_does_not_match_anything(tmp_path: Path):
     other_file = tmp_path / "some.docx"
     other_file.touch()
@@ -150,3 +150,9 @@ def test_read_file_rules(tmp_path: Path):
 )
 def test_nice_representation_of_rules(operator, phrase):
     assert Rule("A", operator, "B").nice() == f"Property `A` {phrase} `B`"
+
+
+def test_compiled_rule_with_invalid_other_value_raises_when_checking():
+    compiled_check = Rule("A", "larger", "many").compile()
+    with pytest.raises(AutopilotConfigurationError, match="Could not convert `many`"):
+        compiled_check("1")
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 from yaku.autopilot_utils.errors import AutopilotConfigurationError
-from yaku.sharepoint_evaluator.utils import PropertiesReader
+from yaku.sharepoint_evaluator.utils import MISSING, PropertiesReader
 
 DATA_PATH = Path(__file__).parent / "data"
 
@@ -51,3 +51,40 @@ def test_get_file_custom_property_with_invalid_property_value(reader: Properties
     reader.add_list_to_property_mapping("Some Status", "SomeStatusId")
     assert reader.get_file_property(DATA_PATH / "ProcessStatus.docx", "SomeStatusId") == ""
     reader.get_file_property(DATA_PATH / "ProcessStatus.docx", "Some Status")
+
+
+def test_load_files_reads_properties_files_once(reader: PropertiesReader):
+    files = [DATA_PATH / "ProcessStatus.docx", DATA_PATH / "non-existing-file"]
+    assert reader.load_files(files, max_workers=4) == 1
+    assert reader.load_files(files) == 0
+
+
+def test_load_files_skips_invalid_properties_files(tmp_path: Path, mocker):
+    logger = mocker.patch("yaku.sharepoint_evaluator.utils.logger")
+    (tmp_path / "broken.docx").touch()
+    (tmp_path / "broken.docx.__properties__.json").write_text("{no json")
+    (tmp_path / "valid.docx").touch()
+    (tmp_path / "valid.docx.__properties__.json").write_text('{"CSC": "1"}')
+    reader = PropertiesReader(tmp_path / "__custom_property_definitions__.json")
+    files = [tmp_path / "broken.docx", tmp_path / "valid.docx"]
+
+    assert reader.load_files(files) == 1
+    logger.warning.assert_called_once()
+    assert reader.get_property_column(files, "CSC") == [MISSING, "1"]
+
+
+def test_get_property_column(reader: PropertiesReader):
+    reader.add_list_to_property_mapping("RevisionStatus", "RevisionStatusId")
+    files = [DATA_PATH / "ProcessStatus.docx", DATA_PATH / "non-existing-file"]
+    reader.load_files(files)
+
+    assert reader.get_property_column(files, "CSC") == ["1", MISSING]
+    assert reader.get_property_column(files, "RevisionStatus") == ["Draft", MISSING]
+    assert reader.get_property_column(files, "SomeStatusId") == ["", MISSING]
+    assert reader.get_property_column(files, "some-unknown-property") == [MISSING, MISSING]
+
+
+def test_get_property_column_reads_files_which_were_not_loaded(reader: PropertiesReader):
+    files = [DATA_PATH / "ProcessStatus.docx"]
+    assert reader.get_property_column(files, "CSC") == ["1"]
+    assert reader.get_file_property(files[0], "CSC") == "1"
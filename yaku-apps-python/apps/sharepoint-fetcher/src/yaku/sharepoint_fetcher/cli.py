@@ -12,6 +12,7 @@ import requests
 from loguru import logger
 from yaku.autopilot_utils.cli_base import make_autopilot_app, read_version_from_package
 from yaku.autopilot_utils.errors import AutopilotConfigurationError
+from yaku.autopilot_utils.metrics import METRICS
 
 from .config import ConfigFile, FilterConfigFile, FilterConfigFileContent, Settings
 from .config_file_utils import merge_cli_and_file_params
@@ -141,6 +142,17 @@ class CLI:
             help="Path to the filter config file",
         ),
         click.option("--config-file", required=False, help="Path to the config file"),
+        click.option(
+            "--max-workers",
+            required=False,
+            help="Number of files or folders which are downloaded in parallel (default: 1)",
+        ),
+        click.option(
+            "--incremental",
+            required=False,
+            help="Only download files which changed since the last run into the destination folder"
+            + " and delete files which are no longer fetched (uses a `__manifest__.json` file)",
+        ),
     ]
 
     @staticmethod
@@ -161,6 +173,8 @@ class CLI:
         download_properties_only: bool,
         filter_config_file: str,
         config_file: str,
+        max_workers: str,
+        incremental: bool,
     ):
         logger.info("Configuring SharePoint Fetcher")
         extracted_fields: Dict[str, Any] = {}
@@ -188,6 +202,8 @@ class CLI:
             "download_properties_only": download_properties_only,
             "filter_config_file": filter_config_file,
             "config_file": config_file,
+            "max_workers": max_workers,
+            "incremental": incremental,
         }
         merged_params = merge_cli_and_file_params(cli_arguments, extracted_fields)
         settings = Settings(
@@ -205,6 +221,8 @@ class CLI:
             custom_properties=merged_params.get("custom_properties"),
             download_properties_only=merged_params.get("download_properties_only"),
             sharepoint_file=merged_params.get("file"),
+            max_workers=merged_params.get("max_workers"),
+            incremental=merged_params.get("incremental"),
         )
         parsed_filter_config_file = FilterConfigFile(
             file_path=merged_params.get("filter_config_file")
@@ -225,12 +243,14 @@ def trigger_fetcher(filter_config_file: FilterConfigFile, settings: Settings):
     if settings.custom_properties:
         configure_properties_reader(sharepoint._properties_reader, settings.custom_properties)
 
-    sharepoint.check_dir_access(settings.sharepoint_file)
+    with METRICS.span("sharepoint.check_access"):
+        sharepoint.check_dir_access(settings.sharepoint_file)
 
     if settings.sharepoint_file:
         try:
-            sharepoint.download_file(settings.sharepoint_path, settings.sharepoint_file)
-            sharepoint.download_custom_property_definitions()
+            with METRICS.span("sharepoint.download"):
+                sharepoint.download_file(settings.sharepoint_path, settings.sharepoint_file)
+                sharepoint.download_custom_property_definitions()
         except requests.exceptions.HTTPError as e:
             if e.response is not None and e.response.status_code == 404:
                 raise AutopilotConfigurationError(
@@ -240,8 +260,11 @@ def trigger_fetcher(filter_config_file: FilterConfigFile, settings: Settings):
             else:
                 raise
     else:
-        sharepoint.download_custom_property_definitions()
-        sharepoint.download_folder()
+        with METRICS.span("sharepoint.download"):
+            sharepoint.download_custom_property_definitions()
+            sharepoint.download_folder()
+    sharepoint.save_manifest()
+    sharepoint.log_request_stats()
 
     if settings.sharepoint_path is not None and settings.sharepoint_site is not None:
         folder_path = settings.sharepoint_path
@@ -2,19 +2,93 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Any, Dict, List, Tuple
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote, urlparse
 
 import requests
+from loguru import logger
 from yaku.autopilot_utils.errors import (
     AutopilotConfigurationError,
     AutopilotError,
     AutopilotFileNotFoundError,
 )
+from yaku.sharepoint_fetcher.file_download import save_response_content
+from yaku.sharepoint_fetcher.throttling import (
+    MAX_RETRIES,
+    THROTTLING_STATUS_CODES,
+    RequestStats,
+    ThrottlingAdapter,
+    get_retry_delay,
+)
+
+from .token_provider import (
+    DEFAULT_EXPIRES_IN,
+    BearerTokenAuth,
+    TokenProvider,
+    default_token_cache_file,
+)
 
 RESOURCE = "https://graph.microsoft.com/"
 GRANT_TYPE = "client_credentials"
 SCOPE = "Sites.Selected"
+GRAPH_API = "https://graph.microsoft.com/v1.0"
+# maximum number of requests which can be combined into a single JSON batch request
+BATCH_SIZE = 20
+# only those properties of folder children are needed for listing folders and files
+CHILDREN_SELECT = "name,id,file,folder,size,eTag,lastModifiedDateTime"
+# number of folder children which are requested per page
+CHILDREN_PAGE_SIZE = 999
+# marker for using the default token cache file of `Connect`
+DEFAULT_TOKEN_CACHE_FILE = Path("<default>")
+
+
+class IdCache:
+    """
+    Remember Graph API ids which were already resolved during a session.
+
+    Site, drive and folder ids never change while the fetcher is running, but
+    each of them costs an extra HTTP request to resolve. The cache stores them
+    keyed by their kind and path, e.g. `("folder", "Documents", "Some/Path")`.
+
+    The `hits` and `misses` counters can be used to check how many requests
+    were saved.
+
+    The cache can be shared between threads. Two threads asking for the same
+    unknown id at the same time may both resolve it.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Tuple[Optional[str], ...], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Optional[str], ...], resolve: Callable[[], Optional[str]]):
+        """
+        Return the id for `key` and call `resolve` to look it up if it is not yet known.
+
+        Empty results (e.g. a `None` drive id) are not cached.
+        """
+        with self._lock:
+            if key in self._ids:
+                self.hits += 1
+                return self._ids[key]
+            self.misses += 1
+        value = resolve()
+        if value:
+            with self._lock:
+                self._ids[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+            self.hits = 0
+            self.misses = 0
 
 
 class Connect:
@@ -31,41 +105,89 @@ class Connect:
 
     Provide functionality for both default root SharePoint documents at "Shared Documents"
     and also custom document libraries.
+
+    Access tokens are refreshed shortly before they expire, and requests which
+    are rejected with `401` are retried once with a new token. Tokens are
+    cached in `token_cache_file` (by default in a private folder of the current
+    user in the temporary directory), so that later fetcher runs can reuse
+    them. Pass `token_cache_file=None` to keep tokens in memory only.
+
+    Throttled requests are retried (see `ThrottlingAdapter`), and the number
+    of concurrent requests is limited to `pool_size`. Statistics about all
+    requests are collected in `request_stats`.
     """
 
-    def __init__(self, sharepoint_site, tenant_id, client_id, client_secret, force_ip=None):
+    def __init__(
+        self,
+        sharepoint_site,
+        tenant_id,
+        client_id,
+        client_secret,
+        force_ip=None,
+        *,
+        pool_size: Optional[int] = None,
+        token_cache_file: Optional[Path] = DEFAULT_TOKEN_CACHE_FILE,
+    ):
         if sharepoint_site.endswith("/"):
             sharepoint_site = sharepoint_site[:-1]
         self._sharepoint_site = sharepoint_site
 
+        if token_cache_file is DEFAULT_TOKEN_CACHE_FILE:
+            token_cache_file = default_token_cache_file(tenant_id, client_id, RESOURCE)
+        self._token_provider = TokenProvider(
+            lambda: self._request_access_token(client_id, tenant_id, client_secret),
+            token_cache_file,
+        )
+
         session = requests.Session()
         self._force_ip = force_ip
-        session.headers = self._sharepoint_cloud_instance_connect(
-            client_id, tenant_id, client_secret
-        )
         session.verify = True
-        session.auth = None
+        # the token is added to every request, so that it is refreshed when it expires
+        session.auth = BearerTokenAuth(
+            lambda force_refresh=False: self._sharepoint_cloud_instance_connect(
+                client_id, tenant_id, client_secret, force_refresh=force_refresh
+            )
+        )
+        self.request_stats = RequestStats()
+        # allow one connection per worker thread
+        adapter = ThrottlingAdapter(max_concurrency=pool_size or 1, stats=self.request_stats)
+        session.mount("https://", adapter)
         self._session = session
+        # download URLs are pre-authenticated, so they are requested without token
+        self._download_session = requests.Session()
+        self._download_session.mount("https://", adapter)
+        self.id_cache = IdCache()
 
-    def _sharepoint_cloud_instance_connect(self, client_id, tenant_id, client_secret):
+    def _sharepoint_cloud_instance_connect(
+        self, client_id, tenant_id, client_secret, force_refresh=False
+    ):
         """
         Get the header needed for authentication and authorization for all the Microsoft Graph API calls.
 
         It requires the credential for the App Registration in Azure ( the client id,
         the tenant id and the client secret ).
+
+        The access token is only requested if there is no cached token which is
+        still valid, or if `force_refresh` is set.
         """
-        token_api = f"https://login.microsoftonline.com/{tenant_id}/oauth2/token"
-        payload = f"grant_type={GRANT_TYPE}&client_id={client_id}&client_secret={client_secret}&resource={RESOURCE}"
-        access_token_response = requests.request("POST", token_api, data=payload, verify=True)
-        access_token_response.raise_for_status()
-        response_data = access_token_response.json()
-        access_token = response_data["access_token"]
+        access_token = self._token_provider.get_token(force_refresh=force_refresh)
 
         headers = {
             "Authorization": f"Bearer {access_token}",
         }
         return headers
 
+    def _request_access_token(self, client_id, tenant_id, client_secret) -> Tuple[str, float]:
+        """Request a new access token and return it together with its lifetime in seconds."""
+        token_api = f"https://login.microsoftonline.com/{tenant_id}/oauth2/token"
+        payload = f"grant_type={GRANT_TYPE}&client_id={client_id}&client_secret={client_secret}&resource={RESOURCE}"
+        access_token_response = requests.request("POST", token_api, data=payload, verify=True)
+        access_token_response.raise_for_status()
+        response_data = access_token_response.json()
+        return response_data["access_token"], float(
+            response_data.get("expires_in", DEFAULT_EXPIRES_IN)
+        )
+
     def _exchange_url_by_domain_and_site_name(self, sharepoint_site: str) -> Tuple[str, str]:
         """
         Replace the url by the host and site name.
@@ -84,7 +206,12 @@ class Connect:
 
         It requires an authorized header. For more information,
         check the official Microsoft Graph Api Documentation.
+
+        The site id is resolved only once per `Connect` instance.
         """
+        return self.id_cache.get(("site",), self._resolve_site_id)
+
+    def _resolve_site_id(self):
         host, site_name = self._exchange_url_by_domain_and_site_name(self._sharepoint_site)
         response = self._session.get(
             f"https://graph.microsoft.com/v1.0/sites/{host}:/sites/{site_name}",
@@ -101,7 +228,14 @@ class Connect:
 
         For more information about document libraries on
         SharePoint, check the official Microsoft Graph Api Documentation.
+
+        The drive id is resolved only once per library name.
         """
+        return self.id_cache.get(
+            ("drive", library_name), lambda: self._resolve_drive_id(library_name)
+        )
+
+    def _resolve_drive_id(self, library_name):
         site_id = self.get_site_id(self._session.headers)
         url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives"
         response = self._session.get(url)  # nosec B113
@@ -184,7 +318,15 @@ class Connect:
         Get the folder id for a given SharePoint folder.
 
         It requires an authorized header and the site id.
+
+        The folder id is resolved only once per library name and folder path.
         """
+        return self.id_cache.get(
+            ("folder", library_name, folder),
+            lambda: self._resolve_folder_id(folder, library_name),
+        )
+
+    def _resolve_folder_id(self, folder, library_name):
         site_id = self.get_site_id(self._session.headers)
         if library_name is None:
             api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root:/{folder}"
@@ -198,6 +340,32 @@ class Connect:
         id = response_data["id"]
         return id
 
+    def iter_children(self, api: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all children of the folder given by the `children` API URL.
+
+        The children are requested page by page, following the `@odata.nextLink`
+        of each page, so that large folders are listed completely while only
+        one page is kept in memory. Only the properties in `CHILDREN_SELECT`
+        are requested.
+        """
+        separator = "&" if "?" in api else "?"
+        response = self._session.get(
+            f"{api}{separator}$select={CHILDREN_SELECT}&$top={CHILDREN_PAGE_SIZE}"
+        )
+        response.raise_for_status()
+        yield from self._iter_pages(response.json())
+
+    def _iter_pages(self, response_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        while True:
+            yield from response_data["value"]
+            next_link = response_data.get("@odata.nextLink")
+            if not next_link:
+                return
+            response = self._session.get(next_link)
+            response.raise_for_status()
+            response_data = response.json()
+
     def get_folders(self, relative_url, library_name) -> List[str]:
         """
         Get JSON structure of subfolders of given folder.
@@ -215,16 +383,11 @@ class Connect:
             drive_id = self.get_drive_id(self._session.headers, library_name)
             api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{folder_id}/children?$filter=folder ne null"
 
-        response = self._session.get(api)
-        response.raise_for_status()
-        response_data = response.json()
-        subfolders = []
         subfolders_path = []
-        for subfolder in response_data["value"]:
+        for subfolder in self.iter_children(api):
             subfolder_name = subfolder["name"]
             subfolder_path = f"{relative_url}/{subfolder_name}"
             subfolders_path.append(subfolder_path)
-            subfolders.append(subfolder_name)
         return subfolders_path
 
     def get_folders_root(self, library_name) -> List[str]:
@@ -241,11 +404,8 @@ class Connect:
             drive_id = self.get_drive_id(self._session.headers, library_name)
             api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root/children?$filter=folder ne null"
 
-        response = self._session.get(api)
-        response.raise_for_status()
-        response_data = response.json()
         subfolders_path = []
-        for subfolder in response_data["value"]:
+        for subfolder in self.iter_children(api):
             subfolder_name = subfolder["name"]
             subfolders_path.append(subfolder_name)
         return subfolders_path
@@ -264,12 +424,8 @@ class Connect:
             drive_id = self.get_drive_id(self._session.headers, library_name)
             api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/items/{folder_id}/children"
 
-        response = self._session.get(api)
-        response.raise_for_status()
-        response_data = response.json()
-
         files = []
-        for file in response_data["value"]:
+        for file in self.iter_children(api):
             if file.get("file"):
                 file_name = file["name"]
                 files.append(file_name)
@@ -289,38 +445,43 @@ class Connect:
             drive_id = self.get_drive_id(self._session.headers, library_name)
             api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root/children"
 
-        response = self._session.get(api)
-        response.raise_for_status()
-        response_data = response.json()
-
         files = []
-        for file in response_data["value"]:
+        for file in self.iter_children(api):
             if file.get("file"):
                 file_name = file["name"]
                 files.append(file_name)
 
         return files
 
-    def get_file_object(self, relative_url: str, file_name: str, library_name) -> bytes:
-        """
-        Get file from given relative path and under the given file name.
-
-        For info on `relative_url`, see class docs.
-        """
+    def _get_item_api(self, relative_url: str, file_name: str, library_name) -> str:
         encoded_file_name = quote(file_name)
         site_id = self.get_site_id(self._session.headers)
         if library_name is None:
-            api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
-        else:
-            drive_id = self.get_drive_id(self._session.headers, library_name)
-            api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
+            return f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
+        drive_id = self.get_drive_id(self._session.headers, library_name)
+        return f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
 
-        response = self._session.get(api)
+    def _get_download_url_and_size(
+        self, relative_url: str, file_name: str, library_name
+    ) -> Tuple[str, int]:
+        response = self._session.get(self._get_item_api(relative_url, file_name, library_name))
         response.raise_for_status()
         response_data = response.json()
-        download_url = response_data["@microsoft.graph.downloadUrl"]
-        actual_size = response_data["size"]
-        download_file = requests.get(download_url)  # nosec B113
+        return response_data["@microsoft.graph.downloadUrl"], response_data["size"]
+
+    def get_file_object(self, relative_url: str, file_name: str, library_name) -> bytes:
+        """
+        Get file from given relative path and under the given file name.
+
+        The whole file is loaded into memory. Use `download_file_object` to
+        store larger files directly on disk.
+
+        For info on `relative_url`, see class docs.
+        """
+        download_url, actual_size = self._get_download_url_and_size(
+            relative_url, file_name, library_name
+        )
+        download_file = self._download_session.get(download_url)  # nosec B113
         download_file_size = len(download_file.content)
         if actual_size != download_file_size:
             raise AutopilotError(
@@ -329,6 +490,35 @@ class Connect:
             )
         return download_file.content
 
+    def download_file_object(
+        self,
+        relative_url: str,
+        file_name: str,
+        library_name,
+        file_path: Path,
+        file_properties: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Download file from given relative path and under the given file name into `file_path`.
+
+        The file contents are streamed in chunks to disk, so that the memory usage
+        does not depend on the file size. Returns the number of downloaded bytes.
+
+        If the `file_properties` of the file (as returned by `get_file_properties`)
+        are given, their download URL is used instead of requesting it again.
+
+        For info on `relative_url`, see class docs.
+        """
+        if file_properties and "@microsoft.graph.downloadUrl" in file_properties:
+            download_url = file_properties["@microsoft.graph.downloadUrl"]
+            actual_size = file_properties["size"]
+        else:
+            download_url, actual_size = self._get_download_url_and_size(
+                relative_url, file_name, library_name
+            )
+        response = self._download_session.get(download_url, stream=True)  # nosec B113
+        return save_response_content(response, file_path, actual_size)
+
     def get_file_properties(
         self, relative_url: str, file_name: str, library_name
     ) -> Dict[str, Any]:
@@ -339,15 +529,140 @@ class Connect:
 
         For info on `relative_url`, see class docs.
         """
-        encoded_file_name = quote(file_name)
-        site_id = self.get_site_id(self._session.headers)
-        if library_name is None:
-            api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
-        else:
-            drive_id = self.get_drive_id(self._session.headers, library_name)
-            api = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{relative_url}/{encoded_file_name}?$expand=listItem"
-
+        api = self._get_item_api(relative_url, file_name, library_name)
         response = self._session.get(api)
         response.raise_for_status()
         json_response = response.json()
         return json_response  # type: ignore
+
+    def _get_drive_api(self, library_name) -> str:
+        """Return the API path (relative to `GRAPH_API`) of the drive for `library_name`."""
+        site_id = self.get_site_id(self._session.headers)
+        if library_name is None:
+            return f"/sites/{site_id}/drive"
+        drive_id = self.get_drive_id(self._session.headers, library_name)
+        return f"/sites/{site_id}/drives/{drive_id}"
+
+    def batch_get(self, apis: List[str]) -> List[Dict[str, Any]]:
+        """
+        Send GET requests for all `apis` with as few JSON batch requests as possible.
+
+        The `apis` must be given relative to `GRAPH_API`, e.g. `/sites/{site_id}/drive`.
+        Up to `BATCH_SIZE` requests are combined into one `$batch` call.
+
+        Requests in a batch can be throttled individually. Those requests are
+        sent again in a new batch after the delay given by their `Retry-After`
+        header.
+
+        Returns the JSON bodies of the responses in the same order as `apis`.
+        Raises an `HTTPError` if one of the requests failed.
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(apis), BATCH_SIZE):
+            chunk = apis[start : start + BATCH_SIZE]
+            responses = self._send_batch(chunk)
+            for index, api in enumerate(chunk):
+                sub_response = responses[str(index)]
+                if sub_response["status"] >= 400:
+                    raise requests.exceptions.HTTPError(
+                        f"{sub_response['status']} Error for batched request {api}: "
+                        + json.dumps(sub_response.get("body"))
+                    )
+                results.append(sub_response["body"])
+        return results
+
+    def _send_batch(self, apis: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Send one batch request and return the responses by request id (index in `apis`)."""
+        responses: Dict[str, Dict[str, Any]] = {}
+        pending = {str(index): api for index, api in enumerate(apis)}
+        attempt = 0
+        while pending:
+            payload = {
+                "requests": [
+                    {"id": id, "method": "GET", "url": api} for id, api in pending.items()
+                ]
+            }
+            response = self._session.post(f"{GRAPH_API}/$batch", json=payload)
+            response.raise_for_status()
+            delay = 0.0
+            for sub_response in response.json()["responses"]:
+                if sub_response["status"] in THROTTLING_STATUS_CODES and attempt < MAX_RETRIES:
+                    delay = max(
+                        delay, get_retry_delay(sub_response.get("headers", {}), attempt)
+                    )
+                    continue
+                responses[sub_response["id"]] = sub_response
+                del pending[sub_response["id"]]
+            if pending:
+                logger.debug(
+                    "{} batched requests were throttled, retrying in {:.1f}s",
+                    len(pending),
+                    delay,
+                )
+                time.sleep(delay)
+                attempt += 1
+        return responses
+
+    def get_children_batch(
+        self, relative_urls: List[str], library_name
+    ) -> List[Tuple[List[str], List[str]]]:
+        """
+        Get subfolders and files for several folders at once.
+
+        An empty `relative_url` stands for the root folder of the document library.
+
+        For each folder, a tuple of the subfolder paths (as returned by `get_folders`
+        or `get_folders_root`) and the file names (as returned by `get_files`) is
+        returned, in the same order as `relative_urls`. All children are requested
+        with JSON batch requests, so no folder ids need to be resolved.
+
+        For info on `relative_url`, see class docs.
+        """
+        drive_api = self._get_drive_api(library_name)
+        apis = []
+        for relative_url in relative_urls:
+            folder = "/".join(part for part in relative_url.split("/") if part)
+            if folder:
+                api = f"{drive_api}/root:/{quote(folder)}:/children"
+            else:
+                api = f"{drive_api}/root/children"
+            apis.append(f"{api}?$select={CHILDREN_SELECT}&$top={CHILDREN_PAGE_SIZE}")
+        results = []
+        for relative_url, response_data in zip(relative_urls, self.batch_get(apis)):
+            subfolders_path = []
+            files = []
+            for child in self._iter_pages(response_data):
+                if "folder" in child:
+                    if relative_url.strip("/"):
+                        subfolders_path.append(f"{relative_url}/{child['name']}")
+                    else:
+                        subfolders_path.append(child["name"])
+                elif "file" in child:
+                    files.append(child["name"])
+            results.append((subfolders_path, files))
+        return results
+
+    def get_files_properties(
+        self, relative_url: str, file_names: List[str], library_name
+    ) -> List[Dict[str, Any]]:
+        """
+        Get properties for several files in the folder given by the relative path.
+
+        The properties are the same as returned by `get_file_properties`, but they
+        are requested with JSON batch requests. They are returned in the same order
+        as `file_names`.
+
+        For info on `relative_url`, see class docs.
+        """
+        if not file_names:
+            return []
+        drive_api = self._get_drive_api(library_name)
+        # batch request URLs are sent as they are, so the whole path must be encoded
+        folder = "/".join(part for part in relative_url.split("/") if part)
+        prefix = f"{quote(folder)}/" if folder else ""
+        return self.batch_get(
+            [
+                f"{drive_api}/root:/{prefix}{quote(file_name)}?$expand=listItem"
+                for file_name in file_names
+            ]
+        )
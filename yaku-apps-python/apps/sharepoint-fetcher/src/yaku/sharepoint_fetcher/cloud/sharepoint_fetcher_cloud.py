@@ -5,16 +5,18 @@
 import itertools
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from loguru import logger
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
+from yaku.sharepoint_fetcher.manifest import FileVersion
 from yaku.sharepoint_fetcher.sharepoint_fetcher import SharepointFetcher
 
 from ..selectors import FilesSelectors
-from .connect import Connect
+from .connect import BATCH_SIZE, Connect
 
 
 class SharepointFetcherCloud(SharepointFetcher):
@@ -34,6 +36,17 @@ class SharepointFetcherCloud(SharepointFetcher):
 
     It is also possible to download only the property files and no file contents.
     This can be enabled by providing `download_properties_only=True`.
+
+    Folders are downloaded one file at a time by default. With `max_workers > 1`,
+    folders are listed and files are downloaded by a pool of worker threads.
+
+    The properties of all files in a folder are requested with JSON batch
+    requests and are reused for the download of the file contents.
+
+    With `incremental=True`, the content tags of the downloaded files are
+    remembered in a manifest file in `destination_path`. On the next run, files
+    whose content didn't change are not downloaded again, and local files which
+    were removed remotely or are no longer selected are deleted.
     """
 
     metadata_file_suffix = ".__properties__.json"
@@ -51,6 +64,8 @@ class SharepointFetcherCloud(SharepointFetcher):
         list_title_property_map: Optional[Dict[str, str]] = None,
         download_properties_only: Optional[bool] = False,
         filter_config: Optional[List[FilesSelectors]] = None,
+        max_workers: int = 1,
+        incremental: bool = False,
     ):
         super().__init__(
             sharepoint_dir,
@@ -59,6 +74,7 @@ class SharepointFetcherCloud(SharepointFetcher):
             download_properties_only,
             list_title_property_map,
             filter_config,
+            incremental,
         )
 
         if tenant_id is None:
@@ -78,8 +94,18 @@ class SharepointFetcherCloud(SharepointFetcher):
                 "Missing value for Client Secret! You can provide the Client Secret either as environment"
                 + "variable SHAREPOINT_FETCHER_CLIENT_SECRET or as command line argument --client-secret."
             )
+        if max_workers < 1:
+            raise AutopilotConfigurationError(
+                f"Invalid number of workers: {max_workers}. It must be at least 1."
+            )
+        self._max_workers = max_workers
         self._connect = Connect(
-            self._sharepoint_site, tenant_id, client_id, client_secret, force_ip
+            self._sharepoint_site,
+            tenant_id,
+            client_id,
+            client_secret,
+            force_ip,
+            pool_size=max_workers,
         )
 
     def download_file(self, remote_path: str, file_name: str):
@@ -100,37 +126,214 @@ class SharepointFetcherCloud(SharepointFetcher):
         Iterate through all the folders present and download files recursively.
 
         The `remote_path` must not contain the site prefix.
+
+        If the fetcher was created with `max_workers > 1`, the folder tree is
+        processed by a pool of worker threads instead, see
+        `_download_folder_concurrently`.
         """
         if remote_path is None:
             remote_path = self._relative_url_prefix + "/" + self._sharepoint_dir
 
         assert remote_path.endswith("/"), f"{remote_path} should end with a /, but doesn't!"
 
-        output_path = self._destination_path.joinpath(
-            self._remove_sharepoint_dir_prefix(self._remove_url_prefix(remote_path))
+        if self._max_workers > 1:
+            self._download_folder_concurrently(remote_path)
+            return
+
+        output_path, subfolders_path, files = self._list_folder(remote_path)
+        for subfolder_path in subfolders_path:
+            self.download_folder(subfolder_path + "/")
+        if files is None:
+            return
+
+        short_remote_path = self._get_short_remote_path(remote_path)
+        files_selectors = self._get_files_selectors_for_file_path(short_remote_path)
+        selected_files = list(self._select_files(short_remote_path, files, files_selectors))
+        files_properties = self._fetch_files_properties(
+            remote_path, [file for file, _ in selected_files]
         )
+        downloaded_files_per_selector: List[List[str]] = [[] for _ in files_selectors]
+        for file, matching_files_selector_index in selected_files:
+            did_download_file = self._download_file(
+                output_path,
+                remote_path,
+                file,
+                files_selectors=files_selectors,
+                file_properties=files_properties[file],
+            )
+
+            if did_download_file and matching_files_selector_index is not None:
+                downloaded_files_per_selector[matching_files_selector_index].append(file)
+
+        self._report_unmatched_files_selectors(
+            short_remote_path, files_selectors, downloaded_files_per_selector
+        )
+
+    def _download_folder_concurrently(self, remote_path: str):
+        """
+        Download the folder tree given by `remote_path` with a pool of worker threads.
+
+        Folders are listed level by level (breadth-first). The folders of a level
+        are listed with JSON batch requests of up to `BATCH_SIZE` folders each.
+        The properties of the selected files of every listed folder are fetched
+        in one batch and the files are then downloaded in parallel, while the
+        next level of folders is still being listed.
+
+        The resulting directory layout and the reporting of file selectors which
+        didn't match any file is the same as for the sequential download.
+        """
+        folder_downloads = []
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            level = [remote_path]
+            while level:
+                listings = [
+                    (folders, executor.submit(self._list_folders, folders))
+                    for folders in (
+                        level[start : start + BATCH_SIZE]
+                        for start in range(0, len(level), BATCH_SIZE)
+                    )
+                ]
+                level = []
+                selections = []
+                for folders, listing in listings:
+                    for folder, (output_path, subfolders_path, files) in zip(
+                        folders, listing.result()
+                    ):
+                        level.extend(
+                            subfolder_path + "/" for subfolder_path in subfolders_path
+                        )
+                        if files is None:
+                            continue
+
+                        short_remote_path = self._get_short_remote_path(folder)
+                        files_selectors = self._get_files_selectors_for_file_path(
+                            short_remote_path
+                        )
+                        selected_files = list(
+                            self._select_files(short_remote_path, files, files_selectors)
+                        )
+                        files_properties = executor.submit(
+                            self._fetch_files_properties,
+                            folder,
+                            [file for file, _ in selected_files],
+                        )
+                        selections.append(
+                            (
+                                output_path,
+                                folder,
+                                short_remote_path,
+                                files_selectors,
+                                selected_files,
+                                files_properties,
+                            )
+                        )
+
+                for (
+                    output_path,
+                    folder,
+                    short_remote_path,
+                    files_selectors,
+                    selected_files,
+                    files_properties,
+                ) in selections:
+                    properties = files_properties.result()
+                    downloads = [
+                        (
+                            file,
+                            matching_files_selector_index,
+                            executor.submit(
+                                self._download_file,
+                                output_path,
+                                folder,
+                                file,
+                                files_selectors=files_selectors,
+                                file_properties=properties[file],
+                            ),
+                        )
+                        for file, matching_files_selector_index in selected_files
+                    ]
+                    folder_downloads.append((short_remote_path, files_selectors, downloads))
+
+            for short_remote_path, files_selectors, downloads in folder_downloads:
+                downloaded_files_per_selector: List[List[str]] = [[] for _ in files_selectors]
+                for file, matching_files_selector_index, download in downloads:
+                    did_download_file = download.result()
+                    if did_download_file and matching_files_selector_index is not None:
+                        downloaded_files_per_selector[matching_files_selector_index].append(
+                            file
+                        )
+                self._report_unmatched_files_selectors(
+                    short_remote_path, files_selectors, downloaded_files_per_selector
+                )
+
+    def _get_short_remote_path(self, remote_path: str) -> str:
+        return self._remove_sharepoint_dir_prefix(self._remove_url_prefix(remote_path))
+
+    def _list_folder(self, remote_path: str) -> Tuple[Path, List[str], Optional[List[str]]]:
+        """
+        Create the local folder for `remote_path` and list its contents.
+
+        Returns the local output path, the subfolder paths and the names of
+        the files in the folder. The file names are `None` if the folder is
+        excluded by the folder filters.
+        """
+        output_path = self._make_output_folder(remote_path)
+        subfolders_path = self._fetch_subfolders(self._get_folder_path(remote_path))
+        if not self._is_folder_selected(remote_path):
+            return output_path, subfolders_path, None
+        return output_path, subfolders_path, self._fetch_files(remote_path)
+
+    def _list_folders(
+        self, remote_paths: List[str]
+    ) -> List[Tuple[Path, List[str], Optional[List[str]]]]:
+        """
+        Like `_list_folder`, but for several folders which are listed in one batch.
+
+        The results are returned in the same order as `remote_paths`.
+        """
+        contents = self._connect.get_children_batch(
+            [self._get_folder_path(remote_path) for remote_path in remote_paths],
+            self._library_name(),
+        )
+        return [
+            (
+                self._make_output_folder(remote_path),
+                subfolders_path,
+                files if self._is_folder_selected(remote_path) else None,
+            )
+            for remote_path, (subfolders_path, files) in zip(remote_paths, contents)
+        ]
+
+    def _make_output_folder(self, remote_path: str) -> Path:
+        output_path = self._destination_path.joinpath(self._get_short_remote_path(remote_path))
         os.makedirs(output_path, exist_ok=True)
+        return output_path
+
+    def _get_folder_path(self, remote_path: str) -> str:
         if remote_path.startswith("/sites/") or "Shared Documents" in remote_path:
-            folder_path = self.get_path(remote_path)
-        else:
-            folder_path = remote_path
-        subfolders_path = self._fetch_subfolders(folder_path)
-        if subfolders_path == []:
-            pass
-        else:
-            for subfolder_path in subfolders_path:
-                self.download_folder(subfolder_path + "/")
-        short_remote_path = self._remove_sharepoint_dir_prefix(
-            self._remove_url_prefix(remote_path)
-        )
-        if self._folder_filters and not any(
+            return self.get_path(remote_path)
+        return remote_path
+
+    def _is_folder_selected(self, remote_path: str) -> bool:
+        short_remote_path = self._get_short_remote_path(remote_path)
+        return not self._folder_filters or any(
             [fnmatch(short_remote_path, filter) for filter in self._folder_filters]
-        ):
-            return
-        files = self._fetch_files(remote_path)
+        )
 
-        files_selectors = self._get_files_selectors_for_file_path(short_remote_path)
-        downloaded_files_per_selector: List[List[str]] = [[] for _ in files_selectors]
+    def _library_name(self) -> Optional[str]:
+        if "Shared Documents" in self._sharepoint_dir:
+            return None
+        return self._sharepoint_dir.split("/")[0]
+
+    def _select_files(
+        self, short_remote_path: str, files: List[str], files_selectors: List[FilesSelectors]
+    ) -> Iterator[Tuple[str, Optional[int]]]:
+        """
+        Yield the files which should be downloaded.
+
+        Each file is returned together with the index of the first files selector
+        which matches it, or `None` if there are no files selectors at all.
+        """
         for file in files:
             matching_files_selector_index = None
             if files_selectors:
@@ -140,14 +343,14 @@ class SharepointFetcherCloud(SharepointFetcher):
                         break
                 else:
                     continue
+            yield file, matching_files_selector_index
 
-            did_download_file = self._download_file(
-                output_path, remote_path, file, files_selectors=files_selectors
-            )
-
-            if did_download_file and matching_files_selector_index is not None:
-                downloaded_files_per_selector[matching_files_selector_index].append(file)
-
+    def _report_unmatched_files_selectors(
+        self,
+        short_remote_path: str,
+        files_selectors: List[FilesSelectors],
+        downloaded_files_per_selector: List[List[str]],
+    ):
         if files_selectors and not all(downloaded_files_per_selector):
             selectors_with_no_files = itertools.compress(
                 files_selectors, [not f for f in downloaded_files_per_selector]
@@ -168,24 +371,20 @@ class SharepointFetcherCloud(SharepointFetcher):
         file_name: str,
         *,
         files_selectors: Optional[List[FilesSelectors]] = None,
+        file_properties: Optional[Dict[str, Any]] = None,
     ):
         """
         Download a file from SharePoint.
 
         The file given by `{remote_path}/{file_name}` is stored under
         `{output_path}/{file_name}`.
-        """
-        if remote_path.endswith("/"):
-            remote_path = remote_path[:-1]
 
-        if remote_path.startswith("/sites") or "Shared Documents" in remote_path:
-            path = self.get_path(remote_path)
-        else:
-            path = remote_path
-        if "Shared Documents" in self._sharepoint_dir:
-            file_properties = self._connect.get_file_properties(path, file_name, None)
-        else:
-            library_name = self._sharepoint_dir.split("/")[0]
+        If the `file_properties` were already fetched (e.g. by
+        `_fetch_files_properties`), they are not requested again.
+        """
+        path = self._get_file_path(remote_path)
+        library_name = self._library_name()
+        if file_properties is None:
             file_properties = self._connect.get_file_properties(path, file_name, library_name)
 
         self.save_file(
@@ -195,14 +394,59 @@ class SharepointFetcherCloud(SharepointFetcher):
             False,
         )
 
-        if not self._download_properties_only:
-            if "Shared Documents" in self._sharepoint_dir:
-                file_contents = self._connect.get_file_object(path, file_name, None)
-            else:
-                file_contents = self._connect.get_file_object(path, file_name, library_name)
-            self.save_file(output_path, file_name, file_contents, False)
+        if self._download_properties_only:
+            return True
+        if self._is_file_unchanged(output_path, file_name, file_properties):
+            logger.info(
+                "File `{}` in path `{}` is unchanged and was not downloaded again",
+                file_name,
+                output_path,
+            )
+            self._remember_file(output_path, file_name, file_properties, skipped=True)
+            return True
+        self._connect.download_file_object(
+            path,
+            file_name,
+            library_name,
+            self._local_file_path(output_path, file_name),
+            file_properties=file_properties,
+        )
+        self._remember_file(output_path, file_name, file_properties)
+        logger.info("File `{}` was saved in path `{}`", file_name, output_path)
         return True
 
+    def _get_file_version(self, file_properties: Dict[str, Any]) -> Optional[FileVersion]:
+        # the cTag only changes if the file contents change (unlike the eTag)
+        tag = file_properties.get("cTag") or file_properties.get("eTag")
+        if not tag:
+            return None
+        return {
+            "id": file_properties.get("id"),
+            "tag": tag,
+            "size": file_properties.get("size"),
+        }
+
+    def _get_file_path(self, remote_path: str) -> str:
+        if remote_path.endswith("/"):
+            remote_path = remote_path[:-1]
+        if remote_path.startswith("/sites") or "Shared Documents" in remote_path:
+            return self.get_path(remote_path)
+        return remote_path
+
+    def _fetch_files_properties(
+        self, remote_path: str, file_names: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the properties of all given files in the folder given by `remote_path`.
+
+        The properties are requested with JSON batch requests and are returned
+        as dictionary keyed by file name.
+        """
+        files_properties = self._connect.get_files_properties(
+            self._get_file_path(remote_path), file_names, self._library_name()
+        )
+        return dict(zip(file_names, files_properties))
+
     def _fetch_subfolders(self, remote_path: str) -> List[str]:
         """
         Fetch list of all subfolders of a given path.
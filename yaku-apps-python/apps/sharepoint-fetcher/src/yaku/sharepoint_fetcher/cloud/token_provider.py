@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import requests
+from loguru import logger
+
+# tokens are refreshed this many seconds before they expire
+REFRESH_MARGIN = 300
+
+# used if the token response doesn't say how long the token is valid
+DEFAULT_EXPIRES_IN = 3600
+
+
+def default_token_cache_file(tenant_id: str, client_id: str, resource: str) -> Path:
+    """
+    Return the path of the token cache file for the given app registration.
+
+    The file is placed in a folder of the current user in the temporary
+    directory, so that fetchers which run one after another on the same machine
+    (or in the same pod) can share their tokens. The file name is derived from
+    a hash of the ids, so the ids are not visible in the file system.
+    """
+    key = hashlib.sha256(f"{tenant_id}:{client_id}:{resource}".encode("utf-8")).hexdigest()
+    folder = f"yaku-sharepoint-fetcher-{os.getuid()}" if hasattr(os, "getuid") else ""
+    return Path(tempfile.gettempdir()) / folder / f"token-{key[:32]}.json"
+
+
+def is_private_folder(path: Path) -> bool:
+    """Check that `path` is a folder (not a symlink) which only the current user can access."""
+    if not hasattr(os, "getuid"):
+        return False
+    try:
+        folder_stat = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(folder_stat.st_mode)
+        and folder_stat.st_uid == os.getuid()
+        and stat.S_IMODE(folder_stat.st_mode) & 0o077 == 0
+    )
+
+
+class TokenProvider:
+    """
+    Provide access tokens and refresh them before they expire.
+
+    The `request_token` callable must return a tuple of the access token and
+    the number of seconds it is valid (`expires_in`). It is only called if
+    there is no cached token which is valid for at least `REFRESH_MARGIN`
+    more seconds.
+
+    If a `cache_file` is given, tokens are also stored in this file and read
+    from it, so that other processes can reuse them. The folder of the file is
+    created if needed and must be owned by and only be accessible for the
+    current user, otherwise the cache file is not used.
+
+    The provider can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        request_token: Callable[[], Tuple[str, float]],
+        cache_file: Optional[Path] = None,
+    ):
+        self._request_token = request_token
+        self._cache_file = cache_file
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_valid(self, expires_at: float) -> bool:
+        return expires_at - REFRESH_MARGIN > time.time()
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        """
+        Return a valid access token.
+
+        With `force_refresh=True`, a new token is requested even if the
+        current token seems to be still valid, e.g. because it was rejected
+        by the server.
+        """
+        with self._lock:
+            if force_refresh:
+                self._access_token = None
+            elif self._access_token is not None and self._is_valid(self._expires_at):
+                return self._access_token
+            else:
+                self._read_cache_file()
+                if self._access_token is not None:
+                    return self._access_token
+
+            access_token, expires_in = self._request_token()
+            self._access_token = access_token
+            self._expires_at = time.time() + float(expires_in)
+            self._write_cache_file()
+            return access_token
+
+    def _read_cache_file(self):
+        self._access_token = None
+        if self._cache_file is None or not self._cache_file.exists():
+            return
+        if not is_private_folder(self._cache_file.parent):
+            logger.debug("Ignoring token cache file `{}` in shared folder", self._cache_file)
+            return
+        try:
+            with self._cache_file.open("r") as fh:
+                data = json.load(fh)
+            access_token, expires_at = data["access_token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("Ignoring invalid token cache file `{}`: {}", self._cache_file, e)
+            return
+        if self._is_valid(expires_at):
+            self._access_token = access_token
+            self._expires_at = expires_at
+
+    def _write_cache_file(self):
+        if self._cache_file is None:
+            return
+        folder = self._cache_file.parent
+        try:
+            folder.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not is_private_folder(folder):
+                logger.warning(
+                    "Not caching the access token, as `{}` is accessible by other users",
+                    folder,
+                )
+                return
+            # `mkstemp` creates a new file which is readable only by the current user
+            fd, temporary_file = tempfile.mkstemp(
+                dir=folder, prefix=f".{self._cache_file.name}.", suffix=".part"
+            )
+            try:
+                with os.fdopen(fd, "w") as fh:
+                    json.dump(
+                        {"access_token": self._access_token, "expires_at": self._expires_at},
+                        fh,
+                    )
+                os.replace(temporary_file, self._cache_file)
+            except BaseException:
+                os.unlink(temporary_file)
+                raise
+        except OSError as e:
+            logger.debug("Could not write token cache file `{}`: {}", self._cache_file, e)
+
+
+class BearerTokenAuth(requests.auth.AuthBase):
+    """
+    Add a bearer token to every request and retry once if it is rejected.
+
+    The `get_headers` callable must return the authorization headers. It is
+    called with `force_refresh=True` if the server responded with `401` to
+    get a fresh token for the retry.
+    """
+
+    def __init__(self, get_headers: Callable[..., dict]):
+        self._get_headers = get_headers
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers.update(self._get_headers())
+        request.register_hook("response", self._handle_401)
+        return request
+
+    def _handle_401(self, response: requests.Response, **kwargs) -> requests.Response:
+        if response.status_code != 401 or getattr(response.request, "token_retried", False):
+            return response
+
+        logger.debug("Access token was rejected, retrying with a new token")
+        # release the connection before sending the request again
+        response.content
+        response.close()
+        retry_request = response.request.copy()
+        retry_request.headers.update(self._get_headers(force_refresh=True))
+        retry_request.token_retried = True  # type: ignore
+        retry_response = response.connection.send(retry_request, **kwargs)
+        retry_response.history.append(response)
+        retry_response.request = retry_request
+        return retry_response
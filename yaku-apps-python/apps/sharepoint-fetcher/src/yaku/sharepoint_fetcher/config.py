@@ -37,6 +37,8 @@ class FileConfiguration(BaseModel):
     download_properties_only: Optional[bool]
     sharepoint_file: Optional[str]
     filter_config_file: Optional[str]
+    max_workers: Optional[int]
+    incremental: Optional[bool]
 
     @root_validator(pre=True)
     def validate_path_options(cls, values):
@@ -147,6 +149,8 @@ class Settings(BaseSettings):
     custom_properties: Optional[str] = Field(None)
     download_properties_only: Optional[bool] = False
     sharepoint_file: Optional[str] = Field(None)
+    max_workers: int = 1
+    incremental: Optional[bool] = False
 
     def require_env_var(cls, v, values, config, field):
         if not v:
@@ -276,6 +280,33 @@ class Settings(BaseSettings):
                 "It must be a boolean value.",
             )
 
+    @validator("incremental", always=True)
+    def validate_incremental(cls, v: Any):
+        if v is None or v == False or v == "false" or v == 0:
+            return False
+        elif v == True or v == "true" or v == 1:
+            return True
+        else:
+            raise AutopilotConfigurationError(
+                f"Could not parse SHAREPOINT_FETCHER_INCREMENTAL parameter: {v}. "
+                "It must be a boolean value.",
+            )
+
+    @validator("max_workers", pre=True, always=True)
+    def validate_max_workers(cls, v: Any):
+        if v is None or v == "":
+            return 1
+        try:
+            max_workers = int(v)
+        except (TypeError, ValueError):
+            max_workers = 0
+        if max_workers < 1:
+            raise AutopilotConfigurationError(
+                f"Could not parse SHAREPOINT_FETCHER_MAX_WORKERS parameter: {v}. "
+                "It must be a positive integer.",
+            )
+        return max_workers
+
     @validator("sharepoint_file", always=True)
     def validate_sharepoint_file(cls, v: Any, values: Dict[str, Any]):
         sharepoint_path = values.get("sharepoint_path")
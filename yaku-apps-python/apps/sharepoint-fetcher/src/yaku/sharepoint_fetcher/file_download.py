@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import requests
+from yaku.autopilot_utils.errors import AutopilotError
+from yaku.autopilot_utils.metrics import METRICS
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def save_response_content(
+    response: requests.Response, file_path: Path, expected_size: Optional[int]
+) -> int:
+    """
+    Stream the body of `response` into `file_path` and return the number of bytes written.
+
+    The `response` must have been requested with `stream=True`, so that the
+    file contents are never fully loaded into memory.
+
+    HTTP errors are raised before anything is written to disk.
+
+    The data is first written to a temporary file next to `file_path`, which
+    is only renamed to `file_path` if the number of received bytes matches
+    `expected_size` (if given). Otherwise, the temporary file is removed and
+    an `AutopilotError` is raised.
+    """
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError:
+        response.close()
+        raise
+
+    temporary_file_path = file_path.with_name(f".{file_path.name}.part")
+    try:
+        file_size = 0
+        with open(temporary_file_path, "wb") as fh:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                fh.write(chunk)
+                file_size += len(chunk)
+        if expected_size is not None and int(expected_size) != file_size:
+            raise AutopilotError(
+                f"The downloaded file does not have the proper size: expected {expected_size} bytes, got {file_size} bytes! One reason could be "
+                + "that you are behind a proxy/restricted firewall!"
+            )
+        os.replace(temporary_file_path, file_path)
+        METRICS.increment("sharepoint.downloaded_files")
+        METRICS.increment("sharepoint.downloaded_bytes", file_size)
+    except BaseException:
+        temporary_file_path.unlink(missing_ok=True)
+        raise
+    finally:
+        response.close()
+    return file_size
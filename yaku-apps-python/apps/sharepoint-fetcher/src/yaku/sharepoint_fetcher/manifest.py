@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+FileVersion = Dict[str, Any]
+
+
+class Manifest:
+    """
+    Keep track of the remote versions of all downloaded files.
+
+    The manifest is a JSON file which maps the local file paths (relative to
+    the directory containing the manifest) to the remote file version, e.g.
+    the item id, eTag, modification timestamp and size of the file.
+
+    When the fetcher runs again on the same destination directory, files whose
+    remote version did not change and which still exist locally don't need to
+    be downloaded again.
+
+    Only the files which are remembered during the current run are written
+    back by `save`, so that files which were removed remotely or are no longer
+    selected also disappear from the manifest. Their local copies are returned
+    by `stale_files`, so that they can be removed as well.
+
+    The manifest can be shared between threads.
+    """
+
+    def __init__(self, manifest_file: Path):
+        self._manifest_file = manifest_file
+        self._previous_versions = self._read_manifest_file(manifest_file)
+        self._current_versions: Dict[str, FileVersion] = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    @staticmethod
+    def _read_manifest_file(manifest_file: Path) -> Dict[str, FileVersion]:
+        if not manifest_file.exists():
+            return {}
+        try:
+            with manifest_file.open("r") as fh:
+                versions = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Could not read manifest file `{}`, all files will be downloaded again: {}",
+                manifest_file,
+                e,
+            )
+            return {}
+        if not isinstance(versions, dict):
+            return {}
+        return versions
+
+    def _key(self, file_path: Path) -> str:
+        try:
+            return Path(file_path).relative_to(self._manifest_file.parent).as_posix()
+        except ValueError:
+            return Path(file_path).as_posix()
+
+    def is_unchanged(self, file_path: Path, version: Optional[FileVersion]) -> bool:
+        """
+        Check whether `file_path` is still up to date with the remote `version`.
+
+        A file is only considered unchanged if it exists locally and the remote
+        version is known and equal to the version of the previous run.
+        """
+        if not version or not Path(file_path).exists():
+            return False
+        return self._previous_versions.get(self._key(file_path)) == version
+
+    def remember(self, file_path: Path, version: Optional[FileVersion], skipped: bool = False):
+        """Store the remote `version` of the local file given by `file_path`."""
+        if not version:
+            return
+        with self._lock:
+            self._current_versions[self._key(file_path)] = version
+            if skipped:
+                self.skipped += 1
+
+    def stale_files(self) -> List[Path]:
+        """
+        Return the local files of the previous run which were not remembered in this run.
+
+        Only files inside the directory containing the manifest are returned.
+        """
+        folder = self._manifest_file.parent.resolve()
+        with self._lock:
+            keys = sorted(set(self._previous_versions) - set(self._current_versions))
+        files = []
+        for key in keys:
+            file_path = (folder / key).resolve()
+            if file_path.is_relative_to(folder) and file_path != folder:
+                files.append(file_path)
+        return files
+
+    def save(self):
+        """Write the versions of all remembered files to the manifest file."""
+        temporary_file = self._manifest_file.with_name(self._manifest_file.name + ".part")
+        with self._lock:
+            with temporary_file.open("w") as fh:
+                json.dump(self._current_versions, fh, indent=2, sort_keys=True)
+        os.replace(temporary_file, self._manifest_file)
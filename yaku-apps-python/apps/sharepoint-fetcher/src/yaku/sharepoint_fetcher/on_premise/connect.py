@@ -2,13 +2,27 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Any, Dict, List, Tuple
-from urllib.parse import quote, urlparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlparse
 
 import requests
 from loguru import logger
-from requests_ntlm import HttpNtlmAuth
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
+from yaku.autopilot_utils.ntlm import (
+    DEFAULT_POOL_SIZE,
+    ConnectionStats,
+    PooledAdapter,
+    create_ntlm_session,
+)
+from yaku.sharepoint_fetcher.file_download import save_response_content
+from yaku.sharepoint_fetcher.throttling import RequestStats, ThrottlingAdapter
+
+NO_METADATA = "application/json;odata=nometadata"
+
+
+class PooledThrottlingAdapter(ThrottlingAdapter, PooledAdapter):
+    """Transport adapter which retries throttled requests and reuses NTLM connections."""
 
 
 class Connect:
@@ -22,19 +36,46 @@ class Connect:
 
     Files and folders are always given as relative URLs. The URL must include
     the site prefix, e.g. `/sites/012345/Documents/myFolder/myFile.txt`.
+
+    Throttled requests are retried (see `ThrottlingAdapter`). Statistics about
+    all requests are collected in `request_stats`.
+
+    Up to `pool_size` NTLM authenticated connections are kept alive and reused
+    (see `yaku.autopilot_utils.ntlm`). The number of opened and reused
+    connections and NTLM handshakes are counted in `connection_stats`.
+
+    Folder and file listings are requested without OData metadata and only
+    with the fields which are needed by the fetcher.
     """
 
-    def __init__(self, sharepoint_site, username, password, force_ip=None):
+    def __init__(
+        self,
+        sharepoint_site,
+        username,
+        password,
+        force_ip=None,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
         if sharepoint_site.endswith("/"):
             sharepoint_site = sharepoint_site[:-1]
         self._sharepoint_site = sharepoint_site
 
-        session = requests.Session()
-        session.headers = {"Accept": "application/json;odata=verbose"}
         self._force_ip = force_ip
-        session.auth = HttpNtlmAuth(username, password)
-        session.verify = False
-        self._session = session
+        self.request_stats = RequestStats()
+        self.connection_stats = ConnectionStats()
+        adapter = PooledThrottlingAdapter(
+            max_concurrency=pool_size,
+            stats=self.request_stats,
+            connection_stats=self.connection_stats,
+            pool_maxsize=max(pool_size, DEFAULT_POOL_SIZE),
+        )
+        self._session = create_ntlm_session(
+            username,
+            password,
+            adapter=adapter,
+            headers={"Accept": "application/json;odata=verbose"},
+        )
 
     def _exchange_hostname_by_forced_ip_address(self, url: str) -> Tuple[str, str]:
         """
@@ -47,27 +88,43 @@ class Connect:
         url = parts._replace(netloc=self._force_ip).geturl()
         return url, host
 
-    def _get(self, url: str) -> requests.Response:
+    def _get(
+        self, url: str, stream: bool = False, accept: Optional[str] = None
+    ) -> requests.Response:
         assert url.count("//") == 1, f"Duplicate slashes detected: {url}"
         headers = {}
+        if accept:
+            headers["Accept"] = accept
         if self._force_ip:
             url, host = self._exchange_hostname_by_forced_ip_address(url)
             headers["Host"] = host
         logger.debug("GET {url}", url=url)
+        if stream:
+            return self._session.get(url, verify=False, headers=headers, stream=True)
         return self._session.get(url, verify=False, headers=headers)
 
-    def _get_paginated_results(self, url: str) -> List[Dict[str, Any]]:
-        results = []
-        response = self._get(url)
-        response.raise_for_status()
-        json_response = response.json()
-        results.extend(json_response["d"]["results"])
-        while "__next" in json_response["d"]:
-            url = json_response["d"]["__next"]
-            response = self._get(url)
+    def _get_paginated_results(
+        self, url: str, accept: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all results of a collection, following the links to the next pages.
+
+        Both verbose responses (`{"d": {"results": [...], "__next": ...}}`) and
+        responses without metadata (`{"value": [...], "odata.nextLink": ...}`)
+        are supported.
+        """
+        results: List[Dict[str, Any]] = []
+        next_url: Optional[str] = url
+        while next_url:
+            response = self._get(next_url, accept=accept)
             response.raise_for_status()
             json_response = response.json()
-            results.extend(json_response["d"]["results"])
+            if "d" in json_response:
+                results.extend(json_response["d"]["results"])
+                next_url = json_response["d"].get("__next")
+            else:
+                results.extend(json_response["value"])
+                next_url = json_response.get("odata.nextLink")
         return results
 
     def check_folder_access_and_presence(self, relative_url: str, original_url: str):
@@ -118,8 +175,9 @@ class Connect:
         url = (
             self._sharepoint_site
             + f"/_api/web/GetFolderByServerRelativeUrl('{relative_url}')/folders"
+            + "?$select=ServerRelativeUrl"
         )
-        response = self._get_paginated_results(url)
+        response = self._get_paginated_results(url, accept=NO_METADATA)
         return response
 
     def get_files(self, relative_url) -> List[Dict[str, Any]]:
@@ -131,14 +189,58 @@ class Connect:
         url = (
             self._sharepoint_site
             + f"/_api/web/GetFolderByServerRelativeUrl('{relative_url}')/files"
+            + "?$select=Name"
         )
-        response = self._get_paginated_results(url)
+        response = self._get_paginated_results(url, accept=NO_METADATA)
         return response
 
-    def get_file_object(self, relative_url: str, file_name: str) -> bytes:
+    def get_filtered_file_names(
+        self, list_url: str, relative_url: str, odata_filter: str
+    ) -> List[str]:
+        """
+        Get names of the files in the given folder whose list items match `odata_filter`.
+
+        The folder given by `relative_url` must be part of the document library
+        with the server relative URL `list_url`. Subfolders are not included.
+
+        For info on `relative_url`, see class docs.
+        """
+        folder = relative_url.replace("'", "''")
+        query = urlencode(
+            {
+                "$select": "FileLeafRef",
+                "$filter": f"FileDirRef eq '{folder}' and FSObjType eq 0 and ({odata_filter})",
+            },
+            quote_via=quote,
+            # slashes are encoded as well, as `_get` rejects URLs with duplicate slashes
+            safe="$,'()",
+        )
+        url = self._sharepoint_site + f"/_api/web/GetList('{list_url}')/items?{query}"
+        items = self._get_paginated_results(url, accept=NO_METADATA)
+        return [item["FileLeafRef"] for item in items]
+
+    def get_list_field_types(self, list_url: str) -> Dict[str, str]:
+        """
+        Get the types of the fields of a list by their internal names.
+
+        The list is given by its server relative URL, e.g. `/sites/012345/Documents`.
+        """
+        url = (
+            self._sharepoint_site
+            + f"/_api/web/GetList('{list_url}')/fields?$select=InternalName,TypeAsString"
+        )
+        fields = self._get_paginated_results(url, accept=NO_METADATA)
+        return {field["InternalName"]: field["TypeAsString"] for field in fields}
+
+    def get_file_object(
+        self, relative_url: str, file_name: str, file_size: Optional[int] = None
+    ) -> bytes:
         """
         Get file from given relative path and under the given file name.
 
+        If the expected `file_size` is already known (see `get_file_size`),
+        no additional request is needed to verify the size of the file.
+
         For info on `relative_url`, see class docs.
         """
         encoded_file_name = quote(file_name)
@@ -148,21 +250,55 @@ class Connect:
         )
         response = self._get(url)
         response.raise_for_status()
-        additional_file_properties = self._get_additional_file_properties(
-            relative_url, file_name
-        )
-        actual_size = self._get_file_size_from_properties(additional_file_properties)
-        file_size = len(response.content)
-        if actual_size != file_size:
+        actual_size = self._get_expected_file_size(relative_url, file_name, file_size)
+        downloaded_size = len(response.content)
+        if actual_size != downloaded_size:
             raise AutopilotError(
-                f"The downloaded file does not have the proper size: expected {actual_size} bytes, got {file_size} bytes! One reason could be "
+                f"The downloaded file does not have the proper size: expected {actual_size} bytes, got {downloaded_size} bytes! One reason could be "
                 + "that you are behind a proxy/restricted firewall!"
             )
         return response.content
 
+    def download_file_object(
+        self,
+        relative_url: str,
+        file_name: str,
+        file_path: Path,
+        file_size: Optional[int] = None,
+    ) -> int:
+        """
+        Download file from given relative path and under the given file name into `file_path`.
+
+        The file contents are streamed in chunks to disk, so that the memory usage
+        does not depend on the file size. Returns the number of downloaded bytes.
+
+        If the expected `file_size` is already known (see `get_file_size`),
+        no additional request is needed to verify the size of the file.
+
+        For info on `relative_url`, see class docs.
+        """
+        actual_size = self._get_expected_file_size(relative_url, file_name, file_size)
+        encoded_file_name = quote(file_name)
+        url = (
+            self._sharepoint_site
+            + f"/_api/web/GetFileByServerRelativePath(decodedurl='{relative_url}/{encoded_file_name}')/$value"
+        )
+        response = self._get(url, stream=True)
+        return save_response_content(response, file_path, actual_size)
+
     def _get_file_size_from_properties(self, properties):
         return properties["vti_x005f_filesize"]
 
+    def _get_expected_file_size(
+        self, relative_url: str, file_name: str, file_size: Optional[int]
+    ) -> int:
+        if file_size is not None:
+            return file_size
+        additional_file_properties = self._get_additional_file_properties(
+            relative_url, file_name
+        )
+        return self._get_file_size_from_properties(additional_file_properties)
+
     def _get_additional_file_properties(self, relative_url: str, file_name: str):
         """
         Get additional properties for file given by relative path and file name.
@@ -185,7 +321,10 @@ class Connect:
         """
         Get properties for file given by relative path and file name.
 
-        The properties are returned as JSON structure.
+        The properties are returned as JSON structure. Besides the list item
+        fields, they contain the size of the file in `File.Length`, so that
+        the size can be verified after downloading the file without another
+        request (see `get_file_size`).
 
         For info on `relative_url`, see class docs.
         """
@@ -193,12 +332,24 @@ class Connect:
         url = (
             self._sharepoint_site
             + f"/_api/web/GetFileByServerRelativePath(decodedurl='{relative_url}/{encoded_file_name}')/ListItemAllFields"
+            + "?$select=*,File/Length&$expand=File"
         )
         response = self._get(url)
         response.raise_for_status()
         json_response = response.json()
         return json_response["d"]  # type: ignore
 
+    @staticmethod
+    def get_file_size(file_properties: Dict[str, Any]) -> Optional[int]:
+        """Return the file size from properties returned by `get_file_properties` (if present)."""
+        file = file_properties.get("File")
+        if not isinstance(file, dict) or file.get("Length") is None:
+            return None
+        try:
+            return int(file["Length"])
+        except (TypeError, ValueError):
+            return None
+
     def verify_site_lists(self, titles: List[str], must_have_items=False) -> List[str]:
         """
         Get and verify SharePoint lists given by their `titles`.
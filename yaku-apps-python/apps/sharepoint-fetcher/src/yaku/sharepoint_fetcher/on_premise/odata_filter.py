@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Translate file selectors into OData `$filter` expressions for on-premise SharePoint.
+
+The generated filters are only used to reduce the number of files which are
+listed by the server. They are built in a way that they never exclude a file
+which would be accepted by the client-side checks in `yaku.autopilot_utils.checks`,
+so those checks still decide which files are downloaded. Selectors which cannot
+be translated safely are simply left out of the filter.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from yaku.autopilot_utils.checks import (
+    checks_dict,
+    contains,
+    convert_to_date,
+    convert_to_seconds,
+    equals,
+    larger,
+    larger_equal,
+    less,
+    less_equal,
+    not_empty,
+    not_older,
+    older,
+)
+from yaku.autopilot_utils.errors import AutopilotConfigurationError
+
+from ..selectors import FilesSelectors, Selector
+
+NUMBER_FIELD_TYPES = ("Number", "Currency", "Integer", "Counter")
+TEXT_FIELD_TYPES = ("Text", "Choice")
+DATE_FIELD_TYPES = ("DateTime",)
+
+NUMBER_OPERATORS = {larger: "gt", larger_equal: "ge", less: "lt", less_equal: "le"}
+
+# added to date comparisons, so that differences in time zones or in the time
+# of evaluation can never exclude a file which would match on the client side
+DATE_MARGIN = timedelta(days=1)
+
+
+def _is_number(value) -> bool:
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _number_literal(value) -> str:
+    number = float(value)
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+def _quote(value) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _datetime_literal(timestamp: float) -> str:
+    date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return f"datetime'{date.strftime('%Y-%m-%dT%H:%M:%SZ')}'"
+
+
+def _get_threshold_timestamp(other_value) -> Optional[float]:
+    try:
+        timestamp = convert_to_date(other_value)
+        if timestamp is None:
+            timestamp = datetime.now(tz=timezone.utc).timestamp() - convert_to_seconds(
+                str(other_value)
+            )
+    except (AssertionError, AutopilotConfigurationError, ValueError):
+        return None
+    return timestamp
+
+
+def selector_to_odata_filter(selector: Selector, field_type: Optional[str]) -> Optional[str]:
+    """
+    Translate a single `selector` into an OData filter clause.
+
+    The `field_type` is the `TypeAsString` of the SharePoint field which is
+    referenced by the selector. Returns `None` if the selector cannot be
+    translated safely.
+    """
+    check_fn = checks_dict.get(selector.operator)
+    name, value = selector.property, selector.other_value
+    if field_type is None or check_fn is None:
+        return None
+    if check_fn is not_empty:
+        return f"{name} ne null"
+    if field_type in TEXT_FIELD_TYPES and value is not None and not _is_number(value):
+        if check_fn is equals:
+            return f"{name} eq {_quote(value)}"
+        if check_fn is contains:
+            return f"substringof({_quote(value)},{name})"
+    if field_type in NUMBER_FIELD_TYPES and check_fn in NUMBER_OPERATORS and _is_number(value):
+        return f"{name} {NUMBER_OPERATORS[check_fn]} {_number_literal(value)}"
+    if field_type in DATE_FIELD_TYPES and check_fn in (older, not_older):
+        threshold = _get_threshold_timestamp(value)
+        if threshold is None:
+            return None
+        if check_fn is older:
+            return f"{name} lt {_datetime_literal(threshold + DATE_MARGIN.total_seconds())}"
+        return f"{name} ge {_datetime_literal(threshold - DATE_MARGIN.total_seconds())}"
+    return None
+
+
+def files_selectors_to_odata_filter(
+    files_selectors: List[FilesSelectors], field_types: Dict[str, str]
+) -> Optional[str]:
+    """
+    Translate the selectors for the files of a folder into an OData filter expression.
+
+    A file is selected if it matches all selectors of one of the `files_selectors`,
+    so the clauses of each entry are combined with `and` and the entries with `or`.
+    If there is an entry without any translatable selector, all files might
+    be selected and `None` is returned.
+
+    The `field_types` map the internal names of the fields of the SharePoint
+    list to their types.
+    """
+    alternatives = []
+    for files_selector in files_selectors:
+        clauses = []
+        for selector in files_selector.selectors:
+            clause = selector_to_odata_filter(selector, field_types.get(selector.property))
+            if clause is not None:
+                clauses.append(clause)
+        if not clauses:
+            return None
+        alternatives.append(" and ".join(clauses))
+    if not alternatives:
+        return None
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return " or ".join(f"({alternative})" for alternative in alternatives)
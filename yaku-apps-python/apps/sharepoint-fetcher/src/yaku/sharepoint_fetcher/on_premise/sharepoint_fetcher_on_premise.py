@@ -5,20 +5,25 @@
 import itertools
 import json
 import os
-import shutil
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from fnmatch import fnmatch
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import requests
 from loguru import logger
 from yaku.autopilot_utils.checks import check
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
+from yaku.autopilot_utils.metrics import METRICS
+from yaku.sharepoint_fetcher.manifest import FileVersion
 from yaku.sharepoint_fetcher.selectors import FilesSelectors
 from yaku.sharepoint_fetcher.sharepoint_fetcher import SharepointFetcher
 from yaku.sharepoint_fetcher.utils import PropertiesReader
 
 from .connect import Connect
+from .odata_filter import files_selectors_to_odata_filter
 
 
 class SharepointFetcherOnPremise(SharepointFetcher):
@@ -50,6 +55,14 @@ class SharepointFetcherOnPremise(SharepointFetcher):
 
     It is also possible to download only the property files and no file contents.
     This can be enabled by providing `download_properties_only=True`.
+
+    Folders are downloaded one after another by default. With `max_workers > 1`,
+    folders are listed and downloaded by a pool of worker threads.
+
+    With `incremental=True`, the eTags and modification timestamps of the
+    downloaded files are remembered in a manifest file in `destination_path`.
+    On the next run, files which didn't change are not downloaded again, and
+    local files which were removed remotely or are no longer selected are deleted.
     """
 
     # used for storing the file metadata in a JSON file next to the downloaded file
@@ -70,6 +83,8 @@ class SharepointFetcherOnPremise(SharepointFetcher):
         list_title_property_map: Optional[Dict[str, str]] = None,
         download_properties_only: Optional[bool] = False,
         filter_config: Optional[List[FilesSelectors]] = None,
+        incremental: bool = False,
+        max_workers: int = 1,
     ):
         super().__init__(
             sharepoint_dir,
@@ -78,6 +93,7 @@ class SharepointFetcherOnPremise(SharepointFetcher):
             download_properties_only,
             list_title_property_map,
             filter_config,
+            incremental,
         )
         if username is None:
             raise AutopilotConfigurationError(
@@ -91,7 +107,18 @@ class SharepointFetcherOnPremise(SharepointFetcher):
                 + "variable SHAREPOINT_FETCHER_PASSWORD or as command line argument --password."
             )
 
-        self._connect = Connect(self._sharepoint_site, username, password, force_ip)
+        if max_workers < 1:
+            raise AutopilotConfigurationError(
+                f"Invalid number of workers: {max_workers}. It must be at least 1."
+            )
+        self._max_workers = max_workers
+        self._field_types: Optional[Dict[str, str]] = None
+        self._field_types_lock = threading.Lock()
+        # set if the server rejected a filtered file listing, e.g. because of the list view threshold
+        self._filter_unsupported = False
+        self._connect = Connect(
+            self._sharepoint_site, username, password, force_ip, pool_size=max_workers
+        )
         self._properties_reader = PropertiesReader(
             self._destination_path / self.custom_property_definitions_filename
         )
@@ -115,25 +142,112 @@ class SharepointFetcherOnPremise(SharepointFetcher):
 
         The `remote_path` must contain the site prefix, unless it is empty
         (see also `relative_url_prefix`).
+
+        Subfolders which cannot contain any folder matched by the folder filters
+        are skipped. If the fetcher was created with `max_workers > 1`, the
+        folder tree is listed and its folders are downloaded by a pool of
+        worker threads. Then empty local folders are only removed after all
+        folders were downloaded, as a parent folder must not be removed while
+        one of its subfolders is created.
         """
         if remote_path is None:
             remote_path = self._relative_url_prefix + "/" + self._sharepoint_dir
 
         assert remote_path.endswith("/"), f"{remote_path} should end with a /, but doesn't!"
 
-        output_path = self._destination_path.joinpath(
-            self._remove_sharepoint_dir_prefix(self._remove_url_prefix(remote_path))
-        )
-        os.makedirs(output_path, exist_ok=True)
+        if self._max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                downloads = [
+                    executor.submit(self._download_folder_files, folder)
+                    for folder in self._list_folder_tree(remote_path, executor)
+                ]
+                folders_without_files = [download.result() for download in downloads]
+            # the folders are ordered deepest first, so subfolders are removed before their parents
+            for output_path in folders_without_files:
+                if output_path is not None:
+                    self._remove_folder_if_empty(output_path)
+            return
+
+        for subfolder in self._fetch_subfolders_to_visit(remote_path):
+            self.download_folder(subfolder + "/")
+        output_path = self._download_folder_files(remote_path)
+        if output_path is not None:
+            self._remove_folder_if_empty(output_path)
+
+    def _list_folder_tree(self, remote_path: str, executor: ThreadPoolExecutor) -> List[str]:
+        """
+        List all folders below `remote_path` which need to be visited, level by level.
+
+        The folders of each level are listed in parallel. The folders are
+        returned with the deepest level first, like in the sequential download.
+        """
+        levels = [[remote_path]]
+        while levels[-1]:
+            listings = [
+                executor.submit(self._fetch_subfolders_to_visit, folder)
+                for folder in levels[-1]
+            ]
+            levels.append(
+                [subfolder + "/" for listing in listings for subfolder in listing.result()]
+            )
+        return [folder for level in reversed(levels) for folder in level]
+
+    def _fetch_subfolders_to_visit(self, remote_path: str) -> List[str]:
+        """
+        Fetch the subfolders of `remote_path` which might contain selected files.
 
-        # we first dive into all subfolders (not using any folder filters here!)
-        # TODO: use filter to prevent creating subfolders which eventually don't contain any file
-        subfolders = self._fetch_subfolders(remote_path)
-        for subfolder in subfolders:
+        Subfolders are skipped if neither they nor any of their nested folders
+        can be matched by one of the folder filters.
+        """
+        subfolders = []
+        for subfolder in self._fetch_subfolders(remote_path):
             assert subfolder.startswith(
                 self._relative_url_prefix + "/" + self._sharepoint_dir
             ), f"{subfolder} should start with {self._relative_url_prefix + '/' + self._sharepoint_dir}, but doesn't!"
-            self.download_folder(subfolder + "/")
+            short_subfolder_path = self._remove_sharepoint_dir_prefix(
+                self._remove_url_prefix(subfolder + "/")
+            )
+            if self._folder_filters and not any(
+                self._may_match_nested_folder(short_subfolder_path, folder_filter)
+                for folder_filter in self._folder_filters
+            ):
+                logger.debug("Skipping folder `{}` as it doesn't match any filter", subfolder)
+                continue
+            subfolders.append(subfolder)
+        return subfolders
+
+    @staticmethod
+    def _may_match_nested_folder(short_path: str, folder_filter: str) -> bool:
+        """
+        Check whether `folder_filter` can match `short_path` or any folder inside it.
+
+        The filter is compared segment by segment. As wildcards in `fnmatch`
+        can also match slashes, any folder below a segment with a wildcard
+        might match.
+        """
+        filter_segments = folder_filter.rstrip("/").split("/") if folder_filter else []
+        for index, segment in enumerate(short_path.rstrip("/").split("/")):
+            if index >= len(filter_segments):
+                return False
+            filter_segment = filter_segments[index]
+            if any(wildcard in filter_segment for wildcard in "*?["):
+                return True
+            if not fnmatch(segment, filter_segment):
+                return False
+        return True
+
+    @METRICS.timed("sharepoint.download_folder")
+    def _download_folder_files(self, remote_path: str) -> Optional[Path]:
+        """
+        Download the selected files of the folder given by `remote_path` (without subfolders).
+
+        If no file was downloaded, the local folder is returned, so that the
+        caller can remove it if it stays empty.
+        """
+        output_path = self._destination_path.joinpath(
+            self._remove_sharepoint_dir_prefix(self._remove_url_prefix(remote_path))
+        )
+        os.makedirs(output_path, exist_ok=True)
 
         # skip checking files in folders which are not in the include list by our filters
         short_remote_path = self._remove_sharepoint_dir_prefix(
@@ -142,12 +256,13 @@ class SharepointFetcherOnPremise(SharepointFetcher):
         if self._folder_filters and not any(
             [fnmatch(short_remote_path, filter) for filter in self._folder_filters]
         ):
-            return
+            return output_path
 
         # go through list of files and match it with our filter expressions
         files = self._fetch_files(remote_path)
         files_selectors = self._get_files_selectors_for_file_path(short_remote_path)
         downloaded_files_per_selector: List[List[str]] = [[] for _ in files_selectors]
+        folder_without_files = None
         for file in files:
             matching_files_selector_index = None
             if files_selectors:
@@ -165,45 +280,12 @@ class SharepointFetcherOnPremise(SharepointFetcher):
             if did_download_file and matching_files_selector_index is not None:
                 downloaded_files_per_selector[matching_files_selector_index].append(file)
 
-        # this function checks whether a folder doesn't have any files that match
-        # any selectors including nested sub-folders
-        # if the folder is empty of files, remove it
-        def check_folder_empty(output_path: Path):
-            files = [
-                file_path.name for file_path in output_path.glob("*") if file_path.is_file()
-            ]
-            subfolders = [
-                subfolder for subfolder in os.listdir(output_path) if subfolder not in files
-            ]
-            if len(subfolders) == 0 and len(files) == 0:
-                logger.debug(
-                    "Removing local folder `{}` because it doesn't have files that match filter criteria.",
-                    output_path,
-                )
-                shutil.rmtree(output_path)
-                return False
-            if len(files) != 0:
-                return True
-            has_nested_files = False
-            for subfolder in subfolders:
-                nested_output_path = output_path / subfolder
-                nested_files = check_folder_empty(nested_output_path)
-                if nested_files:
-                    has_nested_files = True
-
-            if not has_nested_files:
-                logger.debug(
-                    "Removing local folder `{}` because it doesn't have files that match filter criteria.",
-                    output_path,
-                )
-                shutil.rmtree(output_path)
-                return False
-
         if files_selectors and not all(downloaded_files_per_selector):
             selectors_with_no_files = itertools.compress(
                 files_selectors, [not f for f in downloaded_files_per_selector]
             )
-            check_folder_empty(output_path)
+            if not any(downloaded_files_per_selector):
+                folder_without_files = output_path
             logger.debug(
                 "Some file filters for `{}` didn't match any file! Those filters were: {}",
                 short_remote_path if short_remote_path else "<root path>",
@@ -253,6 +335,19 @@ class SharepointFetcherOnPremise(SharepointFetcher):
                             f"{self._sharepoint_site}/{urllib.parse.quote(self._remove_url_prefix(remote_path))}{urllib.parse.quote(file)}"
                         )
                     logger.info("{}: {}", title, ", ".join([f"<{url}>" for url in urls]))
+        return folder_without_files
+
+    def _remove_folder_if_empty(self, output_path: Path):
+        if not self._folder_filters:
+            return
+        try:
+            os.rmdir(output_path)
+        except OSError:
+            return
+        logger.debug(
+            "Removing local folder `{}` because it doesn't have files that match filter criteria.",
+            output_path,
+        )
 
     def download_custom_property_definitions(self):
         result = {}
@@ -305,6 +400,9 @@ class SharepointFetcherOnPremise(SharepointFetcher):
 
         # download file properties
         file_properties = self._connect.get_file_properties(remote_path, file_name)
+        # the file object is only expanded to get the file size, it isn't saved as property
+        file_size = self._connect.get_file_size(file_properties)
+        file_properties.pop("File", None)
 
         self.save_file(
             output_path,
@@ -359,15 +457,40 @@ class SharepointFetcherOnPremise(SharepointFetcher):
 
         # download file
         if not self._download_properties_only:
-            file_contents = self._connect.get_file_object(remote_path, file_name)
+            if self._is_file_unchanged(output_path, file_name, file_properties):
+                logger.info(
+                    "File `{}` in path `{}` is unchanged and was not downloaded again",
+                    file_name,
+                    output_path,
+                )
+                self._remember_file(output_path, file_name, file_properties, skipped=True)
+                return True
+            self._connect.download_file_object(
+                remote_path,
+                file_name,
+                self._local_file_path(output_path, file_name),
+                file_size=file_size,
+            )
+            self._remember_file(output_path, file_name, file_properties)
             logger.info(
                 "File `{}` was saved in path `{}`",
                 file_name + self.metadata_file_suffix,
                 output_path,
             )
-            self.save_file(output_path, file_name, file_contents, False)
+            logger.info("File `{}` was saved in path `{}`", file_name, output_path)
         return True
 
+    def _get_file_version(self, file_properties: Dict[str, Any]) -> Optional[FileVersion]:
+        etag = file_properties.get("__metadata", {}).get("etag")
+        modified = file_properties.get("Modified")
+        if not etag and not modified:
+            return None
+        return {
+            "id": file_properties.get("GUID", file_properties.get("ID")),
+            "etag": etag,
+            "modified": modified,
+        }
+
     def _fetch_subfolders(self, remote_path: str) -> List[str]:
         """
         Fetch list of all subfolders of a given path.
@@ -398,9 +521,64 @@ class SharepointFetcherOnPremise(SharepointFetcher):
         assert remote_path.startswith(
             self._relative_url_prefix
         ), f"{remote_path} should start with {self._relative_url_prefix}, but doesn't!"
+        odata_filter = self._get_odata_filter(remote_path)
+        if odata_filter:
+            try:
+                return self._connect.get_filtered_file_names(
+                    self._get_list_url(), remote_path.rstrip("/"), odata_filter
+                )
+            except requests.exceptions.RequestException as e:
+                logger.debug(
+                    "Could not filter files in `{}` on the server, fetching all files"
+                    + " without server-side filtering from now on: {}",
+                    remote_path,
+                    e,
+                )
+                with self._field_types_lock:
+                    self._filter_unsupported = True
         result = self._connect.get_files(remote_path)
         return self.frame_list_from_dict(result, "files")
 
+    def log_request_stats(self):
+        super().log_request_stats()
+        logger.info("Connections: {}", self._connect.connection_stats.summary())
+
+    def _get_list_url(self) -> str:
+        """Return the server relative URL of the document library containing `sharepoint_dir`."""
+        return self._relative_url_prefix + "/" + self._sharepoint_dir.split("/")[0]
+
+    def _get_odata_filter(self, remote_path: str) -> Optional[str]:
+        """
+        Get an OData filter for the files in `remote_path` from the files selectors.
+
+        The filter only reduces the number of listed files, the selectors are
+        still checked for every file (see `odata_filter` module).
+        """
+        short_remote_path = self._remove_sharepoint_dir_prefix(
+            self._remove_url_prefix(remote_path)
+        )
+        files_selectors = self._get_files_selectors_for_file_path(short_remote_path)
+        if not files_selectors or not all(f.selectors for f in files_selectors):
+            return None
+        with self._field_types_lock:
+            if self._filter_unsupported:
+                return None
+            if self._field_types is None:
+                try:
+                    self._field_types = self._connect.get_list_field_types(
+                        self._get_list_url()
+                    )
+                except requests.exceptions.RequestException as e:
+                    logger.debug("Could not fetch field types, files are not filtered: {}", e)
+                    self._field_types = {}
+        # properties with list mappings are compared with the list item titles
+        field_types = {
+            name: field_type
+            for name, field_type in self._field_types.items()
+            if name not in self.list_title_property_map
+        }
+        return files_selectors_to_odata_filter(files_selectors, field_types)
+
     def get_directory_length(self, relative_url):
         url_parts = relative_url.split("/")
         non_empty_parts = [part for part in url_parts if part]
@@ -2,10 +2,17 @@
 #
 # SPDX-License-Identifier: MIT
 
+from yaku.autopilot_utils.lazy import lazy_callable
 from yaku.sharepoint_fetcher.config import Settings
 
-from .cloud.sharepoint_fetcher_cloud import SharepointFetcherCloud
-from .on_premise.sharepoint_fetcher_on_premise import SharepointFetcherOnPremise
+# the fetchers pull in the HTTP and authentication libraries, so they are only
+# imported when one of them is really created
+SharepointFetcherCloud = lazy_callable(
+    "yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud:SharepointFetcherCloud"
+)
+SharepointFetcherOnPremise = lazy_callable(
+    "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise:SharepointFetcherOnPremise"
+)
 
 
 class SharePointFetcherFactory:
@@ -27,6 +34,8 @@ class SharePointFetcherFactory:
                 list_title_property_map=list_title_property_map,
                 download_properties_only=settings.download_properties_only,
                 filter_config=filter_config_file_data,
+                max_workers=settings.max_workers,
+                incremental=settings.incremental,
             )
         elif settings.is_cloud == True:  # Still keeping this clause for clarity
             return SharepointFetcherCloud(
@@ -39,4 +48,6 @@ class SharePointFetcherFactory:
                 force_ip=settings.force_ip,
                 download_properties_only=settings.download_properties_only,
                 filter_config=filter_config_file_data,
+                max_workers=settings.max_workers,
+                incremental=settings.incremental,
             )
@@ -7,14 +7,25 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from fnmatch import fnmatch
 from pathlib import Path
-from typing import Dict, List, Mapping, Optional, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from loguru import logger
 from yaku.autopilot_utils.errors import AutopilotConfigurationError
+from yaku.sharepoint_fetcher.manifest import FileVersion, Manifest
 from yaku.sharepoint_fetcher.selectors import FilesSelectors
 
 
 class SharepointFetcher(ABC):
+    # used to remember the remote versions of downloaded files in incremental mode,
+    # it is stored in the destination path, but isn't evidence itself
+    manifest_filename = "__manifest__.json"
+
+    # suffix of the files with the properties of a downloaded file, set by the subclasses
+    metadata_file_suffix: str
+
+    # the cloud or on-premise `Connect` instance, set by the subclasses
+    _connect: Any
+
     def __init__(
         self,
         sharepoint_dir: Optional[str],
@@ -23,6 +34,7 @@ class SharepointFetcher(ABC):
         download_properties_only: Optional[bool] = False,
         list_title_property_map: Optional[Dict[str, str]] = None,
         filter_config: Optional[List[FilesSelectors]] = None,
+        incremental: bool = False,
     ):
         if sharepoint_dir is not None and sharepoint_site is not None:
             assert sharepoint_dir.endswith(
@@ -62,6 +74,10 @@ class SharepointFetcher(ABC):
                     self._folder_filters,
                     self._files_selectors,
                 ) = self._generate_filters_and_selectors(filter_config)
+
+            self._manifest: Optional[Manifest] = None
+            if incremental:
+                self._manifest = Manifest(destination_path / self.manifest_filename)
         else:
             raise AutopilotConfigurationError(
                 "Missing values for the SharePoint site and path! Make sure you either "
@@ -132,6 +148,70 @@ class SharepointFetcher(ABC):
         """Wrap Path.unlink for easier mocking during tests."""
         path.unlink()
 
+    @staticmethod
+    def _local_file_path(path: Path, file_name: str) -> Path:
+        return Path.cwd().joinpath(path).joinpath(file_name)
+
+    def _get_file_version(self, file_properties: Dict[str, Any]) -> Optional[FileVersion]:
+        """
+        Extract the remote version of a file from its properties.
+
+        The version is used in incremental mode to detect whether a file has
+        changed since the last run. If `None` is returned, the file is always
+        downloaded.
+        """
+        return None
+
+    def _is_file_unchanged(
+        self, output_path: Path, file_name: str, file_properties: Dict[str, Any]
+    ) -> bool:
+        """Check whether the local copy of a file is still up to date (incremental mode only)."""
+        if self._manifest is None:
+            return False
+        return self._manifest.is_unchanged(
+            Path(output_path) / file_name, self._get_file_version(file_properties)
+        )
+
+    def _remember_file(
+        self,
+        output_path: Path,
+        file_name: str,
+        file_properties: Dict[str, Any],
+        skipped: bool = False,
+    ):
+        if self._manifest is not None:
+            self._manifest.remember(
+                Path(output_path) / file_name,
+                self._get_file_version(file_properties),
+                skipped=skipped,
+            )
+
+    def save_manifest(self):
+        """
+        Write the manifest of downloaded files (incremental mode only).
+
+        Local files of the previous run which were removed remotely or are no
+        longer selected are deleted together with their properties files, so
+        that no outdated evidence is left behind.
+        """
+        if self._manifest is not None:
+            for file_path in self._manifest.stale_files():
+                for path in (
+                    file_path,
+                    file_path.with_name(file_path.name + self.metadata_file_suffix),
+                ):
+                    if path.is_file():
+                        logger.debug("Removing file `{}` which is no longer fetched", path)
+                        self._unlink_local_file(path)
+            self._manifest.save()
+            logger.info(
+                "{} unchanged file(s) were not downloaded again", self._manifest.skipped
+            )
+
+    def log_request_stats(self):
+        """Log the number of requests and their latency per endpoint."""
+        self._connect.request_stats.log_summary()
+
     def save_file(
         self,
         path: Path,
@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import requests
+from loguru import logger
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from yaku.autopilot_utils.metrics import METRICS
+
+# status codes which SharePoint uses to tell clients to slow down
+THROTTLING_STATUS_CODES = (429, 503)
+
+# how often a throttled request is sent again before giving up
+MAX_RETRIES = 5
+
+# base and maximum delay (in seconds) for the exponential backoff
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# upper limit (in seconds) for server-sent `Retry-After` delays, to guard against bogus values
+RETRY_AFTER_MAX = 3600.0
+
+
+def get_retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+    """
+    Return the number of seconds to wait before retrying a throttled request.
+
+    If the server sent a `Retry-After` header (either as number of seconds or
+    as HTTP date), it is honoured, even if it is longer than `BACKOFF_MAX`
+    (but at most `RETRY_AFTER_MAX`). Otherwise, an exponential backoff with
+    full jitter is used, based on the number of the retry `attempt` (starting
+    at 0).
+    """
+    retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_AFTER_MAX)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return min(max(retry_at.timestamp() - time.time(), 0.0), RETRY_AFTER_MAX)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))  # nosec B311
+
+
+class AIMDLimiter:
+    """
+    Limit the number of concurrent requests with additive increase/multiplicative decrease.
+
+    The limit starts at `max_concurrency`. Every time a request is throttled
+    by the server, the limit is halved (down to `1`). Every successful request
+    increases the limit again by `1 / limit`, so that it grows by about one
+    per round of requests, up to `max_concurrency`.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(self.max_concurrency)
+        self._active = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self._active >= int(self.limit):
+                self._condition.wait()
+            self._active += 1
+
+    def release(self, throttled: bool = False):
+        with self._condition:
+            self._active -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[\w,.\-!]{16,}$")
+_QUOTED_ARGUMENT = re.compile(r"\('[^']*'\)")
+_PATH_ADDRESS = re.compile(r"root:[^:]*(:|$)")
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Return a name for the endpoint of a request, without item specific parts.
+
+    E.g. `GET https://host/v1.0/sites/<site id>/drive/items/<item id>/children`
+    becomes `GET host/v1.0/sites/{id}/drive/items/{id}/children`.
+    """
+    parts = urlparse(url)
+    path = _QUOTED_ARGUMENT.sub("(...)", parts.path)
+    path = _PATH_ADDRESS.sub(lambda m: "root:{path}" + m.group(1), path)
+    segments = ["{id}" if _ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {parts.netloc}{'/'.join(segments)}"
+
+
+class RequestStats:
+    """Collect latency and throttling statistics per endpoint. Can be shared between threads."""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, latency: float, status_code: Optional[int]):
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if status_code in THROTTLING_STATUS_CODES:
+                stats.throttled += 1
+            elif status_code is None or status_code >= 400:
+                stats.errors += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def total_throttled(self) -> int:
+        return sum(stats.throttled for stats in self.endpoints.values())
+
+    def log_summary(self):
+        logger.info(
+            "Sent {} requests, {} of them were throttled",
+            self.total_requests,
+            self.total_throttled,
+        )
+        for endpoint, stats in sorted(self.endpoints.items()):
+            logger.debug(
+                "{}: {} requests, {} throttled, {} errors, {:.3f}s average / {:.3f}s max latency",
+                endpoint,
+                stats.requests,
+                stats.throttled,
+                stats.errors,
+                stats.average_latency,
+                stats.max_latency,
+            )
+
+
+class ThrottlingAdapter(HTTPAdapter):
+    """
+    Transport adapter which retries throttled requests and limits concurrency.
+
+    Requests which are answered with `429` or `503` are retried up to
+    `max_retries_on_throttling` times, honouring the `Retry-After` header (see
+    `get_retry_delay`). The number of concurrent requests is limited by an
+    `AIMDLimiter` which backs off as soon as the server starts throttling.
+
+    Latency and status codes of all requests are recorded in `stats`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_POOLSIZE,
+        max_retries_on_throttling: int = MAX_RETRIES,
+        stats: Optional[RequestStats] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("pool_maxsize", max(max_concurrency, DEFAULT_POOLSIZE))
+        super().__init__(**kwargs)
+        self.limiter = AIMDLimiter(max_concurrency)
+        self.max_retries_on_throttling = max_retries_on_throttling
+        self.stats = stats if stats is not None else RequestStats()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        endpoint = endpoint_name(request.method or "GET", request.url or "")
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except requests.exceptions.RequestException:
+                self.limiter.release()
+                self.stats.record(endpoint, time.perf_counter() - start, None)
+                raise
+            throttled = response.status_code in THROTTLING_STATUS_CODES
+            self.limiter.release(throttled=throttled)
+            latency = time.perf_counter() - start
+            self.stats.record(endpoint, latency, response.status_code)
+            METRICS.record("sharepoint.request", latency)
+            if not throttled or attempt >= self.max_retries_on_throttling:
+                return response
+
+            delay = get_retry_delay(response.headers, attempt)
+            logger.debug(
+                "Request to `{}` was throttled ({}), retrying in {:.1f}s",
+                endpoint,
+                response.status_code,
+                delay,
+            )
+            response.close()
+            METRICS.increment("sharepoint.throttling_retries")
+            with METRICS.span("sharepoint.throttling_wait"):
+                time.sleep(delay)
+            attempt += 1
@@ -471,6 +471,11 @@ def test_trigger_fetcher_with_folder_and_selector_with_custom_properties(
         "https://my.sharepoint.com/sites/123456/_api/web/GetFolderByServerRelativeUrl('/sites/123456/Shared/Documents/Topic/Unittest/')/folders",
         json={"d": {"results": []}},
     )
+    # "Custom List" is mapped to a list, so it is not used for filtering on the server
+    requests_mock.get(
+        "https://my.sharepoint.com/sites/123456/_api/web/GetList('/sites/123456/Shared')/fields",
+        json={"value": [{"InternalName": "Custom List", "TypeAsString": "Text"}]},
+    )
     requests_mock.get(
         "https://my.sharepoint.com/sites/123456/_api/web/GetFolderByServerRelativeUrl('/sites/123456/Shared/Documents/Topic/Unittest/')/files",
         json={
@@ -353,6 +353,11 @@ def test_Settings():
     assert config_variables.custom_properties == "prop1=>list1=>item1|prop2=>list2=>item2"
     assert config_variables.download_properties_only is True
     assert config_variables.sharepoint_file == "test.pdf"
+    assert config_variables.max_workers == 1
+
+    assert Settings(**_overwrite_variable(input_variables, max_workers="8")).max_workers == 8
+    assert config_variables.incremental is False
+    assert Settings(**_overwrite_variable(input_variables, incremental="true")).incremental
 
     Settings(
         **_overwrite_variable(input_variables, sharepoint_path=None, sharepoint_site=None)
@@ -402,6 +407,16 @@ def test_Settings():
             **_overwrite_variable(input_variables, download_properties_only="invalid_value")
         )
 
+    # Invalid incremental
+    with pytest.raises(ValidationError):
+        Settings(**_overwrite_variable(input_variables, incremental="invalid_value"))
+
+    # Invalid max_workers
+    with pytest.raises(AutopilotConfigurationError):
+        Settings(**_overwrite_variable(input_variables, max_workers="0"))
+    with pytest.raises(AutopilotConfigurationError):
+        Settings(**_overwrite_variable(input_variables, max_workers="many"))
+
     # Invalid sharepoint_file / sharepoint_path
     with pytest.raises(AutopilotConfigurationError):
         Settings(
@@ -6,24 +6,31 @@ import re
 import unittest
 
 import pytest
+import requests
 import requests_mock
 from mock import patch
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
-from yaku.sharepoint_fetcher.cloud.connect import Connect
+from yaku.sharepoint_fetcher.cloud.connect import (
+    CHILDREN_PAGE_SIZE,
+    CHILDREN_SELECT,
+    Connect,
+)
 
 
 @pytest.fixture
-@patch("yaku.sharepoint_fetcher.cloud.connect.Connect._sharepoint_cloud_instance_connect")
-def connect(mock_connect):
-    mock_connect.return_value = {"Authorization": "Bearer your_token"}
+def connect():
+    with patch(
+        "yaku.sharepoint_fetcher.cloud.connect.Connect._sharepoint_cloud_instance_connect"
+    ) as mock_connect:
+        mock_connect.return_value = {"Authorization": "Bearer your_token"}
 
-    connect = Connect(
-        "https://some.sharepoint.server/sites/123456/",
-        "tenant-id",
-        "client-id",
-        "client-secret",
-    )
-    return connect
+        connect = Connect(
+            "https://some.sharepoint.server/sites/123456/",
+            "tenant-id",
+            "client-id",
+            "client-secret",
+        )
+        yield connect
 
 
 @patch("yaku.sharepoint_fetcher.cloud.connect.Connect._sharepoint_cloud_instance_connect")
@@ -46,6 +53,247 @@ def test_missing_trailing_slash_in_url(mock_connect):
     assert connect._sharepoint_site == url[:-1]
 
 
+def test_token_is_only_added_by_auth(requests_mock, connect: Connect):
+    requests_mock.get("https://graph.microsoft.com/v1.0/some/api", json={})
+
+    connect._session.get("https://graph.microsoft.com/v1.0/some/api")
+
+    assert "Authorization" not in connect._session.headers
+    assert requests_mock.last_request.headers["Authorization"] == "Bearer your_token"
+
+
+def test_download_file_object(requests_mock, mocker, connect: Connect, tmp_path):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    requests_mock.get(
+        "https://graph.microsoft.com/v1.0/sites/site_id_123/drive/root:/folder/File.txt?$expand=listItem",
+        json={"@microsoft.graph.downloadUrl": "https://example.com/download", "size": 17},
+    )
+    requests_mock.get("https://example.com/download", content=b"Mock file content")
+
+    size = connect.download_file_object("folder", "File.txt", None, tmp_path / "File.txt")
+
+    assert size == 17
+    assert (tmp_path / "File.txt").read_bytes() == b"Mock file content"
+    assert [p.name for p in tmp_path.iterdir()] == ["File.txt"]
+
+
+def test_download_file_object_wrong_size(requests_mock, mocker, connect: Connect, tmp_path):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    requests_mock.get(
+        "https://graph.microsoft.com/v1.0/sites/site_id_123/drive/root:/folder/File.txt?$expand=listItem",
+        json={"@microsoft.graph.downloadUrl": "https://example.com/download", "size": 1234},
+    )
+    requests_mock.get("https://example.com/download", content=b"Mock file content")
+
+    with pytest.raises(AutopilotError, match="expected 1234 bytes, got 17 bytes!"):
+        connect.download_file_object("folder", "File.txt", None, tmp_path / "File.txt")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_file_object_http_error(requests_mock, mocker, connect: Connect, tmp_path):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    requests_mock.get(
+        "https://graph.microsoft.com/v1.0/sites/site_id_123/drive/root:/folder/File.txt?$expand=listItem",
+        json={"@microsoft.graph.downloadUrl": "https://example.com/download", "size": 17},
+    )
+    requests_mock.get("https://example.com/download", status_code=404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        connect.download_file_object("folder", "File.txt", None, tmp_path / "File.txt")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_file_object_reuses_download_url(
+    requests_mock, mocker, connect: Connect, tmp_path
+):
+    requests_mock.get("https://example.com/download", content=b"Mock file content")
+    file_properties = {
+        "@microsoft.graph.downloadUrl": "https://example.com/download",
+        "size": 17,
+    }
+
+    size = connect.download_file_object(
+        "folder", "File.txt", None, tmp_path / "File.txt", file_properties=file_properties
+    )
+
+    assert size == 17
+    assert [r.url for r in requests_mock.request_history] == ["https://example.com/download"]
+
+
+def _batch_responder(request, context):
+    return {
+        "responses": [
+            {
+                "id": sub_request["id"],
+                "status": 200,
+                "body": {"url": sub_request["url"]},
+            }
+            for sub_request in reversed(request.json()["requests"])
+        ]
+    }
+
+
+def test_batch_get(requests_mock, connect: Connect):
+    requests_mock.post("https://graph.microsoft.com/v1.0/$batch", json=_batch_responder)
+    apis = [f"/sites/site_id_123/drive/items/{index}" for index in range(45)]
+
+    result = connect.batch_get(apis)
+
+    assert result == [{"url": api} for api in apis]
+    assert requests_mock.call_count == 3
+    assert [len(r.json()["requests"]) for r in requests_mock.request_history] == [20, 20, 5]
+
+
+def test_batch_get_failed_request(requests_mock, connect: Connect):
+    requests_mock.post(
+        "https://graph.microsoft.com/v1.0/$batch",
+        json={
+            "responses": [
+                {"id": "0", "status": 200, "body": {}},
+                {"id": "1", "status": 404, "body": {"error": {"code": "itemNotFound"}}},
+            ]
+        },
+    )
+
+    with pytest.raises(requests.exceptions.HTTPError, match="404 Error.*itemNotFound"):
+        connect.batch_get(["/sites/site_id_123/drive/a", "/sites/site_id_123/drive/b"])
+
+
+def test_batch_get_retries_throttled_requests(requests_mock, mocker, connect: Connect):
+    sleep = mocker.patch("yaku.sharepoint_fetcher.cloud.connect.time.sleep")
+    requests_mock.post(
+        "https://graph.microsoft.com/v1.0/$batch",
+        [
+            {
+                "json": {
+                    "responses": [
+                        {"id": "0", "status": 200, "body": {"value": 0}},
+                        {"id": "1", "status": 429, "headers": {"Retry-After": "3"}},
+                    ]
+                }
+            },
+            {"json": {"responses": [{"id": "1", "status": 200, "body": {"value": 1}}]}},
+        ],
+    )
+
+    assert connect.batch_get(["/a", "/b"]) == [{"value": 0}, {"value": 1}]
+    sleep.assert_called_once_with(3)
+    assert requests_mock.request_history[1].json() == {
+        "requests": [{"id": "1", "method": "GET", "url": "/b"}]
+    }
+
+
+def test_get_children_batch(requests_mock, mocker, connect: Connect):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    mocker.patch.object(connect, "get_drive_id", return_value="drive_id_123")
+    next_link = "https://graph.microsoft.com/v1.0/next-page"
+    requests_mock.post(
+        "https://graph.microsoft.com/v1.0/$batch",
+        json={
+            "responses": [
+                {
+                    "id": "0",
+                    "status": 200,
+                    "body": {"value": [{"name": "Sub", "folder": {}}]},
+                },
+                {
+                    "id": "1",
+                    "status": 200,
+                    "body": {
+                        "value": [{"name": "a.txt", "file": {}}],
+                        "@odata.nextLink": next_link,
+                    },
+                },
+            ]
+        },
+    )
+    requests_mock.get(next_link, json={"value": [{"name": "b.txt", "file": {}}]})
+
+    result = connect.get_children_batch(["", "Some Folder/"], "library")
+
+    assert result == [(["Sub"], []), ([], ["a.txt", "b.txt"])]
+    query = f"?$select={CHILDREN_SELECT}&$top={CHILDREN_PAGE_SIZE}"
+    assert [r["url"] for r in requests_mock.request_history[0].json()["requests"]] == [
+        "/sites/site_id_123/drives/drive_id_123/root/children" + query,
+        "/sites/site_id_123/drives/drive_id_123/root:/Some%20Folder:/children" + query,
+    ]
+
+
+def test_get_files_with_pagination(requests_mock, mocker, connect: Connect):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    mocker.patch.object(connect, "get_folder_id", return_value="folder_id_123")
+    children_url = (
+        "https://graph.microsoft.com/v1.0/sites/site_id_123/drive/items/folder_id_123/children"
+    )
+    next_links = [f"{children_url}?$skiptoken={page}" for page in range(1, 3)]
+    file = {"mimeType": "text/plain"}
+    requests_mock.get(
+        children_url,
+        [
+            {
+                "json": {
+                    "value": [{"name": "a.txt", "file": file}],
+                    "@odata.nextLink": next_links[0],
+                }
+            },
+            {
+                "json": {
+                    "value": [{"name": "b.txt", "file": file}],
+                    "@odata.nextLink": next_links[1],
+                }
+            },
+            {
+                "json": {
+                    "value": [{"name": "c", "folder": {}}, {"name": "d.txt", "file": file}]
+                }
+            },
+        ],
+    )
+
+    assert connect.get_files("folder", None) == ["a.txt", "b.txt", "d.txt"]
+
+    history = requests_mock.request_history
+    assert len(history) == 3
+    assert history[0].qs == {
+        "$select": [CHILDREN_SELECT.lower()],
+        "$top": [str(CHILDREN_PAGE_SIZE)],
+    }
+    assert [r.url for r in history[1:]] == next_links
+
+
+def test_get_files_properties(requests_mock, mocker, connect: Connect):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    requests_mock.post("https://graph.microsoft.com/v1.0/$batch", json=_batch_responder)
+
+    result = connect.get_files_properties("folder", ["a.txt", "b c.txt"], None)
+
+    assert result == [
+        {"url": "/sites/site_id_123/drive/root:/folder/a.txt?$expand=listItem"},
+        {"url": "/sites/site_id_123/drive/root:/folder/b%20c.txt?$expand=listItem"},
+    ]
+    assert connect.get_files_properties("folder", [], None) == []
+    assert requests_mock.call_count == 1
+
+
+def test_get_files_properties_encodes_folder(requests_mock, mocker, connect: Connect):
+    mocker.patch.object(connect, "get_site_id", return_value="site_id_123")
+    requests_mock.post("https://graph.microsoft.com/v1.0/$batch", json=_batch_responder)
+
+    result = connect.get_files_properties("/My Folder/Sub#1/", ["my file.docx"], None)
+    root_result = connect.get_files_properties("", ["my file.docx"], None)
+
+    assert result == [
+        {
+            "url": "/sites/site_id_123/drive/root:/My%20Folder/Sub%231/my%20file.docx?$expand=listItem"
+        },
+    ]
+    assert root_result == [
+        {"url": "/sites/site_id_123/drive/root:/my%20file.docx?$expand=listItem"},
+    ]
+
+
 class ConnectTest(unittest.TestCase):
     def setUp(self):
         self.mock = requests_mock.Mocker()
@@ -253,7 +501,8 @@ class ConnectTest(unittest.TestCase):
         with pytest.raises(AutopilotConfigurationError):
             connect.check_folder_access_and_presence(url_path, None, url_path)
 
-        assert self.mock.call_count == 1
+        # the request is retried once with a new token
+        assert self.mock.call_count == 2
         requested_url = self.mock.last_request.url
         assert api_url in requested_url
 
@@ -735,3 +984,58 @@ class ConnectTest(unittest.TestCase):
         result = connect.get_file_properties("123456", "test.txt", "library_name")
         assert "file_id" in result["value"][0]["file"]
         assert self.mock.call_count == 1
+
+    @patch("yaku.sharepoint_fetcher.cloud.connect.Connect._sharepoint_cloud_instance_connect")
+    def test_ids_are_resolved_only_once(self, mock_session):
+        connect = Connect(
+            "https://some.sharepoint.server/sites/123456/",
+            "tenant-id",
+            "client-id",
+            "client-secret",
+        )
+        mock_session.return_value = {"Authorization": "Bearer your_token"}
+
+        site_url = (
+            "https://graph.microsoft.com/v1.0/sites/some.sharepoint.server:/sites/123456"
+        )
+        drives_url = "https://graph.microsoft.com/v1.0/sites/site_id_123/drives"
+        folder_url = "https://graph.microsoft.com/v1.0/sites/site_id_123/drives/drive_id_123/root:/folder"
+        children_url = "https://graph.microsoft.com/v1.0/sites/site_id_123/drives/drive_id_123/items/folder_id_123/children"
+        self.mock.get(site_url, json={"id": "host,site_id_123,web_id"})
+        self.mock.get(drives_url, json={"value": [{"name": "library", "id": "drive_id_123"}]})
+        self.mock.get(folder_url, json={"id": "folder_id_123"})
+        self.mock.get(children_url, json={"value": [{"name": "file", "file": {}}]})
+
+        connect.get_files("folder", "library")
+        connect.get_files("folder", "library")
+        connect.get_folders("folder", "library")
+
+        history = [request.url for request in self.mock.request_history]
+        assert sum(url.startswith(site_url) for url in history) == 1
+        assert sum(url == drives_url for url in history) == 1
+        assert sum(url == folder_url for url in history) == 1
+        assert connect.id_cache.misses == 3
+        assert connect.id_cache.hits > 0
+
+    @patch("yaku.sharepoint_fetcher.cloud.connect.Connect._sharepoint_cloud_instance_connect")
+    def test_missing_drive_id_is_not_cached(self, mock_session):
+        connect = Connect(
+            "https://some.sharepoint.server/sites/123456/",
+            "tenant-id",
+            "client-id",
+            "client-secret",
+        )
+        mock_session.return_value = {"Authorization": "Bearer your_token"}
+
+        self.mock.get(
+            "https://graph.microsoft.com/v1.0/sites/some.sharepoint.server:/sites/123456",
+            json={"id": "host,site_id_123,web_id"},
+        )
+        self.mock.get(
+            "https://graph.microsoft.com/v1.0/sites/site_id_123/drives", status_code=503
+        )
+
+        assert connect.get_drive_id(None, "library") is None
+        assert connect.get_drive_id(None, "library") is None
+        assert connect.id_cache.misses == 3
+        assert connect.id_cache.hits == 1
@@ -10,7 +10,7 @@ from urllib.parse import quote
 import pytest
 import requests
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
-from yaku.sharepoint_fetcher.on_premise.connect import Connect
+from yaku.sharepoint_fetcher.on_premise.connect import Connect, PooledThrottlingAdapter
 
 
 @pytest.fixture
@@ -25,6 +25,22 @@ def test_initial_value():
     assert connect._session.headers == {"Accept": "application/json;odata=verbose"}
 
 
+def test_connections_are_pooled():
+    connect = Connect("https://sharepoint.com", "username", "password", pool_size=16)
+    adapter = connect._session.get_adapter("https://sharepoint.com")
+    assert isinstance(adapter, PooledThrottlingAdapter)
+    assert adapter._pool_maxsize == 16
+    assert adapter.limiter.max_concurrency == 16
+    assert adapter.connection_stats is connect.connection_stats
+    assert adapter.stats is connect.request_stats
+
+
+def test_concurrency_limit_follows_pool_size():
+    connect = Connect("https://sharepoint.com", "username", "password", pool_size=1)
+    adapter = connect._session.get_adapter("https://sharepoint.com")
+    assert adapter.limiter.max_concurrency == 1
+
+
 def test_force_ip(mocker):
     connect = Connect(
         "https://some.sharepoint.server/sites/123456/",
@@ -207,7 +223,8 @@ def test_get_folders(requests_mock, connect: Connect):
     assert requests_mock.call_count == 1
     requested_url = requests_mock.last_request.url
     assert "/_api/web/GetFolder" in requested_url
-    assert requested_url.endswith("/folders")
+    assert requested_url.endswith("/folders?$select=ServerRelativeUrl")
+    assert requests_mock.last_request.headers["Accept"] == "application/json;odata=nometadata"
 
 
 def test_get_files(requests_mock, connect: Connect):
@@ -223,7 +240,51 @@ def test_get_files(requests_mock, connect: Connect):
     assert requests_mock.call_count == 1
     requested_url = requests_mock.last_request.url
     assert "/_api/web/GetFolder" in requested_url
-    assert requested_url.endswith("/files")
+    assert requested_url.endswith("/files?$select=Name")
+    assert requests_mock.last_request.headers["Accept"] == "application/json;odata=nometadata"
+
+
+def test_get_files_without_metadata(requests_mock, connect: Connect):
+    requests_mock.get(
+        "https://some.sharepoint.server/sites/123456/_api/web/GetFolderByServerRelativeUrl('/sites/123456/test')/files",
+        json={"value": [{"Name": "A.docx"}], "odata.nextLink": "https://some.fake.url/page2"},
+    )
+    requests_mock.get("https://some.fake.url/page2", json={"value": [{"Name": "B.docx"}]})
+
+    assert connect.get_files("/sites/123456/test") == [{"Name": "A.docx"}, {"Name": "B.docx"}]
+
+
+def test_get_filtered_file_names(requests_mock, connect: Connect):
+    requests_mock.get(
+        "https://some.sharepoint.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/items",
+        json={"value": [{"FileLeafRef": "A.docx"}]},
+    )
+
+    assert connect.get_filtered_file_names(
+        "/sites/123456/Documents", "/sites/123456/Documents/Bob's folder", "Status eq 'Done'"
+    ) == ["A.docx"]
+
+    assert requests_mock.last_request.qs["$filter"] == [
+        "filedirref eq '/sites/123456/documents/bob''s folder' and fsobjtype eq 0 and (status eq 'done')"
+    ]
+    assert requests_mock.last_request.qs["$select"] == ["fileleafref"]
+
+
+def test_get_list_field_types(requests_mock, connect: Connect):
+    requests_mock.get(
+        "https://some.sharepoint.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/fields",
+        json={
+            "value": [
+                {"InternalName": "Modified", "TypeAsString": "DateTime"},
+                {"InternalName": "Status", "TypeAsString": "Choice"},
+            ]
+        },
+    )
+
+    assert connect.get_list_field_types("/sites/123456/Documents") == {
+        "Modified": "DateTime",
+        "Status": "Choice",
+    }
 
 
 def test_get_files_with_paginated_results(requests_mock, connect: Connect):
@@ -279,6 +340,42 @@ def test_get_file_object(mocker, connect: Connect):
     assert requested_url.endswith("/$value")
 
 
+def test_download_file_object(requests_mock, connect: Connect, tmp_path):
+    file_url = "https://some.sharepoint.server/sites/123456/_api/web/GetFileByServerRelativePath(decodedurl='/sites/123456/test/test%203.txt')"
+    requests_mock.get(file_url + "/Properties", json={"d": {"vti_x005f_filesize": 17}})
+    requests_mock.get(file_url + "/$value", content=b"Mock file content")
+
+    size = connect.download_file_object("/sites/123456/test", "test 3.txt", tmp_path / "out")
+
+    assert size == 17
+    assert (tmp_path / "out").read_bytes() == b"Mock file content"
+    assert [p.name for p in tmp_path.iterdir()] == ["out"]
+
+
+def test_download_file_object_with_known_size(requests_mock, connect: Connect, tmp_path):
+    file_url = "https://some.sharepoint.server/sites/123456/_api/web/GetFileByServerRelativePath(decodedurl='/sites/123456/test/test3.txt')"
+    requests_mock.get(file_url + "/$value", content=b"Mock file content")
+
+    size = connect.download_file_object(
+        "/sites/123456/test", "test3.txt", tmp_path / "out", file_size=17
+    )
+
+    assert size == 17
+    assert requests_mock.call_count == 1
+
+
+def test_download_file_object_wrong_size(requests_mock, connect: Connect, tmp_path):
+    file_url = "https://some.sharepoint.server/sites/123456/_api/web/GetFileByServerRelativePath(decodedurl='/sites/123456/test/test3.txt')"
+    requests_mock.get(file_url + "/Properties", json={"d": {"vti_x005f_filesize": 1234}})
+    requests_mock.get(file_url + "/$value", content=b"Mock file content")
+
+    match = "expected 1234 bytes, got 17 bytes!"
+    with pytest.raises(AutopilotError, match=match):
+        connect.download_file_object("/sites/123456/test", "test3.txt", tmp_path / "out")
+
+    assert list(tmp_path.iterdir()) == []
+
+
 def test_get_file_properties(mocker, connect: Connect):
     mocked_get_request: mock.MagicMock = mocker.patch(
         "yaku.sharepoint_fetcher.on_premise.connect.Connect._get"
@@ -320,6 +417,20 @@ def test_get_file_properties(mocker, connect: Connect):
     assert mocked_get_request.call_count == 1
     requested_url = mocked_get_request.call_args.args[0]
     assert "/_api/web/GetFile" in requested_url
+    assert requested_url.endswith("/ListItemAllFields?$select=*,File/Length&$expand=File")
+
+
+@pytest.mark.parametrize(
+    "file_properties,expected",
+    [
+        ({"File": {"Length": "17"}}, 17),
+        ({"File": {"__deferred": {"uri": "https://some.server/File"}}}, None),
+        ({"File": {"Length": "unknown"}}, None),
+        ({}, None),
+    ],
+)
+def test_get_file_size(file_properties, expected):
+    assert Connect.get_file_size(file_properties) == expected
 
 
 def test_get_additional_file_properties(mocker, connect: Connect):
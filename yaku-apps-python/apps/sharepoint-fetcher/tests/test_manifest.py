@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import json
+from pathlib import Path
+
+from yaku.sharepoint_fetcher.manifest import Manifest
+
+VERSION = {"id": "1", "tag": "abc", "size": 3}
+
+
+def test_new_manifest_has_no_unchanged_files(tmp_path: Path):
+    (tmp_path / "file.txt").write_text("abc")
+    manifest = Manifest(tmp_path / "__manifest__.json")
+
+    assert not manifest.is_unchanged(tmp_path / "file.txt", VERSION)
+
+
+def test_manifest_roundtrip(tmp_path: Path):
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "folder" / "file.txt").write_text("abc")
+    manifest = Manifest(tmp_path / "__manifest__.json")
+    manifest.remember(tmp_path / "folder" / "file.txt", VERSION)
+    manifest.remember(tmp_path / "folder" / "unknown.txt", None)
+    manifest.save()
+
+    assert json.loads((tmp_path / "__manifest__.json").read_text()) == {
+        "folder/file.txt": VERSION
+    }
+
+    manifest = Manifest(tmp_path / "__manifest__.json")
+    assert manifest.is_unchanged(tmp_path / "folder" / "file.txt", VERSION)
+    assert not manifest.is_unchanged(tmp_path / "folder" / "file.txt", {**VERSION, "tag": "x"})
+    assert not manifest.is_unchanged(tmp_path / "folder" / "file.txt", None)
+    (tmp_path / "folder" / "file.txt").unlink()
+    assert not manifest.is_unchanged(tmp_path / "folder" / "file.txt", VERSION)
+
+
+def test_manifest_only_keeps_remembered_files(tmp_path: Path):
+    (tmp_path / "__manifest__.json").write_text(json.dumps({"old.txt": VERSION}))
+    manifest = Manifest(tmp_path / "__manifest__.json")
+    manifest.remember(tmp_path / "new.txt", VERSION, skipped=True)
+    manifest.save()
+
+    assert manifest.skipped == 1
+    assert json.loads((tmp_path / "__manifest__.json").read_text()) == {"new.txt": VERSION}
+
+
+def test_manifest_stale_files(tmp_path: Path):
+    (tmp_path / "__manifest__.json").write_text(
+        json.dumps({"kept.txt": VERSION, "folder/old.txt": VERSION, "../outside.txt": VERSION})
+    )
+    manifest = Manifest(tmp_path / "__manifest__.json")
+    manifest.remember(tmp_path / "kept.txt", VERSION)
+
+    assert manifest.stale_files() == [(tmp_path / "folder" / "old.txt").resolve()]
+
+
+def test_invalid_manifest_file_is_ignored(tmp_path: Path, caplog):
+    (tmp_path / "file.txt").write_text("abc")
+    (tmp_path / "__manifest__.json").write_text("{no json")
+    manifest = Manifest(tmp_path / "__manifest__.json")
+
+    assert not manifest.is_unchanged(tmp_path / "file.txt", VERSION)
+    assert "Could not read manifest file" in caplog.text
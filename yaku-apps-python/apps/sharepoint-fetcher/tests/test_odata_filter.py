@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+from yaku.sharepoint_fetcher.on_premise.odata_filter import (
+    files_selectors_to_odata_filter,
+    selector_to_odata_filter,
+)
+from yaku.sharepoint_fetcher.selectors import FilesSelectors, Selector
+
+FIELD_TYPES = {
+    "Status": "Choice",
+    "Version": "Number",
+    "Modified": "DateTime",
+    "Notes": "Note",
+}
+
+
+@pytest.mark.parametrize(
+    "selector,expected",
+    [
+        (Selector("Status", "equals", "Done"), "Status eq 'Done'"),
+        (Selector("Status", "equals", "Bob's"), "Status eq 'Bob''s'"),
+        (Selector("Status", "contains", "Do"), "substringof('Do',Status)"),
+        (Selector("Status", "not-empty"), "Status ne null"),
+        (Selector("Version", "larger", 2), "Version gt 2"),
+        (Selector("Version", "is-less-equal", "2.5"), "Version le 2.5"),
+        (
+            Selector("Modified", "older", "2024-01-10T00:00:00Z"),
+            "Modified lt datetime'2024-01-11T00:00:00Z'",
+        ),
+        (
+            Selector("Modified", "not-older-than", "2024-01-10T00:00:00Z"),
+            "Modified ge datetime'2024-01-09T00:00:00Z'",
+        ),
+        # numbers in text fields are compared as numbers on the client side
+        (Selector("Status", "equals", "1"), None),
+        (Selector("Version", "equals", 2), None),
+        (Selector("Status", "larger", 2), None),
+        (Selector("Notes", "contains", "x"), None),
+        (Selector("Status", "empty"), None),
+        (Selector("Unknown", "equals", "x"), None),
+    ],
+)
+def test_selector_to_odata_filter(selector, expected):
+    assert selector_to_odata_filter(selector, FIELD_TYPES.get(selector.property)) == expected
+
+
+def test_files_selectors_to_odata_filter():
+    files_selectors = [
+        FilesSelectors(
+            "*.docx",
+            [Selector("Status", "equals", "Done"), Selector("Version", "larger", 1)],
+        ),
+        FilesSelectors(
+            "*.pdf",
+            [Selector("Status", "equals", "Draft"), Selector("Notes", "contains", "x")],
+        ),
+    ]
+
+    assert files_selectors_to_odata_filter(files_selectors, FIELD_TYPES) == (
+        "(Status eq 'Done' and Version gt 1) or (Status eq 'Draft')"
+    )
+
+
+def test_files_selectors_without_translatable_selectors_are_not_filtered():
+    files_selectors = [
+        FilesSelectors("*.docx", [Selector("Status", "equals", "Done")]),
+        FilesSelectors("*.pdf", [Selector("Notes", "contains", "x")]),
+    ]
+
+    assert files_selectors_to_odata_filter(files_selectors, FIELD_TYPES) is None
+    assert files_selectors_to_odata_filter([], FIELD_TYPES) is None
@@ -10,7 +10,7 @@ from pathlib import Path
 from unittest import mock
 
 import pytest
-from yaku.autopilot_utils.errors import AutopilotError
+from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
 from yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud import (
     SharepointFetcherCloud,
 )
@@ -179,11 +179,10 @@ def test_get_relative_url_prefix_shorter(caplog):
 
 
 def test_download_file(mocker, default_fetcher: SharepointFetcherCloud):
-    mocked_connect_get_file_object = mocker.patch(
-        "yaku.sharepoint_fetcher.cloud.connect.Connect.get_file_object"
+    mocked_connect_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.connect.Connect.download_file_object"
     )
-    file_response = b"0x410x420x43"
-    mocked_connect_get_file_object.return_value = file_response
+    mocked_connect_download_file_object.return_value = 12
 
     mocked_connect_get_file_properties = mocker.patch(
         "yaku.sharepoint_fetcher.cloud.connect.Connect.get_file_properties"
@@ -200,11 +199,16 @@ def test_download_file(mocker, default_fetcher: SharepointFetcherCloud):
     res_folder = Path(os.getcwd() + "/tests/resources")
     default_fetcher._download_file(res_folder, "/sites/123456/Documents/somepath", file_name)
 
-    mocked_connect_get_file_object.assert_called_with("somepath", "test3.txt", "Documents")
+    mocked_connect_download_file_object.assert_called_with(
+        "somepath",
+        "test3.txt",
+        "Documents",
+        res_folder / "test3.txt",
+        file_properties=property_response,
+    )
     mocked_connect_get_file_properties.assert_called_with("somepath", "test3.txt", "Documents")
     mocked_save_file.assert_has_calls(
         [
-            mock.call(res_folder, "test3.txt", file_response, False),
             mock.call(
                 res_folder,
                 "test3.txt" + SharepointFetcherCloud.metadata_file_suffix,
@@ -217,11 +221,10 @@ def test_download_file(mocker, default_fetcher: SharepointFetcherCloud):
 
 
 def test_download_file_trailing_slash(mocker, default_fetcher: SharepointFetcherCloud):
-    mocked_connect_get_file_object = mocker.patch(
-        "yaku.sharepoint_fetcher.cloud.connect.Connect.get_file_object"
+    mocked_connect_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.connect.Connect.download_file_object"
     )
-    file_response = b"0x410x420x43"
-    mocked_connect_get_file_object.return_value = file_response
+    mocked_connect_download_file_object.return_value = 12
 
     mocked_connect_get_file_properties = mocker.patch(
         "yaku.sharepoint_fetcher.cloud.connect.Connect.get_file_properties"
@@ -238,7 +241,13 @@ def test_download_file_trailing_slash(mocker, default_fetcher: SharepointFetcher
     res_folder = Path(os.getcwd() + "/tests/resources")
     default_fetcher._download_file(res_folder, "/sites/123456/Documents/somepath/", file_name)
 
-    mocked_connect_get_file_object.assert_called_with("somepath", "test3.txt", "Documents")
+    mocked_connect_download_file_object.assert_called_with(
+        "somepath",
+        "test3.txt",
+        "Documents",
+        res_folder / "test3.txt",
+        file_properties=property_response,
+    )
     mocked_connect_get_file_properties.assert_called_with("somepath", "test3.txt", "Documents")
 
 
@@ -284,16 +293,16 @@ def test_download_file_with_empty_selectors(mocker, default_fetcher: SharepointF
         "yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud.SharepointFetcher.save_file"
     )
 
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.cloud.connect.Connect.get_file_object"
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.connect.Connect.download_file_object"
     )
 
     default_fetcher._download_file(
         "evidence_path/", "/sites/123456/Test1/", "File1.docx", files_selectors=[]
     )
 
-    assert mocked_save_file.call_count == 2
-    assert mocked_connect_get_file_object.call_count == 1
+    assert mocked_save_file.call_count == 1
+    assert mocked_connect_download_file_object.call_count == 1
 
 
 def test_save_file_with_bytes(requests_mock, caplog):
@@ -373,14 +382,24 @@ def test_download_folder_files_without_subfolders(mocker):
     )
     mocked_download_file.return_value = {}
 
+    mocked_fetch_files_properties = mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud.SharepointFetcherCloud._fetch_files_properties"
+    )
+    mocked_fetch_files_properties.return_value = {"f1": {"name": "f1"}}
+
     mocker.patch("os.makedirs")
 
     fetcher.download_folder(None)
 
     mocked_fetch_files.assert_called_with(site_prefix + remote_path)
     mocked_fetch_subfolders.assert_called_with("shared-foss-id/")
+    mocked_fetch_files_properties.assert_called_once_with(site_prefix + remote_path, ["f1"])
     mocked_download_file.assert_called_with(
-        output_dir, site_prefix + remote_path, "f1", files_selectors=[]
+        output_dir,
+        site_prefix + remote_path,
+        "f1",
+        files_selectors=[],
+        file_properties={"name": "f1"},
     )
 
 
@@ -434,6 +453,10 @@ def test_download_folders_files_with_nested_folders(
         "yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud.SharepointFetcherCloud._fetch_files"
     )
     mocked_fetch_files.return_value = []
+    mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.sharepoint_fetcher_cloud.SharepointFetcherCloud._fetch_files_properties",
+        return_value={},
+    )
 
     mocker.patch("os.makedirs")
 
@@ -450,3 +473,157 @@ def test_generate_filters_and_selectors(requests_mock):
     )
     assert folder_filters == ["Folder1/"]
     assert files_selectors == {"Folder1/": filter_config}
+
+
+def test_download_folder_concurrently(mocker, tmp_path: Path, caplog):
+    fetcher = SharepointFetcherCloud(
+        "Documents/fossid-tools-report-ok/",
+        tmp_path,
+        "https://some.server/sites/123456/",
+        "tenant-id",
+        "client-id",
+        "client-secret",
+        filter_config=[
+            FilesSelectors("*.txt", []),
+            FilesSelectors("Test/*.xlsx", []),
+            FilesSelectors("Test/*.pdf", []),
+        ],
+        max_workers=4,
+    )
+    children = {
+        "fossid-tools-report-ok/": (
+            ["/sites/123456/Documents/fossid-tools-report-ok/Test"],
+            ["a.txt", "b.txt", "c.doc"],
+        ),
+        "fossid-tools-report-ok/Test/": ([], ["d.xlsx"]),
+    }
+    mocked_get_children_batch = mocker.patch.object(
+        fetcher._connect,
+        "get_children_batch",
+        side_effect=lambda folders, library_name: [children[f] for f in folders],
+    )
+    mocker.patch.object(
+        fetcher._connect,
+        "get_files_properties",
+        side_effect=lambda path, files, library_name: [{"name": f} for f in files],
+    )
+    mocked_download_file = mocker.patch.object(fetcher, "_download_file", return_value=True)
+
+    fetcher.download_folder()
+
+    assert (tmp_path / "Test").is_dir()
+    downloaded = sorted(c.args[2] for c in mocked_download_file.call_args_list)
+    assert downloaded == ["a.txt", "b.txt", "d.xlsx"]
+    mocked_download_file.assert_any_call(
+        tmp_path / "Test",
+        "/sites/123456/Documents/fossid-tools-report-ok/Test/",
+        "d.xlsx",
+        files_selectors=[FilesSelectors("Test/*.xlsx", []), FilesSelectors("Test/*.pdf", [])],
+        file_properties={"name": "d.xlsx"},
+    )
+    assert mocked_get_children_batch.call_count == 2
+    mocked_get_children_batch.assert_called_with(["fossid-tools-report-ok/Test/"], "Documents")
+    assert "Some file filters for `Test/` didn't match any file!" in caplog.text
+    assert "Test/*.pdf" in caplog.text
+    assert "<root path>" not in caplog.text
+
+
+def test_invalid_max_workers():
+    with pytest.raises(AutopilotConfigurationError):
+        SharepointFetcherCloud(
+            "Documents/",
+            Path("evidence_path"),
+            "https://some.server/sites/123456/",
+            "tenant-id",
+            "client-id",
+            "client-secret",
+            max_workers=0,
+        )
+
+
+def test_download_file_incremental(mocker, tmp_path: Path):
+    fetcher = SharepointFetcherCloud(
+        "Documents/",
+        tmp_path,
+        "https://some.server/sites/123456/",
+        "tenant-id",
+        "client-id",
+        "client-secret",
+        incremental=True,
+    )
+    mocked_download_file_object = mocker.patch.object(
+        fetcher._connect,
+        "download_file_object",
+        side_effect=lambda *args, **kwargs: args[3].write_text("abc"),
+    )
+    file_properties = {"id": "1", "cTag": "c1", "eTag": "e1", "size": 3}
+
+    fetcher._download_file(
+        tmp_path, "/sites/123456/Documents/", "a.txt", file_properties=file_properties
+    )
+    fetcher.save_manifest()
+    assert mocked_download_file_object.call_count == 1
+
+    fetcher = SharepointFetcherCloud(
+        "Documents/",
+        tmp_path,
+        "https://some.server/sites/123456/",
+        "tenant-id",
+        "client-id",
+        "client-secret",
+        incremental=True,
+    )
+    mocked_download_file_object = mocker.patch.object(fetcher._connect, "download_file_object")
+
+    # only the metadata changed
+    file_properties["eTag"] = "e2"
+    fetcher._download_file(
+        tmp_path, "/sites/123456/Documents/", "a.txt", file_properties=file_properties
+    )
+    mocked_download_file_object.assert_not_called()
+    assert json.loads((tmp_path / "a.txt.__properties__.json").read_text())["eTag"] == "e2"
+
+    file_properties["cTag"] = "c2"
+    fetcher._download_file(
+        tmp_path, "/sites/123456/Documents/", "a.txt", file_properties=file_properties
+    )
+    assert mocked_download_file_object.call_count == 1
+
+
+def test_files_removed_remotely_are_deleted_in_incremental_mode(mocker, tmp_path: Path):
+    def run_fetcher(file_names):
+        fetcher = SharepointFetcherCloud(
+            "Documents/",
+            tmp_path,
+            "https://some.server/sites/123456/",
+            "tenant-id",
+            "client-id",
+            "client-secret",
+            incremental=True,
+        )
+        mocker.patch.object(
+            fetcher._connect,
+            "download_file_object",
+            side_effect=lambda *args, **kwargs: args[3].write_text("abc"),
+        )
+        for index, file_name in enumerate(file_names):
+            fetcher._download_file(
+                tmp_path,
+                "/sites/123456/Documents/",
+                file_name,
+                file_properties={"id": str(index), "cTag": "c1", "eTag": "e1", "size": 3},
+            )
+        fetcher.save_manifest()
+
+    run_fetcher(["a.txt", "b.txt"])
+    assert (tmp_path / "b.txt").exists()
+    assert (tmp_path / "b.txt.__properties__.json").exists()
+
+    # b.txt was removed on SharePoint
+    run_fetcher(["a.txt"])
+
+    assert (tmp_path / "a.txt").exists()
+    assert (tmp_path / "a.txt.__properties__.json").exists()
+    assert not (tmp_path / "b.txt").exists()
+    assert not (tmp_path / "b.txt.__properties__.json").exists()
+    assert json.loads((tmp_path / "__manifest__.json").read_text()).keys() == {"a.txt"}
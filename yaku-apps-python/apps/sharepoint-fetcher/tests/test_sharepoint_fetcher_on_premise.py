@@ -205,6 +205,99 @@ def test_fetch_file_names_list_with_paginated_results(
     ]
 
 
+def test_fetch_files_filtered_on_server(requests_mock):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        Path("evidence_path"),
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[FilesSelectors("*.docx", [Selector("Status", "equals", "Done")])],
+    )
+    requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/fields",
+        json={"value": [{"InternalName": "Status", "TypeAsString": "Choice"}]},
+    )
+    mocked_items = requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/items",
+        json={"value": [{"FileLeafRef": "FILE1.docx"}]},
+    )
+
+    assert fetcher._fetch_files("/sites/123456/Documents/fossid-tools-report-ok/") == [
+        "FILE1.docx"
+    ]
+    assert mocked_items.last_request.qs["$filter"] == [
+        "filedirref eq '/sites/123456/documents/fossid-tools-report-ok' and fsobjtype eq 0 and (status eq 'done')"
+    ]
+
+
+def test_fetch_files_filtered_on_server_by_url(requests_mock):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        Path("evidence_path"),
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[
+            FilesSelectors("*.docx", [Selector("Link", "equals", "https://example.com/a")])
+        ],
+    )
+    requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/fields",
+        json={"value": [{"InternalName": "Link", "TypeAsString": "Text"}]},
+    )
+    mocked_items = requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/items",
+        json={"value": [{"FileLeafRef": "FILE1.docx"}]},
+    )
+
+    assert fetcher._fetch_files("/sites/123456/Documents/fossid-tools-report-ok/") == [
+        "FILE1.docx"
+    ]
+    assert mocked_items.last_request.url.count("//") == 1
+    assert mocked_items.last_request.qs["$filter"] == [
+        "filedirref eq '/sites/123456/documents/fossid-tools-report-ok' and fsobjtype eq 0 and (link eq 'https://example.com/a')"
+    ]
+
+
+def test_fetch_files_falls_back_to_unfiltered_listing(requests_mock):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        Path("evidence_path"),
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[FilesSelectors("*.docx", [Selector("Status", "equals", "Done")])],
+    )
+    requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/fields",
+        json={"value": [{"InternalName": "Status", "TypeAsString": "Choice"}]},
+    )
+    # e.g. if the list view threshold is exceeded
+    mocked_items = requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetList('/sites/123456/Documents')/items",
+        status_code=500,
+    )
+    requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetFolderByServerRelativeUrl('/sites/123456/Documents/fossid-tools-report-ok/')/files",
+        json={"value": [{"Name": "FILE1.docx"}, {"Name": "FILE2.docx"}]},
+    )
+    requests_mock.get(
+        "https://some.server/sites/123456/_api/web/GetFolderByServerRelativeUrl('/sites/123456/Documents/fossid-tools-report-ok/Sub/')/files",
+        json={"value": [{"Name": "FILE3.docx"}]},
+    )
+
+    assert fetcher._fetch_files("/sites/123456/Documents/fossid-tools-report-ok/") == [
+        "FILE1.docx",
+        "FILE2.docx",
+    ]
+    # the filtered listing is not tried again for other folders
+    assert fetcher._fetch_files("/sites/123456/Documents/fossid-tools-report-ok/Sub/") == [
+        "FILE3.docx"
+    ]
+    assert mocked_items.call_count == 1
+
+
 def test_fetch_folder_relative_urls_list(
     requests_mock, default_fetcher: SharepointFetcherOnPremise
 ):
@@ -220,12 +313,11 @@ def test_fetch_folder_relative_urls_list(
 
 
 def test_download_file(mocker, default_fetcher: SharepointFetcherOnPremise):
-    # mock get_file_object
-    mocked_connect_get_file_object = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    file_response = b"0x410x420x43"
-    mocked_connect_get_file_object.return_value = file_response
+    mocked_connect_download_file_object.return_value = 12
 
     # mock get_file_properties
     mocked_connect_get_file_properties = mocker.patch(
@@ -244,15 +336,17 @@ def test_download_file(mocker, default_fetcher: SharepointFetcherOnPremise):
     res_folder = Path(os.getcwd() + "/tests/resources")
     default_fetcher._download_file(res_folder, "/sites/123456/Documents/somepath", file_name)
 
-    mocked_connect_get_file_object.assert_called_with(
-        "/sites/123456/Documents/somepath", "test3.txt"
+    mocked_connect_download_file_object.assert_called_with(
+        "/sites/123456/Documents/somepath",
+        "test3.txt",
+        res_folder / "test3.txt",
+        file_size=None,
     )
     mocked_connect_get_file_properties.assert_called_with(
         "/sites/123456/Documents/somepath", "test3.txt"
     )
     mocked_save_file.assert_has_calls(
         [
-            mock.call(res_folder, "test3.txt", file_response, False),
             mock.call(
                 res_folder,
                 "test3.txt" + SharepointFetcherOnPremise.metadata_file_suffix,
@@ -265,12 +359,11 @@ def test_download_file(mocker, default_fetcher: SharepointFetcherOnPremise):
 
 
 def test_download_file_trailing_slash(mocker, default_fetcher: SharepointFetcherOnPremise):
-    # mock get_file_object
-    mocked_connect_get_file_object = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    file_response = b"0x410x420x43"
-    mocked_connect_get_file_object.return_value = file_response
+    mocked_connect_download_file_object.return_value = 12
 
     # mock get_file_properties
     mocked_connect_get_file_properties = mocker.patch(
@@ -289,14 +382,46 @@ def test_download_file_trailing_slash(mocker, default_fetcher: SharepointFetcher
     res_folder = Path(os.getcwd() + "/tests/resources")
     default_fetcher._download_file(res_folder, "/sites/123456/Documents/somepath/", file_name)
 
-    mocked_connect_get_file_object.assert_called_with(
-        "/sites/123456/Documents/somepath", "test3.txt"
+    mocked_connect_download_file_object.assert_called_with(
+        "/sites/123456/Documents/somepath",
+        "test3.txt",
+        res_folder / "test3.txt",
+        file_size=None,
     )
     mocked_connect_get_file_properties.assert_called_with(
         "/sites/123456/Documents/somepath", "test3.txt"
     )
 
 
+def test_download_file_reuses_file_size_from_properties(
+    mocker, default_fetcher: SharepointFetcherOnPremise
+):
+    mocked_connect_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
+    )
+    mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_properties",
+        return_value={"some": "json-data", "File": {"Length": "17"}},
+    )
+    mocked_save_file = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise.save_file"
+    )
+
+    res_folder = Path(os.getcwd() + "/tests/resources")
+    default_fetcher._download_file(res_folder, "/sites/123456/Documents/somepath", "test3.txt")
+
+    mocked_connect_download_file_object.assert_called_with(
+        "/sites/123456/Documents/somepath",
+        "test3.txt",
+        res_folder / "test3.txt",
+        file_size=17,
+    )
+    # the expanded file object is not saved with the other properties
+    mocked_save_file.assert_called_once_with(
+        res_folder, "test3.txt.__properties__.json", '{\n  "some": "json-data"\n}', True
+    )
+
+
 def test_download_file_only_properties(mocker, default_fetcher: SharepointFetcherOnPremise):
     # mock get_file_properties
     mocked_connect_get_file_properties = mocker.patch(
@@ -355,17 +480,17 @@ def test_download_file_with_empty_selectors(
         "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcher.save_file"
     )
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
 
     default_fetcher._download_file(
         "evidence_path/", "/sites/123456/Test1/", "File1.docx", files_selectors=[]
     )
 
-    assert mocked_save_file.call_count == 2
-    assert mocked_connect_get_file_object.call_count == 1
+    assert mocked_save_file.call_count == 1
+    assert mocked_connect_download_file_object.call_count == 1
 
 
 def test_download_file_with_simple_equality_selector(
@@ -385,11 +510,10 @@ def test_download_file_with_simple_equality_selector(
     additional_property_response = (1, {"d": {"vti_x005f_filesize": 1}})
     mocked_connect_get_additional_file_properties.return_value = additional_property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     default_fetcher._download_file(
         tmp_path,
@@ -401,8 +525,9 @@ def test_download_file_with_simple_equality_selector(
     )
 
     assert (tmp_path / ("File1.docx" + default_fetcher.metadata_file_suffix)).exists()
-    assert (tmp_path / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 1
+    mocked_connect_download_file_object.assert_called_once_with(
+        "/sites/123456/Test1", "File1.docx", tmp_path / "File1.docx", file_size=None
+    )
 
 
 def test_download_file_with_invalid_property_selector(
@@ -422,11 +547,10 @@ def test_download_file_with_invalid_property_selector(
     additional_property_response = (1, {"d": {"vti_x005f_filesize": 1}})
     mocked_connect_get_additional_file_properties.return_value = additional_property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     with pytest.raises(AutopilotConfigurationError, match="unknown_property"):
         default_fetcher._download_file(
@@ -443,7 +567,7 @@ def test_download_file_with_invalid_property_selector(
     # property file should still exist so that we can manually debug the unknown property issue
     assert (tmp_path / ("File1.docx" + default_fetcher.metadata_file_suffix)).exists()
     assert not (tmp_path / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 0
+    assert mocked_connect_download_file_object.call_count == 0
 
 
 def test_download_file_with_custom_property_value(mocker, tmp_path: Path):
@@ -470,11 +594,10 @@ def test_download_file_with_custom_property_value(mocker, tmp_path: Path):
     additional_property_response = (1, {"d": {"vti_x005f_filesize": 1}})
     mocked_connect_get_additional_file_properties.return_value = additional_property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     # put custom property file into tmp_path and tell it the properties reader instance
     custom_prop_def_file = evidence_folder / my_fetcher.custom_property_definitions_filename
@@ -498,8 +621,9 @@ def test_download_file_with_custom_property_value(mocker, tmp_path: Path):
     )
 
     assert (tmp_path / ("File1.docx" + my_fetcher.metadata_file_suffix)).exists()
-    assert (tmp_path / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 1
+    mocked_connect_download_file_object.assert_called_once_with(
+        "/sites/123456/Test1", "File1.docx", tmp_path / "File1.docx", file_size=None
+    )
 
 
 def test_download_file_with_unmatched_custom_property_value(mocker, tmp_path: Path):
@@ -526,11 +650,10 @@ def test_download_file_with_unmatched_custom_property_value(mocker, tmp_path: Pa
     additional_property_response = (1, {"d": {"vti_x005f_filesize": 1}})
     mocked_connect_get_additional_file_properties.return_value = additional_property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     # put custom property file into tmp_path and tell it the properties reader instance
     custom_prop_def_file = evidence_folder / my_fetcher.custom_property_definitions_filename
@@ -555,7 +678,7 @@ def test_download_file_with_unmatched_custom_property_value(mocker, tmp_path: Pa
 
     assert not (evidence_folder / ("File1.docx" + my_fetcher.metadata_file_suffix)).exists()
     assert not (evidence_folder / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 0
+    assert mocked_connect_download_file_object.call_count == 0
 
 
 def test_download_file_with_unmatched_simple_equality_selector(
@@ -575,11 +698,10 @@ def test_download_file_with_unmatched_simple_equality_selector(
     additional_property_response = (1, {"d": {"vti_x005f_filesize": 1}})
     mocked_connect_get_additional_file_properties.return_value = additional_property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     default_fetcher._download_file(
         tmp_path,
@@ -592,7 +714,7 @@ def test_download_file_with_unmatched_simple_equality_selector(
 
     assert not (tmp_path / ("File1.docx" + default_fetcher.metadata_file_suffix)).exists()
     assert not (tmp_path / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 0
+    assert mocked_connect_download_file_object.call_count == 0
 
 
 def test_download_file_with_one_matched_and_one_unmatched_selectors(
@@ -605,11 +727,10 @@ def test_download_file_with_one_matched_and_one_unmatched_selectors(
     property_response = {"some_property": "some_data", "some_number": 5}
     mocked_connect_get_file_properties.return_value = property_response
 
-    # mock get_file_object
-    mocked_connect_get_file_object: mock.Mock = mocker.patch(
-        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_object"
+    # mock download_file_object
+    mocked_connect_download_file_object: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object"
     )
-    mocked_connect_get_file_object.return_value = b""
 
     # mock get_additional_file_properties
     mocked_connect_get_additional_file_object: mock.Mock = mocker.patch(
@@ -637,7 +758,7 @@ def test_download_file_with_one_matched_and_one_unmatched_selectors(
 
     assert not (tmp_path / ("File1.docx" + default_fetcher.metadata_file_suffix)).exists()
     assert not (tmp_path / "File1.docx").exists()
-    assert mocked_connect_get_file_object.call_count == 0
+    assert mocked_connect_download_file_object.call_count == 0
 
 
 def test_save_file_with_bytes(requests_mock, caplog):
@@ -749,6 +870,190 @@ def test_download_folders_files_with_nested_folders(
     assert mocked_fetch_subfolders.call_count == 2
 
 
+def _mock_folder_tree(mocker, tree: Dict[str, Any]) -> mock.Mock:
+    prefix = "/sites/123456/Documents/fossid-tools-report-ok/"
+
+    def fetch_subfolders_mock(remote_path: str):
+        node = tree
+        for segment in remote_path[len(prefix) :].strip("/").split("/"):
+            if segment:
+                node = node[segment]
+        return [remote_path + name for name in node]
+
+    mocked_fetch_subfolders: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._fetch_subfolders"
+    )
+    mocked_fetch_subfolders.side_effect = fetch_subfolders_mock
+    return mocked_fetch_subfolders
+
+
+def test_download_folders_skips_subtrees_not_matching_folder_filter(mocker):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        Path("evidence_path"),
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[FilesSelectors("Test1/Test11/*", [])],
+    )
+    mocker.patch("os.makedirs")
+    mocked_fetch_subfolders = _mock_folder_tree(
+        mocker, {"Test1": {"Test11": {"Deep": {}}, "Test12": {}}, "Test2": {"Test21": {}}}
+    )
+    mocked_fetch_files: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._fetch_files",
+        return_value=[],
+    )
+
+    fetcher.download_folder()
+
+    prefix = "/sites/123456/Documents/fossid-tools-report-ok/"
+    assert sorted(c.args[0] for c in mocked_fetch_subfolders.call_args_list) == [
+        prefix,
+        prefix + "Test1/",
+        prefix + "Test1/Test11/",
+    ]
+    mocked_fetch_files.assert_called_once_with(prefix + "Test1/Test11/")
+
+
+@pytest.mark.parametrize(
+    "short_path,folder_filter,expected",
+    [
+        ("Test1/", "Test1/Test11/*", True),
+        ("Test1/Test11/", "Test1/Test11/*", True),
+        ("Test2/", "Test1/Test11/*", False),
+        ("Test1/Test12/", "Test1/Test11/", False),
+        ("Test1/Test11/Deep/", "Test1/Test11/", False),
+        ("Test1/Test11/Deep/", "Test1/*", True),
+        ("Other/Deep/", "*/Test11/", True),
+        ("Test1/", "", False),
+    ],
+)
+def test_may_match_nested_folder(short_path, folder_filter, expected):
+    assert (
+        SharepointFetcherOnPremise._may_match_nested_folder(short_path, folder_filter)
+        == expected
+    )
+
+
+def test_download_folders_in_parallel(mocker):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        Path("evidence_path"),
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        max_workers=4,
+    )
+    mocker.patch("os.makedirs")
+    mocked_fetch_subfolders = _mock_folder_tree(
+        mocker, {"Test1": {"Test11": {}}, "Test2": {}, "Test3": {}}
+    )
+    mocked_fetch_files: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._fetch_files",
+        side_effect=lambda remote_path: [remote_path.strip("/").split("/")[-1] + ".txt"],
+    )
+    mocked_download_file: mock.Mock = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._download_file",
+        return_value=True,
+    )
+
+    fetcher.download_folder()
+
+    assert mocked_fetch_subfolders.call_count == 5
+    assert mocked_fetch_files.call_count == 5
+    prefix = "/sites/123456/Documents/fossid-tools-report-ok/"
+    assert sorted(c.args[1] + c.args[2] for c in mocked_download_file.call_args_list) == [
+        prefix + "Test1/Test1.txt",
+        prefix + "Test1/Test11/Test11.txt",
+        prefix + "Test2/Test2.txt",
+        prefix + "Test3/Test3.txt",
+        prefix + "fossid-tools-report-ok.txt",
+    ]
+
+
+def test_invalid_max_workers():
+    with pytest.raises(AutopilotConfigurationError, match="Invalid number of workers"):
+        SharepointFetcherOnPremise(
+            "Documents/",
+            Path("out_path"),
+            "https://some.sharepoint.url/sites/123456",
+            "username",
+            "password",
+            max_workers=0,
+        )
+
+
+def test_folders_without_selected_files_are_removed(mocker, tmp_path: Path):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        tmp_path,
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[FilesSelectors("Test1/*.docx", [])],
+    )
+    _mock_folder_tree(mocker, {"Test1": {}, "Test2": {}})
+    mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._fetch_files",
+        return_value=["File.pdf"],
+    )
+    (tmp_path / "Test1").mkdir()
+    (tmp_path / "Test1" / "existing.txt").write_text("keep me")
+
+    fetcher.download_folder()
+
+    assert (tmp_path / "Test1" / "existing.txt").exists()
+    assert not (tmp_path / "Test2").exists()
+
+
+@pytest.mark.parametrize(
+    "leaf_files,leaf_is_kept", [(["File.docx"], True), (["File.pdf"], False)]
+)
+def test_folders_are_removed_after_parallel_download(
+    mocker, tmp_path: Path, leaf_files, leaf_is_kept
+):
+    fetcher = SharepointFetcherOnPremise(
+        "Documents/fossid-tools-report-ok/",
+        tmp_path,
+        "https://some.server/sites/123456/",
+        "username",
+        "password",
+        filter_config=[FilesSelectors("Parent/Child/Leaf/*.docx", [])],
+        max_workers=4,
+    )
+    _mock_folder_tree(mocker, {"Parent": {"Child": {"Leaf": {}}}})
+    mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._fetch_files",
+        return_value=leaf_files,
+    )
+
+    def download_file_mock(output_path: Path, remote_path, file_name, files_selectors=None):
+        (output_path / file_name).write_text("content")
+        return True
+
+    mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.sharepoint_fetcher_on_premise.SharepointFetcherOnPremise._download_file",
+        side_effect=download_file_mock,
+    )
+    calls = []
+    makedirs, rmdir = os.makedirs, os.rmdir
+    mocker.patch(
+        "os.makedirs",
+        side_effect=lambda *args, **kwargs: calls.append("makedirs")
+        or makedirs(*args, **kwargs),
+    )
+    mocker.patch("os.rmdir", side_effect=lambda *args: calls.append("rmdir") or rmdir(*args))
+
+    fetcher.download_folder()
+
+    # a parent folder must not be removed while one of its subfolders is being created
+    assert "makedirs" not in calls[calls.index("rmdir") :]
+    leaf_file = tmp_path / "Parent" / "Child" / "Leaf" / "File.docx"
+    assert leaf_file.exists() == leaf_is_kept
+    assert (tmp_path / "Parent").exists() == leaf_is_kept
+
+
 def test_get_directory_length(default_fetcher: SharepointFetcherOnPremise):
     relative_url = "/sites/123456/Documents/test/subfolder/"
     assert default_fetcher.get_directory_length(relative_url=relative_url) == 5
@@ -1347,9 +1652,10 @@ def test_download_folders_with_folder_filter_expression_and_selectors_plus_last_
 
     mocked_get_file_property.side_effect = get_file_property_mock
 
-    # mock get_file_object
-    mocked_get_file_object = mocker.patch.object(default_fetcher._connect, "get_file_object")
-    mocked_get_file_object.return_value = ""
+    # mock download_file_object
+    mocked_download_file_object = mocker.patch.object(
+        default_fetcher._connect, "download_file_object"
+    )
 
     default_fetcher.download_folder()
 
@@ -1367,14 +1673,12 @@ def test_download_folders_with_folder_filter_expression_and_selectors_plus_last_
                 '{\n  "PropABC": "AB"\n}',
                 True,
             ),
-            mock.call(PosixPath("evidence_path"), "FileA.pdf", "", False),
             mock.call(
                 PosixPath("evidence_path"),
                 "File B.pdf.__properties__.json",
                 '{\n  "PropABC": "AB"\n}',
                 True,
             ),
-            mock.call(PosixPath("evidence_path"), "File B.pdf", "", False),
             mock.call(
                 PosixPath("evidence_path"),
                 "FileC.pdf.__properties__.json",
@@ -1390,6 +1694,11 @@ def test_download_folders_with_folder_filter_expression_and_selectors_plus_last_
         ]
     )
 
+    assert [c.args[1] for c in mocked_download_file_object.call_args_list] == [
+        "FileA.pdf",
+        "File B.pdf",
+    ]
+
     mocked_path_unlink.assert_has_calls(
         [
             mock.call(PosixPath("evidence_path/FileC.pdf.__properties__.json")),
@@ -1474,8 +1783,8 @@ def test_download_folders_with_file_filters_and_partial_matches_on_comment_messa
         return_value=(1234, {"d": {"vti_x005f_filesize": 1234}}),
     )
 
-    # mock get_file_object
-    mocker.patch.object(default_fetcher._connect, "get_file_object", return_value="")
+    # mock download_file_object
+    mocker.patch.object(default_fetcher._connect, "download_file_object")
 
     default_fetcher.download_folder()
     assert "Some file filters for `<root path>` didn't match any file!" in caplog.text
@@ -1604,3 +1913,40 @@ def test_generate_filters_and_selectors_with_duplicate_folders(requests_mock):
     )
     assert folder_filters == ["Folder1/"]
     assert files_selectors == {"Folder1/": filter_config}
+
+
+def test_download_file_incremental(mocker, tmp_path: Path):
+    def create_fetcher():
+        return SharepointFetcherOnPremise(
+            "Documents/",
+            tmp_path,
+            "https://some.server/sites/123456/",
+            "username",
+            "password",
+            incremental=True,
+        )
+
+    file_properties = {"__metadata": {"etag": '"1"'}, "GUID": "guid", "Modified": "2024-01-01"}
+    mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.get_file_properties",
+        return_value=file_properties,
+    )
+    mocked_download_file_object = mocker.patch(
+        "yaku.sharepoint_fetcher.on_premise.connect.Connect.download_file_object",
+        side_effect=lambda *args, **kwargs: args[2].write_text("abc"),
+    )
+
+    fetcher = create_fetcher()
+    fetcher._download_file(tmp_path, "/sites/123456/Documents", "a.txt")
+    fetcher.save_manifest()
+    assert mocked_download_file_object.call_count == 1
+
+    fetcher = create_fetcher()
+    fetcher._download_file(tmp_path, "/sites/123456/Documents", "a.txt")
+    fetcher.save_manifest()
+    assert mocked_download_file_object.call_count == 1
+
+    file_properties["__metadata"]["etag"] = '"2"'
+    fetcher = create_fetcher()
+    fetcher._download_file(tmp_path, "/sites/123456/Documents", "a.txt")
+    assert mocked_download_file_object.call_count == 2
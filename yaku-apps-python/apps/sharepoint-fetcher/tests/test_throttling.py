@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import io
+from email.utils import formatdate
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from yaku.autopilot_utils.metrics import MetricsCollector
+from yaku.sharepoint_fetcher.throttling import (
+    BACKOFF_MAX,
+    RETRY_AFTER_MAX,
+    AIMDLimiter,
+    RequestStats,
+    ThrottlingAdapter,
+    endpoint_name,
+    get_retry_delay,
+)
+
+
+def _response(status_code: int, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+def test_retry_delay_from_retry_after_seconds():
+    assert get_retry_delay({"Retry-After": "7"}, 3) == 7
+    assert get_retry_delay({"Retry-After": "120"}, 0) == 120
+    assert get_retry_delay({"Retry-After": "100000"}, 0) == RETRY_AFTER_MAX
+
+
+def test_retry_delay_from_retry_after_date(mocker):
+    mocker.patch("yaku.sharepoint_fetcher.throttling.time.time", return_value=1_700_000_000)
+    headers = {"Retry-After": formatdate(1_700_000_012, usegmt=True)}
+    assert get_retry_delay(headers, 0) == 12
+    headers = {"Retry-After": formatdate(1_700_000_300, usegmt=True)}
+    assert get_retry_delay(headers, 0) == 300
+
+
+def test_retry_delay_with_jittered_backoff(mocker):
+    uniform = mocker.patch("yaku.sharepoint_fetcher.throttling.random.uniform", return_value=3)
+    assert get_retry_delay({}, 2) == 3
+    uniform.assert_called_once_with(0, 4.0)
+    get_retry_delay({"Retry-After": "invalid"}, 10)
+    uniform.assert_called_with(0, BACKOFF_MAX)
+
+
+def test_aimd_limiter():
+    limiter = AIMDLimiter(8)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 2
+    limiter.acquire()
+    limiter.release()
+    assert limiter.limit == 2.5
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 8
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (
+            "https://graph.microsoft.com/v1.0/sites/host.com,0123456789abcdef0123,x/drive/items/01ABCDEFGHIJKLMNOPQRSTUVWX/children?$top=10",
+            "GET graph.microsoft.com/v1.0/sites/{id}/drive/items/{id}/children",
+        ),
+        (
+            "https://graph.microsoft.com/v1.0/sites/site/drive/root:/Some/Folder:/children",
+            "GET graph.microsoft.com/v1.0/sites/site/drive/root:{path}:/children",
+        ),
+        (
+            "https://server/sites/1/_api/web/GetFolderByServerRelativeUrl('/sites/1/Documents')/files",
+            "GET server/sites/1/_api/web/GetFolderByServerRelativeUrl(...)/files",
+        ),
+    ],
+)
+def test_endpoint_name(url, expected):
+    assert endpoint_name("GET", url) == expected
+
+
+def test_adapter_retries_throttled_requests(mocker):
+    send = mocker.patch.object(
+        HTTPAdapter,
+        "send",
+        side_effect=[
+            _response(429, {"Retry-After": "2"}),
+            _response(503),
+            _response(200),
+        ],
+    )
+    sleep = mocker.patch("yaku.sharepoint_fetcher.throttling.time.sleep")
+    mocker.patch("yaku.sharepoint_fetcher.throttling.random.uniform", return_value=0.5)
+    stats = RequestStats()
+    adapter = ThrottlingAdapter(max_concurrency=4, stats=stats)
+    request = requests.Request("GET", "https://server/api/items").prepare()
+
+    response = adapter.send(request)
+
+    assert response.status_code == 200
+    assert send.call_count == 3
+    assert [c.args[0] for c in sleep.call_args_list] == [2, 0.5]
+    assert stats.endpoints["GET server/api/items"].requests == 3
+    assert stats.total_throttled == 2
+    assert adapter.limiter.limit < 4
+
+
+def test_adapter_gives_up_after_max_retries(mocker):
+    mocker.patch.object(HTTPAdapter, "send", return_value=_response(429))
+    mocker.patch("yaku.sharepoint_fetcher.throttling.time.sleep")
+    adapter = ThrottlingAdapter(max_retries_on_throttling=2)
+    request = requests.Request("GET", "https://server/api/items").prepare()
+
+    assert adapter.send(request).status_code == 429
+    assert adapter.stats.total_requests == 3
+
+
+def test_request_stats_log_summary(caplog):
+    stats = RequestStats()
+    stats.record("GET server/a", 0.5, 200)
+    stats.record("GET server/a", 1.5, 429)
+    stats.record("GET server/b", 0.1, 404)
+
+    stats.log_summary()
+
+    assert stats.endpoints["GET server/a"].average_latency == 1.0
+    assert stats.endpoints["GET server/b"].errors == 1
+    assert "Sent 3 requests, 1 of them were throttled" in caplog.text
+
+
+def test_adapter_records_metrics_of_throttled_requests(mocker):
+    metrics = mocker.patch("yaku.sharepoint_fetcher.throttling.METRICS", MetricsCollector())
+    metrics.enable()
+    mocker.patch.object(
+        HTTPAdapter, "send", side_effect=[_response(429, {"Retry-After": "0"}), _response(200)]
+    )
+    mocker.patch("yaku.sharepoint_fetcher.throttling.time.sleep")
+    adapter = ThrottlingAdapter()
+    request = requests.Request("GET", "https://server/api/items").prepare()
+
+    adapter.send(request)
+
+    assert metrics.counters == {"sharepoint.throttling_retries": 1}
+    assert metrics.spans["sharepoint.request"].count == 2
+    assert metrics.spans["sharepoint.throttling_wait"].count == 1
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import stat
+from pathlib import Path
+from unittest import mock
+
+import requests
+from yaku.sharepoint_fetcher.cloud.token_provider import (
+    REFRESH_MARGIN,
+    BearerTokenAuth,
+    TokenProvider,
+    default_token_cache_file,
+)
+
+
+def test_token_is_refreshed_before_it_expires(mocker):
+    mocked_time = mocker.patch(
+        "yaku.sharepoint_fetcher.cloud.token_provider.time.time", return_value=1000.0
+    )
+    request_token = mock.Mock(side_effect=[("token1", 3600), ("token2", 3600)])
+    provider = TokenProvider(request_token)
+
+    assert provider.get_token() == "token1"
+    mocked_time.return_value = 1000.0 + 3600 - REFRESH_MARGIN - 1
+    assert provider.get_token() == "token1"
+    mocked_time.return_value = 1000.0 + 3600 - REFRESH_MARGIN
+    assert provider.get_token() == "token2"
+    assert request_token.call_count == 2
+
+
+def test_force_refresh():
+    request_token = mock.Mock(side_effect=[("token1", 3600), ("token2", 3600)])
+    provider = TokenProvider(request_token)
+
+    assert provider.get_token() == "token1"
+    assert provider.get_token(force_refresh=True) == "token2"
+
+
+def test_token_is_shared_via_cache_file(tmp_path: Path):
+    cache_file = tmp_path / "tokens" / "token.json"
+    first_provider = TokenProvider(mock.Mock(return_value=("token1", 3600)), cache_file)
+    assert first_provider.get_token() == "token1"
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+    request_token = mock.Mock(return_value=("token2", 3600))
+    second_provider = TokenProvider(request_token, cache_file)
+    assert second_provider.get_token() == "token1"
+    request_token.assert_not_called()
+
+
+def test_expired_or_invalid_cache_file_is_ignored(tmp_path: Path):
+    cache_file = tmp_path / "tokens" / "token.json"
+    TokenProvider(mock.Mock(return_value=("token1", REFRESH_MARGIN)), cache_file).get_token()
+    assert TokenProvider(mock.Mock(return_value=("token2", 3600)), cache_file).get_token() == (
+        "token2"
+    )
+
+    cache_file.write_text("{invalid")
+    assert TokenProvider(mock.Mock(return_value=("token3", 3600)), cache_file).get_token() == (
+        "token3"
+    )
+
+
+def test_cache_file_in_shared_folder_is_not_used(tmp_path: Path):
+    shared_folder = tmp_path / "shared"
+    shared_folder.mkdir()
+    shared_folder.chmod(0o755)
+    cache_file = shared_folder / "token.json"
+
+    assert TokenProvider(mock.Mock(return_value=("token1", 3600)), cache_file).get_token() == (
+        "token1"
+    )
+    assert list(shared_folder.iterdir()) == []
+
+    cache_file.write_text('{"access_token": "planted", "expires_at": 9999999999}')
+    assert TokenProvider(mock.Mock(return_value=("token2", 3600)), cache_file).get_token() == (
+        "token2"
+    )
+
+
+def test_cache_file_in_symlinked_folder_is_not_used(tmp_path: Path):
+    target = tmp_path / "target"
+    target.mkdir(mode=0o700)
+    (tmp_path / "link").symlink_to(target)
+    cache_file = tmp_path / "link" / "token.json"
+
+    TokenProvider(mock.Mock(return_value=("token1", 3600)), cache_file).get_token()
+
+    assert list(target.iterdir()) == []
+
+
+def test_default_token_cache_file_does_not_contain_ids():
+    cache_file = default_token_cache_file("tenant-id", "client-id", "resource")
+    assert "tenant-id" not in str(cache_file)
+    assert "client-id" not in str(cache_file)
+    assert cache_file != default_token_cache_file("tenant-id", "other-client-id", "resource")
+    assert cache_file.parent.name == f"yaku-sharepoint-fetcher-{os.getuid()}"
+
+
+def test_bearer_token_auth_retries_once_on_401(requests_mock):
+    tokens = iter(["token1", "token2", "token3"])
+    get_headers = mock.Mock(
+        side_effect=lambda force_refresh=False: {"Authorization": f"Bearer {next(tokens)}"}
+    )
+    requests_mock.get(
+        "https://graph.example.com/item",
+        [{"status_code": 401}, {"status_code": 200, "json": {"ok": True}}],
+    )
+    session = requests.Session()
+    session.auth = BearerTokenAuth(get_headers)
+
+    response = session.get("https://graph.example.com/item")
+
+    assert response.json() == {"ok": True}
+    assert [r.headers["Authorization"] for r in requests_mock.request_history] == [
+        "Bearer token1",
+        "Bearer token2",
+    ]
+    get_headers.assert_called_with(force_refresh=True)
+
+
+def test_bearer_token_auth_does_not_retry_twice(requests_mock):
+    requests_mock.get("https://graph.example.com/item", status_code=401)
+    session = requests.Session()
+    session.auth = BearerTokenAuth(
+        lambda force_refresh=False: {"Authorization": "Bearer token"}
+    )
+
+    response = session.get("https://graph.example.com/item")
+
+    assert response.status_code == 401
+    assert requests_mock.call_count == 2
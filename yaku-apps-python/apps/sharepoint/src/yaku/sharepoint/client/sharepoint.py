@@ -9,9 +9,9 @@ from typing import Optional, Tuple
 from urllib.parse import urlparse
 
 from pydantic import BaseSettings, Field, validator
-from requests import Response, Session
+from requests import Response
 from requests.exceptions import HTTPError, InvalidURL, JSONDecodeError
-from requests_ntlm import HttpNtlmAuth
+from yaku.autopilot_utils.ntlm import DEFAULT_POOL_SIZE, ConnectionStats, create_ntlm_session
 
 
 class Settings(BaseSettings):
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     username: str = Field(..., env="SHAREPOINT_USERNAME")
     password: str = Field(..., env="SHAREPOINT_PASSWORD")
     force_ip: Optional[str] = Field(None, env="SHAREPOINT_FORCE_IP")
+    pool_size: int = Field(DEFAULT_POOL_SIZE, env="SHAREPOINT_POOL_SIZE")
 
     @validator("sharepoint_project_site", always=True)
     def validate_sharepoint_project_site(cls, v):
@@ -34,12 +35,22 @@ class Settings(BaseSettings):
         ip_address(v)
         return v
 
+    @validator("pool_size")
+    def validate_pool_size(cls, v):
+        if v < 1:
+            raise ValueError("Pool size must be at least 1")
+        return v
+
 
 class SharepointClient:
     """
     Establish link with a sharepoint site to upload folders and files.
 
     This class provides functionality to upload files and folders on a SharePoint site.
+
+    NTLM authenticated connections are kept alive and reused. The number of
+    opened and reused connections and NTLM handshakes are counted in
+    `connection_stats`.
     """
 
     def __init__(self, config: Settings):
@@ -48,12 +59,15 @@ class SharepointClient:
         if config.sharepoint_project_site.endswith("/"):
             config.sharepoint_project_site = config.sharepoint_project_site[:-1]
         self._sharepoint_site = config.sharepoint_project_site
-        session = Session()
-        session.headers = {"Accept": "application/json;odata=verbose"}
         self._force_ip = config.force_ip
-        session.auth = HttpNtlmAuth(config.username, config.password)
-        session.verify = False
-        self._session = session
+        self.connection_stats = ConnectionStats()
+        self._session = create_ntlm_session(
+            config.username,
+            config.password,
+            pool_size=config.pool_size,
+            connection_stats=self.connection_stats,
+            headers={"Accept": "application/json;odata=verbose"},
+        )
 
     def _exchange_hostname_by_forced_ip_address(self, url: str) -> Tuple[str, str]:
         """
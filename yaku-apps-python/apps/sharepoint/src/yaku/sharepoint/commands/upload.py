@@ -37,6 +37,7 @@ def upload_files(
         )
 
     logger.info("Upload complete")
+    logger.debug("Connections: %s", connection.connection_stats.summary())
 
 
 @validate_arguments()
@@ -52,3 +53,4 @@ def upload_directory(
     logger.info("Uploading folder %s", folder_path)
     connection.upload_directory(folder_path, sharepoint_path, force)
     logger.info("Upload complete")
+    logger.debug("Connections: %s", connection.connection_stats.summary())
@@ -52,6 +52,23 @@ class TestSharepointInit:
         """Test init with wrong sharepoint path."""
         assert SharepointClient(valid_connect_config) is not None
 
+    def test_invalid_pool_size(self):
+        """Test init with a pool size of zero."""
+        with pytest.raises(ValidationError):
+            Settings(
+                sharepoint_project_site="https://my.sharepoint.com",
+                username="username",
+                password="password",
+                pool_size=0,
+            )
+
+    def test_pool_size(self):
+        """Test that the connection pool size is configured."""
+        client = SharepointClient(valid_connect_config.copy(update={"pool_size": 4}))
+        adapter = client._session.get_adapter("https://my.sharepoint.com")
+        assert adapter._pool_maxsize == 4
+        assert client._session.auth.connection_stats is client.connection_stats
+
 
 class TestFormDigestValue:
     def test_all_working(self, mocker):
@@ -10,6 +10,7 @@ from loguru import logger
 from pydantic import BaseSettings, Field, validator
 from splunklib import binding, client, results
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
+from yaku.autopilot_utils.metrics import METRICS
 
 from .result import SplunkResult
 
@@ -100,7 +101,10 @@ class SplunkBase(object):
         if not issubclass(type(settings), SplunkSearchSettings):
             raise ValueError("Invalid search settings passed")
         self._check_search(settings.query)
-        self._ensure_parallel_search_limitation(settings.parallel_job_limit, retry_interval)
+        with METRICS.span("splunk.wait_for_job_slot"):
+            self._ensure_parallel_search_limitation(
+                settings.parallel_job_limit, retry_interval
+            )
         if isinstance(settings, SplunkOneShotSearchSettings):
             return self._one_shot_search(settings)
         if isinstance(settings, SplunkSearchSettings):
@@ -139,6 +143,24 @@ class SplunkBase(object):
             earliest_time=settings.start_time,
             latest_time=settings.end_time,
         )
+        with METRICS.span("splunk.wait_for_job"):
+            self._wait_for_job(settings)
+        with METRICS.span("splunk.download_results"):
+            # Each ResponseReader needs to have an own instance, as it will be emptied after a read() call
+            reader = results.JSONResultsReader(self.job.results(output_mode="json", count=0))
+            csv = self.job.results(output_mode="csv", count=0).read()
+            json = self.job.results(output_mode="json", count=0).read()
+        if METRICS.enabled:
+            METRICS.increment("splunk.downloaded_bytes", len(csv) + len(json))
+        self.job.cancel()
+        try:
+            # Overrides have to be added,
+            # as the results in the reader do not contain empty columns, which are expected so far
+            return SplunkResult(reader, override_csv=csv, override_json=json)
+        except ValueError:
+            raise AutopilotError("Failed to parse splunk result")
+
+    def _wait_for_job(self, settings: SplunkSearchSettings):
         poll_count = 0
         while True:
             while not self.job.is_ready():
@@ -155,34 +177,24 @@ class SplunkBase(object):
                 f"\r{progress:03.1f}% | {scanned} scanned | {matched} matched | {res} results"
             )
             if stats["isDone"] == "1":
-                break
+                return
             sleep(settings.poll_interval)
             if poll_count * settings.poll_interval > settings.timeout:
                 raise TimeoutError("Splunk search job exceeded timeout")
             poll_count += 1
-        # Each ResponseReader needs to have an own instance, as it will be emptied after a read() call
-        reader = results.JSONResultsReader(self.job.results(output_mode="json", count=0))
-        csv = self.job.results(output_mode="csv", count=0)
-        json = self.job.results(output_mode="json", count=0)
-        self.job.cancel()
-        try:
-            # Overrides have to be added,
-            # as the results in the reader do not contain empty columns, which are expected so far
-            return SplunkResult(reader, override_csv=csv.read(), override_json=json.read())
-        except ValueError:
-            raise AutopilotError("Failed to parse splunk result")
 
     def _one_shot_search(self, settings: SplunkOneShotSearchSettings) -> SplunkResult:
         logger.info("Executing Splunk oneshot search ...")
-        reader = results.JSONResultsReader(
-            self.service.jobs.oneshot(
-                settings.query,
-                output_mode="json",
-                earliest_time=settings.start_time,
-                latest_time=settings.end_time,
-                count=0,
+        with METRICS.span("splunk.oneshot_search"):
+            reader = results.JSONResultsReader(
+                self.service.jobs.oneshot(
+                    settings.query,
+                    output_mode="json",
+                    earliest_time=settings.start_time,
+                    latest_time=settings.end_time,
+                    count=0,
+                )
             )
-        )
         if reader.is_preview:
             raise AutopilotError("Oneshot search returned a invalid result")
         try:
@@ -0,0 +1,287 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Measure the startup time of the app pex binaries.
+
+Every app is run with `--version` and, where possible, with a representative
+command which works offline on local fixtures. Each scenario is run several
+times and its wall time, peak memory usage (RSS) and import time are recorded.
+The import time is measured in separate runs with `PYTHONPROFILEIMPORTTIME`,
+because profiling the imports slows down the interpreter.
+
+The pex files have to be built first, e.g. with `make package FOLDER=apps`.
+Then run e.g.::
+
+    python3 cicd/benchmark-startup.py --output startup.json
+    python3 cicd/benchmark-startup.py --compare startup.json --max-regression 20
+
+The report is written as JSON, so that it can be stored for one commit and
+compared with the results of another commit later on. With `--compare`, the
+script exits with `1` if the median wall time of a scenario got slower by more
+than `--max-regression` percent.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_DIST_PATH = ROOT / "dist"
+
+PAPSR_SAMPLE_CODE = """
+from yaku.autopilot_utils.results import DEFAULT_EVALUATOR, RESULTS, Result
+
+class CLI:
+    click_name = "benchmark"
+    click_help_text = "Benchmark sample"
+    version = "0.1"
+
+    def click_command():
+        RESULTS.append(Result(criterion="It runs", fulfilled=True, justification="It runs"))
+
+    click_evaluator_callback = DEFAULT_EVALUATOR
+"""
+
+SHAREPOINT_EVALUATOR_CONFIG = """
+- file: ProcessStatus.docx
+  rules:
+    - property: Title
+      equals: ProcessStatus.docx
+    - property: RevisionStatusId
+      is-larger-than: 1
+"""
+
+# scenarios per app: name => command line arguments, which may refer to the
+# fixtures created by `create_fixtures` (e.g. `{sample_file}`)
+SCENARIOS: Dict[str, Dict[str, List[str]]] = {
+    "artifactory-fetcher": {"version": ["--version"]},
+    "excel-tools": {
+        "version": ["--version"],
+        "get-row": ["get-row", "{xlsx_file}", "Tabelle1", "A", "Anton", "B"],
+    },
+    "filecheck": {
+        "version": ["--version"],
+        "exists": ["exists", "{sample_file}"],
+        "size": ["size", "--min", "1", "{sample_file}"],
+    },
+    "papsr": {
+        "version": ["--version"],
+        "sample-cli": ["{papsr_sample}"],
+    },
+    "pdf-signature-evaluator": {"version": ["--version"]},
+    "pex-tool": {"version": ["--version"]},
+    "security-scanner": {"version": ["--version"]},
+    "sharepoint": {"version": ["--version"]},
+    "sharepoint-evaluator": {
+        "version": ["--version"],
+        "evaluate": [
+            "--config-file",
+            "{sharepoint_evaluator_config}",
+            "--evidence-path",
+            "{sharepoint_evidence}",
+        ],
+    },
+    "sharepoint-fetcher": {"version": ["--version"]},
+    "splunk-fetcher": {"version": ["--version"]},
+}
+
+
+def create_fixtures(path: Path) -> Dict[str, str]:
+    sample_file = path / "sample.txt"
+    sample_file.write_text("Some content\n")
+    papsr_sample = path / "benchmark_cli.py"
+    papsr_sample.write_text(PAPSR_SAMPLE_CODE)
+    sharepoint_evaluator_config = path / "sharepoint-evaluator.yaml"
+    sharepoint_evaluator_config.write_text(SHAREPOINT_EVALUATOR_CONFIG)
+    xlsx_file = path / "table.xlsx"
+    shutil.copy(
+        ROOT / "apps/excel-tools/tests/evaluate/data/table_with_hyperlinks.xlsx", xlsx_file
+    )
+    return {
+        "sample_file": str(sample_file),
+        "papsr_sample": str(papsr_sample),
+        "sharepoint_evaluator_config": str(sharepoint_evaluator_config),
+        "sharepoint_evidence": str(ROOT / "apps/sharepoint-evaluator/tests/data"),
+        "xlsx_file": str(xlsx_file),
+    }
+
+
+def parse_import_time(stderr: str) -> float:
+    """
+    Return the total import time in milliseconds from `-X importtime` output.
+
+    Only top level imports are summed up, as their cumulative time already
+    contains the time of nested imports. If the pex re-executes itself, the
+    imports of both interpreters are included.
+    """
+    total = 0
+    for line in stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit() and not fields[2][1:2].isspace():
+            total += int(fields[1])
+    return total / 1000
+
+
+def run_once(command: List[str], env: Dict[str, str]) -> Dict[str, float]:
+    """Run `command` and return its wall time, peak RSS and (if profiled) import time."""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(  # nosec B603
+            command,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        # `wait4` (instead of `process.wait`) provides the resource usage of this child only
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        stderr.seek(0)
+        stderr_text = stderr.read().decode(errors="replace")
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"`{' '.join(command)}` failed with exit code {process.returncode}:\n{stderr_text}"
+        )
+    return {
+        "wall_ms": wall_time * 1000,
+        # `ru_maxrss` is given in kilobytes on Linux
+        "peak_rss_mb": rusage.ru_maxrss / 1024,
+        "import_ms": parse_import_time(stderr_text),
+    }
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "min": round(min(values), 2),
+        "median": round(statistics.median(values), 2),
+        "mean": round(statistics.fmean(values), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def benchmark_scenario(command: List[str], repeat: int, warmup: int) -> Dict[str, dict]:
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    # the first runs of a pex unpack it into the pex root, which is not measured
+    for _ in range(warmup):
+        run_once(command, env)
+    runs = [run_once(command, env) for _ in range(repeat)]
+    profiled_runs = [
+        run_once(command, {**env, "PYTHONPROFILEIMPORTTIME": "1"}) for _ in range(repeat)
+    ]
+    return {
+        "wall_ms": summarize([run["wall_ms"] for run in runs]),
+        "peak_rss_mb": summarize([run["peak_rss_mb"] for run in runs]),
+        "import_ms": summarize([run["import_ms"] for run in profiled_runs]),
+    }
+
+
+def run_benchmarks(
+    dist_path: Path, apps: List[str], repeat: int, warmup: int
+) -> Dict[str, Dict[str, dict]]:
+    results: Dict[str, Dict[str, dict]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = create_fixtures(Path(tmp))
+        for app in apps:
+            pex_file = dist_path / f"apps.{app}" / f"{app}.pex"
+            if not pex_file.exists():
+                print(f"{app}: {pex_file} not found, skipped", file=sys.stderr)
+                continue
+            for name, arguments in SCENARIOS[app].items():
+                command = [str(pex_file)] + [arg.format(**fixtures) for arg in arguments]
+                try:
+                    result = benchmark_scenario(command, repeat, warmup)
+                except RuntimeError as e:
+                    print(f"{app} {name}: {e}", file=sys.stderr)
+                    continue
+                results.setdefault(app, {})[name] = result
+                print(
+                    f"{app:25} {name:12} {result['wall_ms']['median']:8.1f}ms wall"
+                    f" {result['import_ms']['median']:8.1f}ms imports"
+                    f" {result['peak_rss_mb']['max']:7.1f}MB peak RSS",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(  # nosec B603 B607
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, encoding="utf-8", stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, max_regression: Optional[float]) -> bool:
+    """Print the changes compared to `baseline` and return `False` on regressions."""
+    within_limits = True
+    for app, scenarios in report["results"].items():
+        for name, result in scenarios.items():
+            old = baseline["results"].get(app, {}).get(name)
+            if old is None:
+                continue
+            changes = []
+            for metric, key in [("wall_ms", "median"), ("import_ms", "median")]:
+                before, after = old[metric][key], result[metric][key]
+                change = (after - before) / before * 100 if before else 0.0
+                changes.append(f"{metric} {before:.1f} -> {after:.1f} ({change:+.1f}%)")
+                if metric == "wall_ms" and max_regression is not None:
+                    within_limits = within_limits and change <= max_regression
+            print(f"{app:25} {name:12} " + ", ".join(changes), file=sys.stderr)
+    return within_limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("apps", nargs="*", help="only benchmark these apps")
+    parser.add_argument("--dist-path", type=Path, default=DEFAULT_DIST_PATH)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file")
+    parser.add_argument("--compare", type=Path, help="JSON report to compare with")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        help="allowed increase of the median wall time in percent (with --compare)",
+    )
+    args = parser.parse_args()
+
+    unknown_apps = set(args.apps) - set(SCENARIOS)
+    if unknown_apps:
+        parser.error(f"Unknown apps: {', '.join(sorted(unknown_apps))}")
+
+    report = {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": run_benchmarks(
+            args.dist_path, args.apps or list(SCENARIOS), args.repeat, args.warmup
+        ),
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare and not compare(
+        report, json.loads(args.compare.read_text()), args.max_regression
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
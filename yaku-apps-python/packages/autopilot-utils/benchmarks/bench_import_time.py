@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Measure how long it takes to import the CLI modules of the autopilot apps.
+
+Every module is imported in a fresh interpreter with `python -X importtime`
+and the cumulative import time of the module is taken from its output. The
+fastest of `--repeat` runs is compared with the budget (in milliseconds)
+from `import_time_budgets.json`. Run it with::
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--budgets FILE] [--allow-missing] [module ...]
+
+The modules (and their dependencies) must be importable, e.g. by adding the
+`src` folders of the apps to the `PYTHONPATH`. The script exits with `1` if
+any module exceeds its budget or cannot be imported, so that it can be used
+to catch regressions in the startup time. With `--allow-missing`, modules
+which cannot be imported are only reported and skipped.
+"""
+
+import argparse
+import json
+import os
+import subprocess  # nosec B404
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_BUDGETS_FILE = Path(__file__).parent / "import_time_budgets.json"
+
+
+def measure_import_time(module: str) -> Optional[float]:
+    """Return the cumulative import time of `module` in milliseconds, or `None` on errors."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if process.returncode != 0:
+        return None
+    # lines look like: "import time:  self [us] | cumulative | imported package",
+    # the top level import of the module is the last line
+    cumulative = None
+    for line in process.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2] == f" {module}":
+            cumulative = int(fields[1]) / 1000
+    return cumulative
+
+
+def check_budgets(budgets: Dict[str, float], repeat: int, allow_missing: bool = False) -> bool:
+    within_budget = True
+    for module, budget in budgets.items():
+        timings = [measure_import_time(module) for _ in range(repeat)]
+        if None in timings:
+            if allow_missing:
+                print(f"{module:50} could not be imported, skipped")
+            else:
+                print(f"{module:50} could not be imported, FAILED")
+                within_budget = False
+            continue
+        best = min(timings)  # type: ignore
+        status = "ok" if best <= budget else "OVER BUDGET"
+        print(f"{module:50} {best:8.1f}ms (budget {budget:6.0f}ms) {status}")
+        within_budget = within_budget and best <= budget
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", help="only check these modules")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS_FILE)
+    parser.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="skip modules which cannot be imported instead of failing",
+    )
+    args = parser.parse_args()
+
+    budgets = json.loads(args.budgets.read_text())
+    if args.modules:
+        budgets = {module: budgets.get(module, float("inf")) for module in args.modules}
+    if not check_budgets(budgets, args.repeat, args.allow_missing):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
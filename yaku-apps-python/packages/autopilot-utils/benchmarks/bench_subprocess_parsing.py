@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Compare the single-pass parser for autopilot output with the separate parsers.
+
+Run it with::
+
+    python benchmarks/bench_subprocess_parsing.py [--lines 100000] [--repeat 5]
+
+The generated stdout consists mostly of log lines with some results and
+outputs in between, similar to the output of chained papsr apps.
+"""
+
+import argparse
+import json
+import os
+import timeit
+
+from yaku.autopilot_utils.results import Result
+from yaku.autopilot_utils.subprocess import (
+    clean_json_lines,
+    parse_autopilot_output,
+    parse_json_lines,
+    parse_json_lines_into_list,
+    parse_json_lines_into_map,
+)
+
+
+def make_stdout(number_of_lines: int) -> str:
+    lines = []
+    for i in range(number_of_lines):
+        if i % 10 == 0:
+            result = {"criterion": f"criterion {i}", "fulfilled": True, "justification": "ok"}
+            lines.append(json.dumps({"result": result}))
+        elif i % 25 == 0:
+            lines.append(json.dumps({"output": {f"key{i}": f"value {i}"}}))
+        else:
+            lines.append(f"INFO  | Processing item {i} of {number_of_lines}")
+    lines.append(json.dumps({"status": "GREEN", "reason": "All good"}))
+    return os.linesep.join(lines)
+
+
+def parse_separately(stdout: str):
+    return (
+        parse_json_lines(stdout, "status"),
+        parse_json_lines(stdout, "reason"),
+        parse_json_lines_into_list(stdout, "result", cls=Result),
+        parse_json_lines_into_map(stdout, "output"),
+        clean_json_lines(stdout),
+    )
+
+
+def parse_single_pass(stdout: str):
+    parsed = parse_autopilot_output(stdout)
+    return (
+        parsed.status,
+        parsed.reason,
+        parsed.results,
+        parsed.outputs,
+        parsed.clean_stdout,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stdout = make_stdout(args.lines)
+    assert parse_separately(stdout) == parse_single_pass(stdout)
+
+    print(f"{args.lines} lines, {len(stdout) / 1e6:.1f} MB, best of {args.repeat} runs:")
+    timings = {}
+    for name, func in [("separate", parse_separately), ("single-pass", parse_single_pass)]:
+        timings[name] = min(timeit.repeat(lambda: func(stdout), number=1, repeat=args.repeat))
+        print(f"  {name:12} {timings[name]:.3f}s")
+    print(f"  speedup      {timings['separate'] / timings['single-pass']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@
 
 import re
 from datetime import datetime
-from functools import wraps
-from typing import Any, Protocol
+from functools import lru_cache, wraps
+from typing import Any, Callable, Iterable, Protocol
 
 import dateutil.parser
 import pytz
@@ -137,12 +137,48 @@ SECONDS_PER_UNIT = {
     "y": 31536000,
 }
 
+_INTERVAL_PATTERN = re.compile(
+    r"(?P<value>-?\d+(\.\d+)?)(?P<unit>(" + "|".join(SECONDS_PER_UNIT.keys()) + ")?)"
+)
+
+
+# maximum number of cached results of `convert_to_date` and `convert_to_seconds`
+CONVERSION_CACHE_SIZE = 4096
+
+# timestamps which are parsed in the same way by `datetime.fromisoformat` and `dateutil`
+_ISO_TIMESTAMP_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?(Z|[+-]\d{2}:\d{2})?)?"
+)
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    if _ISO_TIMESTAMP_PATTERN.fullmatch(timestamp):
+        try:
+            if timestamp.endswith("Z"):
+                return datetime.fromisoformat(timestamp[:-1] + "+00:00")
+            return datetime.fromisoformat(timestamp)
+        except ValueError:
+            pass
+    return dateutil.parser.parse(timestamp)
+
 
 def convert_to_date(timestamp):
+    """
+    Convert a date or timestamp string into seconds since the epoch.
+
+    Returns `None` if the `timestamp` is a time interval (see `convert_to_seconds`)
+    or cannot be parsed. Results for strings are cached, see `conversion_cache_info`.
+    """
+    if isinstance(timestamp, str):
+        return _convert_to_date_cached(timestamp)
+    return _convert_to_date(timestamp)
+
+
+def _convert_to_date(timestamp):
     try:
         if "-" in timestamp or ":" in timestamp:
             try:
-                date = dateutil.parser.parse(timestamp)
+                date = _parse_timestamp(timestamp)
             except dateutil.parser.ParserError:
                 date = None
             if date is not None:
@@ -160,14 +196,25 @@ def convert_to_date(timestamp):
         return None
 
 
+_convert_to_date_cached = lru_cache(maxsize=CONVERSION_CACHE_SIZE)(_convert_to_date)
+
+
 def convert_to_seconds(timestamp: str) -> float:
+    """
+    Convert a time interval like `30d` or `1 year 2 months` into seconds.
+
+    Results for strings are cached, see `conversion_cache_info`.
+    """
+    if isinstance(timestamp, str):
+        return _convert_to_seconds_cached(timestamp)
+    return _convert_to_seconds(timestamp)
+
+
+def _convert_to_seconds(timestamp: str) -> float:
     timestamp = timestamp.replace(" ", "")
     seconds: float = 0
-    units_pattern = "|".join(SECONDS_PER_UNIT.keys())
     found_at_least_one_pattern = False
-    for item in re.finditer(
-        r"(?P<value>-?\d+(\.\d+)?)(?P<unit>(" + units_pattern + ")?)", timestamp
-    ):
+    for item in _INTERVAL_PATTERN.finditer(timestamp):
         seconds += SECONDS_PER_UNIT.get(item.group("unit"), 1) * float(item.group("value"))
         found_at_least_one_pattern = True
 
@@ -175,6 +222,28 @@ def convert_to_seconds(timestamp: str) -> float:
     return seconds
 
 
+_convert_to_seconds_cached = lru_cache(maxsize=CONVERSION_CACHE_SIZE)(_convert_to_seconds)
+
+
+def conversion_cache_info() -> dict[str, Any]:
+    """
+    Return the statistics of the caches of `convert_to_date` and `convert_to_seconds`.
+
+    The values are named tuples with `hits`, `misses`, `maxsize` and `currsize`,
+    as returned by `functools.lru_cache`.
+    """
+    return {
+        "convert_to_date": _convert_to_date_cached.cache_info(),
+        "convert_to_seconds": _convert_to_seconds_cached.cache_info(),
+    }
+
+
+def clear_conversion_caches():
+    """Clear the caches of `convert_to_date` and `convert_to_seconds`."""
+    _convert_to_date_cached.cache_clear()
+    _convert_to_seconds_cached.cache_clear()
+
+
 @make_nice
 def older(checked_value: str, other_value: OtherValue) -> bool:
     some_date = convert_to_date(checked_value)
@@ -287,3 +356,125 @@ def check(
     check_result = checks_dict.get(operator, invalid_operator)(checked_value, other_value)
 
     return check_result
+
+
+CompiledCheck = Callable[[Any], bool]
+
+
+def _compile_equals(other_string: str, other_number: float | None) -> CompiledCheck:
+    if other_number is None:
+
+        def equals_string(checked_value: Any) -> bool:
+            try:
+                float(checked_value)
+            except ValueError:
+                pass
+            return str(checked_value) == other_string
+
+        return equals_string
+
+    def equals_number(checked_value: Any) -> bool:
+        try:
+            return float(checked_value) == other_number
+        except ValueError:
+            return str(checked_value) == other_string
+
+    return equals_number
+
+
+def _to_number(checked_value: Any) -> float:
+    try:
+        return float(checked_value)
+    except ValueError as e:
+        raise AutopilotError(f"Could not convert `{checked_value}` to a number!") from e
+
+
+def _compile_comparison(check_fn: CheckFunctionType, other_number: float) -> CompiledCheck:
+    if check_fn is larger:
+        return lambda checked_value: _to_number(checked_value) > other_number
+    if check_fn is larger_equal:
+        return lambda checked_value: _to_number(checked_value) >= other_number
+    if check_fn is less:
+        return lambda checked_value: _to_number(checked_value) < other_number
+    return lambda checked_value: _to_number(checked_value) <= other_number
+
+
+def _compile_older(
+    other_date: float | None, other_interval: float | None, negate: bool
+) -> CompiledCheck:
+    def is_older(checked_value: Any) -> bool:
+        some_date = convert_to_date(checked_value)
+        if some_date is None:
+            raise AutopilotError(
+                f"The value '{checked_value}' is not a valid date and cannot be used for comparison!"
+            )
+        if other_date is None:
+            threshold = datetime.today().timestamp() - other_interval  # type: ignore
+        else:
+            threshold = other_date
+        return (some_date < threshold) != negate
+
+    return is_older
+
+
+def compile_check(operator: str, other_value: OtherValue | None) -> CompiledCheck:
+    """
+    Prepare a check for validating many values.
+
+    Returns a function which takes the `checked_value` and gives the same
+    result as `check(checked_value, operator, other_value)`. The `operator` is
+    resolved and the `other_value` is converted (to a number, a timestamp or a
+    time interval) only once instead of for every checked value.
+
+    If the `other_value` cannot be converted for the given operator, the
+    returned function calls the check function as usual, so that the same
+    error is raised when a value is checked.
+    """
+    check_fn = checks_dict.get(operator, invalid_operator)
+
+    def fallback(checked_value: Any) -> bool:
+        return check_fn(checked_value, other_value)
+
+    if check_fn in (empty, not_empty):
+        return fallback
+    if check_fn is contains:
+        other_string = str(other_value)
+        return lambda checked_value: other_string in str(checked_value)
+    if other_value is None:
+        return fallback
+    if check_fn is equals:
+        try:
+            return _compile_equals(str(other_value), float(other_value))
+        except TypeError:
+            return fallback
+        except ValueError:
+            return _compile_equals(str(other_value), None)
+    if check_fn in (larger, larger_equal, less, less_equal):
+        try:
+            other_number = float(other_value)
+        except (TypeError, ValueError):
+            return fallback
+        return _compile_comparison(check_fn, other_number)
+    if check_fn in (older, not_older):
+        try:
+            other_date = convert_to_date(other_value)
+            other_interval = (
+                convert_to_seconds(str(other_value)) if other_date is None else None
+            )
+        except Exception:
+            return fallback
+        return _compile_older(other_date, other_interval, negate=check_fn is not_older)
+    return fallback
+
+
+def check_many(
+    checked_values: Iterable[Any], operator: str, other_value: OtherValue | None
+) -> list[bool]:
+    """
+    Validate many values with the same `operator` and `other_value`.
+
+    The `checked_values` can be any iterable, e.g. a list or a NumPy array.
+    Returns the results of `check` for each value, in the same order.
+    """
+    compiled_check = compile_check(operator, other_value)
+    return [compiled_check(checked_value) for checked_value in checked_values]
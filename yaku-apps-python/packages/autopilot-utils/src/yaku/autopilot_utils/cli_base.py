@@ -78,12 +78,33 @@ For more complex use-cases, other attributes are also possible:
 
 * `click_evaluator_callback` needs to be defined if results are collected
   during the execution of the `click_command` function.
+* `click_stream_results` can be set to `True` to write each result into a
+  temporary buffer as soon as it is appended to `RESULTS`, instead of keeping
+  all results in memory. Like without streaming, the results are only printed
+  (after the status) if the command succeeds. See
+  :py:meth:`~yaku.autopilot_utils.results.ResultsCollector.stream_to` for
+  the implications for `click_evaluator_callback`.
 * `click_subcommands` can be used to define subcommands for a main command,
   e.g. when having an Excel evaluator which can be called like
   :command:`excel-evaluate cell --location=A1 --equals="yes"` or like
   :command:`excel-evaluate column --column-index=F --values="yes|no"`.
 
 
+Profiling and metrics
+---------------------
+
+All apps have a `--profile=cprofile|tracemalloc` option (or the
+`AUTOPILOT_PROFILE` environment variable) which profiles the `click_command`,
+all subcommands and the `click_evaluator_callback`, and writes the results into
+the evidence path. See :py:mod:`yaku.autopilot_utils.profiling` for details.
+
+Timing spans and counters which are recorded with
+:py:data:`~yaku.autopilot_utils.metrics.METRICS` are printed as additional
+`{"metrics": ...}` JSON line if the `AUTOPILOT_METRICS` environment variable
+is set to `1`, or written into the file given by `AUTOPILOT_METRICS_FILE`.
+See :py:mod:`yaku.autopilot_utils.metrics` for details.
+
+
 Click argument validation
 -------------------------
 
@@ -131,15 +152,16 @@ import importlib.resources
 import json
 import os
 import sys
+import time
 from typing import Any, Callable, Dict, List, Optional
 
 import click
-import pydantic
 from loguru import logger
 
 from .errors import AutopilotFailure
+from .metrics import METRICS, METRICS_ENVIRONMENT_VARIABLE, METRICS_FILE_ENVIRONMENT_VARIABLE
+from .profiling import PROFILE_ENVIRONMENT_VARIABLE, PROFILE_MODES, AppProfiler
 from .results import RESULTS, ResultHandler, ResultsCollector
-from .subprocess import AutopilotSubprocessFailure
 from .types import (
     ClickCommandProvider,
     ClickSubCommandProvider,
@@ -206,6 +228,7 @@ def make_autopilot_app(
     click_setup = getattr(provider, "click_setup", [])
     click_command = getattr(provider, "click_command", None)
     click_help_text = getattr(provider, "click_help_text", "")
+    click_stream_results = getattr(provider, "click_stream_results", False)
     if not click_subcommands and not click_command:
         raise TypeError(
             f"CLI provider '{provider}' must provide either "
@@ -244,9 +267,17 @@ def make_autopilot_app(
         click.echo(version.strip())
         ctx.exit()
 
-    def main_cli_entrypoint_wrapper(ctx, colors: bool, debug: bool, *args, **kwargs):
+    def main_cli_entrypoint_wrapper(
+        ctx, colors: bool, debug: bool, profile: Optional[str], *args, **kwargs
+    ):
         ctx.color = colors  # necessary for click
         set_up_logging(ctx.debug, colors)
+        _start_metrics(ctx)
+        if profile:
+            _start_profiling(ctx, profile, provider.click_name)
+        if click_stream_results:
+            # results are only printed if the command succeeds, see `_handle_results`
+            RESULTS.stream_to_buffer()
         if click_command:
             click_command(*args, **kwargs)
 
@@ -295,6 +326,13 @@ def make_autopilot_app(
                     is_flag=True,
                     default=False,
                 ),
+                click.option(
+                    "--profile",
+                    type=click.Choice(PROFILE_MODES, case_sensitive=False),
+                    envvar=PROFILE_ENVIRONMENT_VARIABLE,
+                    default=None,
+                    help="Profile the app and write the results into the evidence path.",
+                ),
                 *click_setup,
                 click.pass_context,
                 handle_app_errors,
@@ -313,10 +351,48 @@ def make_autopilot_app(
     return main_cli_entrypoint
 
 
+def _start_profiling(ctx: click.Context, mode: str, name: str):
+    """Profile everything until `ctx` is closed, i.e. including subcommands and evaluation."""
+    profiler = AppProfiler(mode, name)
+    profiler.start()
+
+    def stop_profiling():
+        try:
+            profiler.stop()
+        except OSError as e:
+            logger.warning("Could not write profiling results: {}", e)
+
+    ctx.call_on_close(stop_profiling)
+
+
+def _start_metrics(ctx: click.Context):
+    """Collect metrics until `ctx` is closed if requested by the environment."""
+    print_metrics = os.getenv(METRICS_ENVIRONMENT_VARIABLE, "").lower() in ("1", "true", "yes")
+    metrics_file = os.getenv(METRICS_FILE_ENVIRONMENT_VARIABLE)
+    if not print_metrics and not metrics_file:
+        return
+    METRICS.clear()
+    METRICS.enable()
+    start = time.perf_counter()
+
+    def stop_metrics():
+        METRICS.record("total", time.perf_counter() - start)
+        METRICS.disable()
+        if print_metrics:
+            METRICS.emit()
+        if metrics_file:
+            try:
+                METRICS.write(metrics_file)
+            except OSError as e:
+                logger.warning("Could not write metrics file: {}", e)
+
+    ctx.call_on_close(stop_metrics)
+
+
 def _handle_results(
     results: ResultsCollector, provider: ClickCommandProvider | ClickSubCommandProvider
 ):
-    if len(results):
+    if results.result_count:
         callback: Optional[ResultHandler] = getattr(provider, "click_evaluator_callback", None)
 
         if callback is None:
@@ -336,7 +412,10 @@ def _handle_results(
                 f"The status must be one of GREEN, YELLOW, RED, or FAILED.\nThe returned status was: {status}."
             )
         print(json.dumps({"status": status, "reason": reason}))
-        print(results.to_json())
+        if results.is_buffering:
+            results.write_buffer()
+        elif not results.is_streaming:
+            print(results.to_json())
     else:
         logger.debug("RESULTS of {provider} are empty.", provider=provider)
 
@@ -433,12 +512,27 @@ def handle_app_result(
     return result_handler_function
 
 
+class _NeverRaised(Exception):
+    pass
+
+
+def _loaded_exception_class(module_name: str, class_name: str) -> type[Exception]:
+    """
+    Return an exception class, but only if its module has already been imported.
+
+    If the module hasn't been imported, the exception cannot have been raised, so
+    there is no need to import the module (e.g. pydantic) just for the `except` clause.
+    """
+    module = sys.modules.get(module_name)
+    return getattr(module, class_name, _NeverRaised) if module is not None else _NeverRaised
+
+
 def handle_app_errors(f):
     @functools.wraps(f)
     def error_handler(*args, **kwargs):
         try:
             f(*args, **kwargs)
-        except pydantic.ValidationError as e:
+        except _loaded_exception_class("pydantic", "ValidationError") as e:
             error_messages = []
             for error in e.errors():
                 msg = f"Input validation failed for {error['loc']}: {error['msg']}."
@@ -450,7 +544,9 @@ def handle_app_errors(f):
             logger.opt(depth=3, exception=True).error("An error has occurred.")
             print(json.dumps({"status": "FAILED", "reason": str(e)}))
             sys.exit(0)
-        except AutopilotSubprocessFailure:
+        except _loaded_exception_class(
+            "yaku.autopilot_utils.subprocess", "AutopilotSubprocessFailure"
+        ):
             sys.exit(0)
         except Exception:
             logger.opt(depth=3, exception=True).error("An unexpected error has occurred.")
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Defer imports of heavy modules until they are really needed.
+
+Autopilot apps are started as fresh processes very often, and many of these
+starts don't need the app's heavy dependencies at all, e.g. for `--version`,
+`--help` or usage errors. Instead of importing the implementation of a command
+at the top of the CLI module::
+
+    from .digital_signature_verification import digital_signature_verification
+
+it can be loaded lazily with :py:func:`lazy_callable`::
+
+    digital_signature_verification = lazy_callable(
+        "yaku.pdf_signature_evaluator.digital_signature_verification"
+        ":digital_signature_verification"
+    )
+
+The module is then only imported when the function is called for the first
+time, e.g. inside `click_command`.
+
+Note that Pants cannot infer dependencies from such strings, so the lazily
+imported module must be added to the `dependencies` of the app's
+`python_sources` target.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable
+
+
+class LazyCallable:
+    """
+    Callable which imports its target on first use and then forwards all calls to it.
+
+    The `target` must be given as `"package.module:attribute"`.
+    """
+
+    def __init__(self, target: str):
+        module_name, separator, attribute = target.partition(":")
+        if not separator or not module_name or not attribute:
+            raise ValueError(
+                f"Lazy target must look like 'package.module:attribute': {target}"
+            )
+        self.target = target
+        self._module_name = module_name
+        self._attribute = attribute
+        self._resolved: Callable[..., Any] | None = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Callable[..., Any]:
+        """Import the target (if not yet done) and return it."""
+        if self._resolved is None:
+            with self._lock:
+                if self._resolved is None:
+                    module = importlib.import_module(self._module_name)
+                    self._resolved = getattr(module, self._attribute)
+        return self._resolved  # type: ignore
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._resolved is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyCallable({self.target!r})"
+
+
+def lazy_callable(target: str) -> LazyCallable:
+    """Return a callable which imports `target` (`"package.module:attribute"`) on first use."""
+    return LazyCallable(target)
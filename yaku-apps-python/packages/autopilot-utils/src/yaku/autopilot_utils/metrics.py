@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Timing spans and counters which show where the time of an autopilot run went.
+
+Apps record the duration of their phases and count things like requests or
+downloaded bytes with the global :py:data:`METRICS` collector::
+
+    from yaku.autopilot_utils.metrics import METRICS
+
+    with METRICS.span("splunk.wait_for_job"):
+        wait_for_job()
+
+    METRICS.increment("sharepoint.downloaded_bytes", len(content))
+
+Collecting is disabled by default. Then :py:meth:`MetricsCollector.span`
+returns a shared no-op context manager and :py:meth:`MetricsCollector.increment`
+returns right away, so the calls can stay in hot code paths.
+
+For apps created with :py:func:`~yaku.autopilot_utils.cli_base.make_autopilot_app`,
+collecting is enabled by setting the environment variable `AUTOPILOT_METRICS`
+to `1` (print an additional `{"metrics": ...}` JSON line at the end of the run)
+and/or `AUTOPILOT_METRICS_FILE` to a file path (write the metrics into this
+JSON file). The duration of the whole run is recorded as `total` span.
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO, Union
+
+METRICS_ENVIRONMENT_VARIABLE = "AUTOPILOT_METRICS"
+METRICS_FILE_ENVIRONMENT_VARIABLE = "AUTOPILOT_METRICS_FILE"
+
+
+@dataclass
+class SpanStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "max_seconds": round(self.max, 6),
+        }
+
+
+class _NoSpan:
+    """Context manager which does nothing, used if collecting is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("_collector", "_name", "_start")
+
+    def __init__(self, collector: "MetricsCollector", name: str):
+        self._collector = collector
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._collector.record(self._name, time.perf_counter() - self._start)
+        return None
+
+
+class MetricsCollector:
+    """Collect timing spans and counters. Can be shared between threads."""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: Dict[str, SpanStats] = {}
+        self.counters: Dict[str, Union[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+
+    def span(self, name: str):
+        """Return a context manager which records the time spent inside of it as `name`."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """Decorate a function, so that its calls are recorded as span `name`."""
+
+        def decorator(f: Callable) -> Callable:
+            span_name = name or f.__qualname__
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return f(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name: str, duration: float):
+        """Add a span `name` which took `duration` seconds."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.count += 1
+            stats.total += duration
+            if duration > stats.max:
+                stats.max = duration
+
+    def increment(self, name: str, value: Union[int, float] = 1):
+        """Increase the counter `name` by `value`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "spans": {name: stats.to_dict() for name, stats in self.spans.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps({"metrics": self.to_dict()})
+
+    def emit(self, stream: Optional[TextIO] = None):
+        """Print the metrics as a single `{"metrics": ...}` JSON line."""
+        print(self.to_json(), file=stream if stream is not None else sys.stdout, flush=True)
+
+    def write(self, path: Union[str, Path]):
+        """Write the metrics into a JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+METRICS = MetricsCollector()
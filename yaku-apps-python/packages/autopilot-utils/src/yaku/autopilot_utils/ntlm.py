@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Shared HTTP sessions for on-premise SharePoint servers with NTLM authentication.
+
+NTLM authenticates a connection, not a request: once the three-leg handshake
+(negotiate, challenge, authenticate) has succeeded on a socket, the server
+accepts all further requests on that socket without another handshake. So
+every connection which is dropped and opened again costs a full handshake.
+
+The sessions created by :py:func:`create_ntlm_session` therefore use a
+connection pool which is large enough for the configured concurrency and
+which blocks instead of opening throwaway connections when all pooled
+connections are in use. Sockets are kept alive and reused between requests.
+
+The number of requests, opened and reused connections, and NTLM handshakes
+are counted in :py:class:`ConnectionStats`.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Type
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests_ntlm import HttpNtlmAuth
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_SIZE = DEFAULT_POOLSIZE
+
+
+@dataclass
+class ConnectionStats:
+    """Count requests, connections and NTLM handshakes. Can be shared between threads."""
+
+    requests: int = 0
+    connections_opened: int = 0
+    handshakes: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests which were sent over an already open connection."""
+        return max(0, self.requests - self.connections_opened)
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_handshake(self):
+        with self._lock:
+            self.handshakes += 1
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.connections_opened} connections opened, "
+            f"{self.connections_reused} reused, {self.handshakes} NTLM handshakes"
+        )
+
+
+def _counting_pool_class(
+    pool_class: Type[HTTPConnectionPool], stats: ConnectionStats
+) -> Type[HTTPConnectionPool]:
+    class CountingConnectionPool(pool_class):  # type: ignore
+        def _new_conn(self):
+            stats.record_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    Transport adapter which keeps up to `pool_size` connections per host alive.
+
+    If all connections are in use, further requests wait for a free connection
+    instead of opening a new one which would be closed right after the request.
+
+    Requests and newly opened connections are counted in `connection_stats`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connection_stats: Optional[ConnectionStats] = None,
+        **kwargs,
+    ):
+        self.connection_stats = (
+            connection_stats if connection_stats is not None else ConnectionStats()
+        )
+        kwargs.setdefault("pool_maxsize", max(1, pool_size))
+        kwargs.setdefault("pool_block", True)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.connection_stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.connection_stats),
+        }
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.connection_stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class CountingNtlmAuth(HttpNtlmAuth):
+    """NTLM authentication which counts the handshakes in `connection_stats`."""
+
+    def __init__(self, username: str, password: str, connection_stats: ConnectionStats):
+        super().__init__(username, password)
+        self.connection_stats = connection_stats
+
+    def retry_using_http_NTLM_auth(self, *args, **kwargs):
+        self.connection_stats.record_handshake()
+        return super().retry_using_http_NTLM_auth(*args, **kwargs)
+
+
+def create_ntlm_session(
+    username: str,
+    password: str,
+    *,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    connection_stats: Optional[ConnectionStats] = None,
+    adapter: Optional[PooledAdapter] = None,
+    headers: Optional[Dict[str, str]] = None,
+    verify: bool = False,
+) -> requests.Session:
+    """
+    Create a session which authenticates with NTLM and reuses its connections.
+
+    The `pool_size` should be at least the number of threads which use the
+    session at the same time. Instead of the default :py:class:`PooledAdapter`,
+    a custom `adapter` (e.g. a subclass with additional retry logic) can be
+    given; its `connection_stats` are then used for counting the handshakes.
+    """
+    if adapter is None:
+        adapter = PooledAdapter(pool_size=pool_size, connection_stats=connection_stats)
+    session = requests.Session()
+    if headers is not None:
+        session.headers = headers  # type: ignore
+    session.auth = CountingNtlmAuth(username, password, adapter.connection_stats)
+    session.verify = verify
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Opt-in profiling of autopilot apps.
+
+Every app created with :py:func:`~yaku.autopilot_utils.cli_base.make_autopilot_app`
+has a `--profile` option, which can also be set with the `AUTOPILOT_PROFILE`
+environment variable, so that an app can be profiled in a running workflow
+without rebuilding it:
+
+* `cprofile` records the function calls with :py:mod:`cProfile`. The raw
+  statistics are written to `profile-<app>.pstats` (e.g. for `snakeviz` or
+  `python -m pstats`) and the most expensive functions are summarized in
+  `profile-<app>.txt`.
+* `tracemalloc` traces memory allocations with :py:mod:`tracemalloc`. The
+  peak memory usage and the source lines which allocated the most memory are
+  written to `allocations-<app>.txt`.
+
+The files are written into the folder given by the `evidence_path` environment
+variable (or the current working directory). The number of entries in the
+summaries can be changed with `AUTOPILOT_PROFILE_TOP` (default: 30).
+"""
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+PROFILE_ENVIRONMENT_VARIABLE = "AUTOPILOT_PROFILE"
+PROFILE_TOP_ENVIRONMENT_VARIABLE = "AUTOPILOT_PROFILE_TOP"
+PROFILE_MODES = ("cprofile", "tracemalloc")
+DEFAULT_TOP_ENTRIES = 30
+
+
+def get_profile_output_path() -> Path:
+    """Return the folder into which the profiling results are written."""
+    return Path(os.environ.get("evidence_path") or os.getcwd())
+
+
+def _get_top_entries() -> int:
+    try:
+        return int(os.environ.get(PROFILE_TOP_ENVIRONMENT_VARIABLE, DEFAULT_TOP_ENTRIES))
+    except ValueError:
+        return DEFAULT_TOP_ENTRIES
+
+
+class AppProfiler:
+    """
+    Profile the code which runs between :py:meth:`start` and :py:meth:`stop`.
+
+    The `mode` must be one of `PROFILE_MODES`. The `name` (usually the app name)
+    is used for the names of the files written by :py:meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        name: str,
+        output_path: Optional[Path] = None,
+        top_entries: Optional[int] = None,
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode '{mode}'! Supported modes are: {', '.join(PROFILE_MODES)}"
+            )
+        self.mode = mode
+        self.name = name
+        self.output_path = (
+            output_path if output_path is not None else get_profile_output_path()
+        )
+        self.top_entries = top_entries if top_entries is not None else _get_top_entries()
+        self._profile = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        logger.debug("Starting {} profiling", self.mode)
+        # the profiling modules are only imported here, as this module is
+        # imported on every start of an app
+        if self.mode == "cprofile":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+
+    def stop(self) -> List[Path]:
+        """Stop profiling, write the results and return the paths of the written files."""
+        if self.mode == "cprofile":
+            files = self._stop_cprofile()
+        else:
+            files = self._stop_tracemalloc()
+        for file in files:
+            logger.info("Profiling results were written to {}", file)
+        return files
+
+    def _stop_cprofile(self) -> List[Path]:
+        import io
+        import pstats
+
+        if self._profile is None:
+            return []
+        self._profile.disable()
+        stats_file = self.output_path / f"profile-{self.name}.pstats"
+        summary_file = self.output_path / f"profile-{self.name}.txt"
+        self._profile.dump_stats(stats_file)
+        summary = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_entries)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top_entries)
+        summary_file.write_text(summary.getvalue())
+        self._profile = None
+        return [stats_file, summary_file]
+
+    def _stop_tracemalloc(self) -> List[Path]:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        lines = [
+            f"Current traced memory: {current / 1024:.1f} KiB",
+            f"Peak traced memory: {peak / 1024:.1f} KiB",
+            "",
+            f"Top {self.top_entries} allocations by source line:",
+        ]
+        for statistic in snapshot.statistics("lineno")[: self.top_entries]:
+            lines.append(str(statistic))
+        summary_file = self.output_path / f"allocations-{self.name}.txt"
+        summary_file.write_text("\n".join(lines) + "\n")
+        return [summary_file]
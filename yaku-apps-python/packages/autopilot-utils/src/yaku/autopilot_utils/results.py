@@ -40,13 +40,36 @@ decorator which you simply put around your test function::
 
     # after the test has finished, RESULTS will be reset to previous state
 
+Streaming
+---------
+
+By default, all results are kept in memory and printed after the command
+has finished. For apps which produce many results, the collector can
+instead write each result as JSON line as soon as it is appended::
+
+    RESULTS.stream_to(sys.stdout)
+
+In this mode, only the unfulfilled results are kept, so the
+`click_evaluator_callback` must use `fulfilled_count`, `unfulfilled_count`
+and `unfulfilled()` instead of iterating over all results. Apps based on
+:py:func:`~yaku.autopilot_utils.cli_base.make_autopilot_app` can enable
+streaming by setting `click_stream_results = True` in their provider.
+
+Those apps stream the results into a temporary buffer (see
+`stream_to_buffer`), which is only printed after the status line if the
+command succeeds. So, like without streaming, a failed run doesn't print
+any (partial) results.
+
 """
 
 import json
 import re
+import shutil
+import sys
 from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Callable, Tuple
+from json.encoder import encode_basestring_ascii  # type: ignore
+from typing import Any, Callable, Iterable, List, Optional, TextIO, Tuple
 
 
 @dataclass
@@ -64,6 +87,16 @@ class Output:
         return json.dumps({"output": {self.key: self.value}})
 
 
+def _to_bool(fulfilled: Any) -> bool:
+    if isinstance(fulfilled, bool):
+        return fulfilled
+    if fulfilled in ("true", "True", 1, "1"):
+        return True
+    if fulfilled in ("false", "False", 0, "0"):
+        return False
+    raise ValueError(f"Value for 'fulfilled' is not a valid boolean value: {fulfilled}")
+
+
 @dataclass
 class Result:
     """
@@ -78,40 +111,213 @@ class Result:
     metadata: dict = field(default_factory=dict)
 
     def __post_init__(self):
-        if not isinstance(self.fulfilled, bool):
-            if self.fulfilled in ("true", "True", 1, "1"):
-                self.fulfilled = True
-            elif self.fulfilled in ("false", "False", 0, "0"):
-                self.fulfilled = False
-            else:
-                raise ValueError(
-                    f"Value for 'fulfilled' is not a valid boolean value: {self.fulfilled}"
-                )
+        self.fulfilled = _to_bool(self.fulfilled)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactResult:
+    """
+    Immutable and more compact variant of :py:class:`Result`.
+
+    Uses `__slots__` instead of a `__dict__` per instance and interns the
+    `criterion`, so that many results with the same criterion text share a
+    single string. Useful for apps which produce a large number of results.
+    """
+
+    criterion: str
+    fulfilled: bool
+    justification: str
+    metadata: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, "fulfilled", _to_bool(self.fulfilled))
+        if isinstance(self.criterion, str):
+            object.__setattr__(self, "criterion", sys.intern(self.criterion))
+
+
+AnyResult = Result | CompactResult
+
+# same configuration as the default encoder used by `json.dumps`
+_ENCODER = json.JSONEncoder()
+
+
+def result_to_dict(result: AnyResult) -> dict[str, Any]:
+    if isinstance(result, CompactResult):
+        return {
+            "criterion": result.criterion,
+            "fulfilled": result.fulfilled,
+            "justification": result.justification,
+            "metadata": result.metadata,
+        }
+    return result.__dict__
+
+
+def result_to_json(result: AnyResult) -> str:
+    """Return the JSON line for a result, identical to `json.dumps({"result": ...})`."""
+    if (
+        isinstance(result, CompactResult)
+        and isinstance(result.criterion, str)
+        and isinstance(result.justification, str)
+    ):
+        # avoid building an intermediate dict for the fixed fields
+        return (
+            '{"result": {"criterion": '
+            + encode_basestring_ascii(result.criterion)
+            + ', "fulfilled": '
+            + ("true" if result.fulfilled else "false")
+            + ', "justification": '
+            + encode_basestring_ascii(result.justification)
+            + ', "metadata": '
+            + (_ENCODER.encode(result.metadata) if result.metadata != {} else "{}")
+            + "}}"
+        )
+    return '{"result": ' + _ENCODER.encode(result_to_dict(result)) + "}"
+
 
+def results_to_json(results: Iterable[AnyResult]) -> str:
+    """Return the JSON lines for many results, separated by newlines."""
+    return "\n".join(map(result_to_json, results))
 
-class ResultsCollector(list[Result]):
+
+class ResultsCollector(list[AnyResult]):
     """
-    List of :py:class:`Result` objects.
+    List of :py:class:`Result` (or :py:class:`CompactResult`) objects.
 
     Is used for the :py:data:`RESULTS` singleton to collect all results
     of an autopilot run before the final evaluation.
 
     Has an `append(result: Result)` method and a `to_json()` method.
+
+    After calling `stream_to()`, results are written as JSON lines as soon as
+    they are appended, and only the unfulfilled results are kept in the list.
+    With `stream_to_buffer()`, they are written into a temporary buffer instead,
+    which is printed later on with `write_buffer()`.
     """
 
-    def append(self, result: Result) -> None:
-        if not isinstance(result, Result):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._stream: Optional[TextIO] = None
+        self._is_streaming = False
+        self._is_buffering = False
+        self._streamed_fulfilled_count = 0
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._is_streaming
+
+    @property
+    def is_buffering(self) -> bool:
+        return self._is_buffering
+
+    def stream_to(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Write each appended result as JSON line to `stream` (default: `sys.stdout`).
+
+        Results which were collected before are written immediately.
+        """
+        self._close_buffer()
+        collected = list(self)
+        super().clear()
+        self._stream = stream
+        self._is_streaming = True
+        self._streamed_fulfilled_count = 0
+        self.extend(collected)
+
+    def stream_to_buffer(self, max_memory: int = 1024 * 1024) -> None:
+        """
+        Write each appended result as JSON line into a temporary buffer.
+
+        The buffer is kept in memory up to `max_memory` bytes and is moved to a
+        temporary file afterwards. Use `write_buffer()` to print the results.
+        """
+        import tempfile
+
+        self.stream_to(
+            tempfile.SpooledTemporaryFile(max_memory, mode="w+", encoding="utf-8")  # type: ignore
+        )
+        self._is_buffering = True
+
+    def write_buffer(self, output: Optional[TextIO] = None) -> None:
+        """Copy the buffered JSON lines to `output` (default: `sys.stdout`)."""
+        if not self._is_buffering or self._stream is None:
+            return
+        self._stream.seek(0)
+        output = output if output is not None else sys.stdout
+        shutil.copyfileobj(self._stream, output)
+        output.flush()
+
+    def _close_buffer(self) -> None:
+        if self._is_buffering and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._is_buffering = False
+
+    def stop_streaming(self) -> None:
+        """
+        Keep results in memory again. Already written results are not restored.
+
+        Results which were not yet printed from the buffer are discarded.
+        """
+        self._close_buffer()
+        self._stream = None
+        self._is_streaming = False
+        self._streamed_fulfilled_count = 0
+
+    def _write(self, result: AnyResult) -> None:
+        stream = self._stream if self._stream is not None else sys.stdout
+        stream.write(result_to_json(result) + "\n")
+        stream.flush()
+
+    def append(self, result: AnyResult) -> None:
+        if not isinstance(result, (Result, CompactResult)):
             raise TypeError("Given result is not a Result object!")
+        if self._is_streaming:
+            self._write(result)
+            if result.fulfilled:
+                self._streamed_fulfilled_count += 1
+                return
         super().append(result)
 
+    def extend(self, results: Iterable[AnyResult]) -> None:
+        if not self._is_streaming:
+            super().extend(results)
+            return
+        for result in results:
+            self.append(result)
+
+    def clear(self) -> None:
+        super().clear()
+        self._streamed_fulfilled_count = 0
+
     def __bool__(self) -> bool:
         return all({r.fulfilled for r in self})
 
+    @property
+    def fulfilled_count(self) -> int:
+        """Number of fulfilled results, including results which were already streamed."""
+        if self._is_streaming:
+            return self._streamed_fulfilled_count
+        return sum(1 for r in self if r.fulfilled)
+
+    @property
+    def unfulfilled_count(self) -> int:
+        """Number of unfulfilled results, including results which were already streamed."""
+        return sum(1 for r in self if not r.fulfilled)
+
+    @property
+    def result_count(self) -> int:
+        """Number of all results, including results which were already streamed."""
+        return self.fulfilled_count + self.unfulfilled_count
+
+    def unfulfilled(self) -> List[AnyResult]:
+        """Return all unfulfilled results. They are kept in streaming mode as well."""
+        return [r for r in self if not r.fulfilled]
+
     def to_json(self):
-        lines = []
-        for result in self:
-            lines.append(json.dumps({"result": result.__dict__}))
-        return "\n".join(lines)
+        """Return the collected results as JSON lines. Empty in streaming mode."""
+        if self._is_streaming:
+            return ""
+        return results_to_json(self)
 
 
 RESULTS = ResultsCollector()
@@ -134,6 +340,7 @@ def protect_results(f):
         try:
             f(*args, **kwargs)
         finally:
+            RESULTS.stop_streaming()
             RESULTS.clear()
             RESULTS.extend(backup)
 
@@ -212,13 +419,14 @@ def DEFAULT_EVALUATOR(results: ResultsCollector):
         class CLI:
             click_evaluator_callback = DEFAULT_EVALUATOR
     """
-    if any([not r.fulfilled for r in results]):
+    if results.unfulfilled_count:
         return "RED", "\n".join(
             [
                 "Criterion is: " + r.criterion + "\nBut: " + r.justification
-                for r in results
-                if not r.fulfilled
+                for r in results.unfulfilled()
             ]
         )
+    elif results.is_streaming:
+        return "GREEN", f"All {results.result_count} criteria are fulfilled."
     else:
         return "GREEN", "\n".join([r.justification for r in results])
@@ -55,14 +55,34 @@ Of course, this final step could also be done in the `click_evaluator_callback`,
 but the logic above allows full flexibility on the flow control between the
 different subprocesses. Also, _outputs_ could be retrieved from `step1` and
 used for `step2`.
+
+For long-running apps, :py:func:`run_streaming` can be used instead of
+:py:func:`run`. It shows the log output of the app while it is running
+instead of after it has finished.
+
+As the two fetchers above don't depend on each other, they could also run
+at the same time with :py:func:`run_many`::
+
+    steps = run_many([["sharepoint-fetcher"], ["artifactory-fetcher"]], timeout=600)
+    for step in steps:
+        step.exit_for_returncode()
+        step.raise_for_status()
+    results, outputs = merge_process_results(steps)
+    RESULTS.extend(results)
+
+The results are returned in the order of the commands, no matter which
+process finishes first.
 """
 
 import dataclasses
+import functools
 import json
 import os
 import subprocess
 import sys
-from typing import Any, Callable, List, Mapping, Optional, Protocol
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 from loguru import logger
 from yaku.autopilot_utils.results import Result, ResultsCollector
@@ -153,18 +173,20 @@ def gen_exit_for_returncode(process_result: ProcessResult):
     """Provide a function for exiting on a failed subprocess."""
 
     def exit_for_returncode():
+        # set by `run_streaming` if the output has already been printed
+        output_forwarded = getattr(process_result, "output_forwarded", False)
         if process_result.returncode != 0:
             logger.error(process_result.args)
             logger.error(
                 "Subprocess exited with returncode {code}.",
                 code=process_result.returncode,
             )
-            if process_result.stdout:
+            if process_result.stdout and not output_forwarded:
                 logger.error(process_result.stdout)
-            if process_result.stderr:
+            if process_result.stderr and not output_forwarded:
                 logger.error(process_result.stderr)
             sys.exit(process_result.returncode)
-        else:
+        elif not output_forwarded:
             if process_result.clean_stdout:
                 print(process_result.clean_stdout)
             if process_result.stderr:
@@ -208,6 +230,79 @@ def gen_raise_for_status(process_result: ProcessResult):
     return raise_for_status
 
 
+@dataclasses.dataclass
+class ParsedOutput:
+    """Status, reason, results, outputs and remaining text of an autopilot's stdout."""
+
+    status: Any = None
+    reason: Any = None
+    results: List[Any] = dataclasses.field(default_factory=list)
+    outputs: dict = dataclasses.field(default_factory=dict)
+    clean_stdout: str = ""
+
+
+def parse_autopilot_output(text: str, result_cls=Result) -> ParsedOutput:
+    """
+    Parse the stdout of an autopilot app in a single pass.
+
+    Gives the same results as calling :py:func:`parse_json_lines` for `status`
+    and `reason`, :py:func:`parse_json_lines_into_list` for `result` (with
+    `cls=result_cls`), :py:func:`parse_json_lines_into_map` for `output`
+    and :py:func:`clean_json_lines` on the same `text`, but decodes each
+    line only once.
+
+    JSON lines which don't contain an object (e.g. a line with just a number)
+    are removed from `clean_stdout`, but are otherwise ignored.
+    """
+    parser = AutopilotOutputParser(result_cls)
+    for line in text.split(os.linesep):
+        parser.feed(line)
+    return parser.finish()
+
+
+class AutopilotOutputParser:
+    """
+    Parse the stdout of an autopilot app line by line, e.g. while it is running.
+
+    See :py:func:`parse_autopilot_output` for details.
+    """
+
+    def __init__(self, result_cls=Result):
+        self._result_cls = result_cls
+        self._parsed = ParsedOutput()
+        self._clean_lines: List[str] = []
+
+    def feed(self, line: str) -> bool:
+        """Parse a single `line` without line separator. Returns whether it was a JSON line."""
+        try:
+            data = json.loads(line.strip())
+        except json.JSONDecodeError:
+            self._clean_lines.append(line)
+            return False
+        if not isinstance(data, dict):
+            return True
+        parsed = self._parsed
+        if "status" in data:
+            parsed.status = data["status"]
+        if "reason" in data:
+            parsed.reason = data["reason"]
+        result = data.get("result")
+        if result:
+            try:
+                parsed.results.append(self._result_cls(**result))
+            except TypeError:
+                parsed.results.append(self._result_cls(*result))
+        output = data.get("output")
+        if output:
+            parsed.outputs.update(output)
+        return True
+
+    def finish(self) -> ParsedOutput:
+        """Return the parsed data of all lines fed so far."""
+        self._parsed.clean_stdout = os.linesep.join(self._clean_lines)
+        return self._parsed
+
+
 def run(
     command,
     /,
@@ -243,10 +338,6 @@ def run(
       :py:exc:`AutopilotSubprocessFailure` if the subprocess app status is not
       `GREEN`, `YELLOW`, or `RED` (`None` is ignored as well).
     """
-    env = None
-    if extra_env is not None:
-        env = os.environ.copy()
-        env.update(extra_env)
     logger.debug("Executing subprocess: {cmd}", cmd=command)
     process_result: ProcessResult = subprocess.run(
         command,
@@ -254,22 +345,34 @@ def run(
         shell=shell,
         stderr=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        env=env,
+        env=_get_env(extra_env),
         **kwargs,
     )  # type: ignore
+    return _add_autopilot_attributes(
+        process_result, parse_autopilot_output(process_result.stdout)
+    )
+
+
+def _get_env(extra_env: Optional[Mapping[str, str]]) -> Optional[Mapping[str, str]]:
+    if extra_env is None:
+        return None
+    env = os.environ.copy()
+    env.update(extra_env)
+    return env
+
+
+def _add_autopilot_attributes(
+    process_result: ProcessResult, parsed_output: ParsedOutput
+) -> ProcessResult:
     if process_result.returncode != 0:
         process_result.status = "ERROR"
     else:
-        process_result.status = parse_json_lines(process_result.stdout, "status")
-    process_result.reason = parse_json_lines(process_result.stdout, "reason")
+        process_result.status = parsed_output.status
+    process_result.reason = parsed_output.reason
 
-    process_result.results = ResultsCollector(
-        parse_json_lines_into_list(process_result.stdout, "result", cls=Result)
-    )
-    process_result.outputs = OutputMap(
-        parse_json_lines_into_map(process_result.stdout, "output")
-    )
-    process_result.clean_stdout = clean_json_lines(process_result.stdout)
+    process_result.results = ResultsCollector(parsed_output.results)
+    process_result.outputs = OutputMap(parsed_output.outputs)
+    process_result.clean_stdout = parsed_output.clean_stdout
     process_result.exit_for_returncode = gen_exit_for_returncode(process_result)
     process_result.raise_for_status = gen_raise_for_status(process_result)
 
@@ -285,6 +388,161 @@ def run(
     return process_result
 
 
+def run_streaming(
+    command,
+    /,
+    shell: bool = False,
+    extra_env: Optional[Mapping[str, str]] = None,
+    forward_output: bool = True,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> ProcessResult:
+    """
+    Run another autopilot app in a subprocess and process its output while it is running.
+
+    Works like :py:func:`run` and returns the same kind of result, but reads
+    the stdout and stderr of the subprocess line by line instead of waiting
+    until it has finished. This is useful for long-running apps, as their
+    log output is visible immediately.
+
+    If `forward_output` is enabled, all stdout lines which are not JSON lines
+    (so status, reason, results and outputs of the subprocess are not printed)
+    and all stderr lines are printed as soon as they arrive. As they have
+    already been shown, `exit_for_returncode()` of the returned result won't
+    print them again.
+
+    If the subprocess doesn't finish within `timeout` seconds, it is killed
+    and a `subprocess.TimeoutExpired` exception is raised. Other `kwargs` are
+    passed to `subprocess.Popen`.
+    """
+    logger.debug("Executing subprocess: {cmd}", cmd=command)
+    parser = AutopilotOutputParser()
+    stdout_lines: List[str] = []
+    stderr_lines: List[str] = []
+
+    with subprocess.Popen(
+        command,
+        encoding="utf-8",
+        shell=shell,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env=_get_env(extra_env),
+        bufsize=1,
+        **kwargs,
+    ) as process:
+
+        def read_stderr():
+            for line in process.stderr:  # type: ignore
+                stderr_lines.append(line)
+                if forward_output:
+                    print(line, end="", file=sys.stderr, flush=True)
+
+        stderr_reader = threading.Thread(target=read_stderr, daemon=True)
+        stderr_reader.start()
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+        try:
+            for line in process.stdout:  # type: ignore
+                stdout_lines.append(line)
+                line = line.removesuffix("\n")
+                if not parser.feed(line) and forward_output:
+                    print(line, flush=True)
+            if not stdout_lines or stdout_lines[-1].endswith("\n"):
+                # like `run`, which splits the stdout at line separators
+                parser.feed("")
+            stderr_reader.join()
+            returncode = process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    stdout, stderr = "".join(stdout_lines), "".join(stderr_lines)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, timeout, output=stdout, stderr=stderr)  # type: ignore
+    process_result: ProcessResult = subprocess.CompletedProcess(
+        command, returncode, stdout, stderr
+    )  # type: ignore
+    process_result.output_forwarded = forward_output  # type: ignore
+    return _add_autopilot_attributes(process_result, parser.finish())
+
+
+# default number of subprocesses which are run at the same time by `run_many`
+DEFAULT_MAX_PARALLEL_PROCESSES = 4
+
+
+def gather(
+    calls: Sequence[Callable[[], ProcessResult]],
+    max_workers: int = DEFAULT_MAX_PARALLEL_PROCESSES,
+) -> List[ProcessResult]:
+    """
+    Call functions which run subprocesses in parallel and return their results in order.
+
+    Each of the `calls` must be a function without arguments, e.g.
+    `functools.partial(run, ["some-fetcher"], extra_env={...})`. At most
+    `max_workers` of them are running at the same time.
+
+    If any of the calls raises an exception (e.g. `subprocess.TimeoutExpired`),
+    all other calls are still completed, and then the exception of the first
+    failing call (in the order of `calls`) is raised.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1!")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def run_many(
+    commands: Sequence[Any],
+    /,
+    max_workers: int = DEFAULT_MAX_PARALLEL_PROCESSES,
+    timeout: Optional[float] = None,
+    runner: Callable[..., ProcessResult] = run,
+    **kwargs,
+) -> List[ProcessResult]:
+    """
+    Run several autopilot apps in parallel subprocesses.
+
+    Each of the `commands` is run with `runner` (:py:func:`run` by default,
+    or e.g. :py:func:`run_streaming`), together with the `timeout` in seconds
+    for each single process and all other `kwargs`. At most `max_workers`
+    processes run at the same time. The results are returned in the same
+    order as the `commands`. See :py:func:`gather` for error handling.
+    """
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    return gather(
+        [functools.partial(runner, command, **kwargs) for command in commands],
+        max_workers=max_workers,
+    )
+
+
+def merge_process_results(
+    process_results: Sequence[ProcessResult],
+) -> Tuple[ResultsCollector, OutputMap]:
+    """
+    Combine the results and outputs of several subprocesses.
+
+    Results are concatenated in the order of `process_results`. If several
+    subprocesses provide an output with the same key, the value of the last
+    one in `process_results` wins.
+    """
+    results = ResultsCollector()
+    outputs = OutputMap()
+    for process_result in process_results:
+        results.extend(process_result.results)
+        outputs.update(process_result.outputs)
+    return results, outputs
+
+
 def clean_json_lines(text: str) -> str:
     """Remove any JSON line from text."""
     cleaned_lines = []
@@ -2,9 +2,11 @@
 #
 # SPDX-License-Identifier: MIT
 
+import re
+
 import pytest
 from freezegun import freeze_time
-from yaku.autopilot_utils.checks import check
+from yaku.autopilot_utils.checks import check, check_many, compile_check
 from yaku.autopilot_utils.errors import AutopilotConfigurationError, AutopilotError
 
 
@@ -102,3 +104,51 @@ def test_check_date_comparison_against_time_span(is_prefix):
 def test_invalid_operator():
     with pytest.raises(AutopilotConfigurationError, match="Invalid operator"):
         check("something", "invalid-operator", "something else")
+
+
+@pytest.mark.parametrize(
+    "operator,other_value",
+    [
+        ("equals", 1),
+        ("equals", "1.0"),
+        ("equals", "Draft"),
+        ("contains", "raf"),
+        ("is-empty", None),
+        ("is-not-empty", None),
+        ("larger", 1),
+        ("larger-equal", "1"),
+        ("less", 2.5),
+        ("less-equal", 1),
+        ("less", "many"),
+        ("older", "2023-06-01"),
+        ("not-older", "2023-06-01T12:00:00Z"),
+        ("older", "30d"),
+        ("not-older", "1y"),
+        ("older", "someday"),
+        ("invalid-operator", "something"),
+    ],
+)
+@pytest.mark.parametrize("value", ["1", 1, "1.0", "Draft", "", "2023-01-01", "2999-01-01"])
+def test_compiled_check_gives_same_result_as_check(operator, other_value, value):
+    compiled_check = compile_check(operator, other_value)
+    try:
+        expected = check(value, operator, other_value)
+    except (AutopilotError, AutopilotConfigurationError, AssertionError) as e:
+        with pytest.raises(type(e), match=re.escape(str(e))):
+            compiled_check(value)
+    else:
+        assert compiled_check(value) == expected
+
+
+@freeze_time("2010-01-01")
+def test_compiled_check_uses_current_time_for_time_spans():
+    compiled_check = compile_check("older-than", "1 year")
+    assert compiled_check("2008-12-31")
+    with freeze_time("2012-01-01"):
+        assert compiled_check("2010-06-01")
+
+
+def test_check_many():
+    assert check_many(["2", "5", "8"], "less-than", 5) == [True, False, False]
+    assert check_many(iter(["abc", "bcd"]), "contains", "a") == [True, False]
+    assert check_many([], "equals", "a") == []
@@ -4,11 +4,14 @@
 
 from datetime import datetime
 
+import dateutil.parser
 import pytest
 import pytz
 from freezegun import freeze_time
 from yaku.autopilot_utils.checks import (
+    clear_conversion_caches,
     contains,
+    conversion_cache_info,
     convert_to_date,
     convert_to_seconds,
     equals,
@@ -186,6 +189,45 @@ def test_convert_to_date(input, expected_output):
     assert convert_to_date(input) == expected_output
 
 
+@pytest.mark.parametrize(
+    "input",
+    [
+        "2022-01-01",
+        "2022-01-01 12:34",
+        "2022-01-01T12:34:56",
+        "2022-01-01T12:34:56.5",
+        "2022-01-01T12:34:56.123456Z",
+        "2022-01-01T12:34:56+02:00",
+        "2022-01-01T12:34:56-05:30",
+        "2022-02-30",
+        "2022-01-01T25:00",
+        "01-02-2022",
+    ],
+)
+def test_convert_to_date_gives_same_result_as_dateutil(input):
+    try:
+        expected = dateutil.parser.parse(input).astimezone(tz=pytz.utc).timestamp()
+    except dateutil.parser.ParserError:
+        expected = None
+    assert convert_to_date(input) == expected
+
+
+def test_conversions_are_cached():
+    clear_conversion_caches()
+    for _ in range(3):
+        convert_to_date("2022-01-01")
+        convert_to_seconds("30d")
+
+    cache_info = conversion_cache_info()
+    assert cache_info["convert_to_date"].hits == 2
+    assert cache_info["convert_to_date"].misses == 1
+    assert cache_info["convert_to_seconds"].hits == 2
+    assert cache_info["convert_to_seconds"].misses == 1
+
+    clear_conversion_caches()
+    assert conversion_cache_info()["convert_to_date"].currsize == 0
+
+
 @pytest.mark.parametrize(
     ("invalid_input"),
     [
@@ -11,6 +11,7 @@ they are running in separate processes and environments), there are a few
 tests (especially for edge cases) in this file.
 """
 
+import json
 import sys
 
 import click.testing
@@ -20,6 +21,7 @@ from loguru import logger
 from pydantic import BaseModel
 from yaku.autopilot_utils.cli_base import make_autopilot_app, read_version_from_package
 from yaku.autopilot_utils.errors import AutopilotFailure
+from yaku.autopilot_utils.metrics import METRICS
 from yaku.autopilot_utils.results import (
     DEFAULT_EVALUATOR,
     RESULTS,
@@ -657,3 +659,183 @@ def test_stderr_and_stdout_are_shown_for_all_statuses(status):
     assert result.exit_code == 0, result.stdout
     assert result.stdout.count("foo") == 1
     assert result.stdout.count("bar") == 1
+
+
+@protect_results
+def test_results_are_streamed_if_provider_requests_it():
+    class StreamingProvider:
+        click_name = "streaming"
+        click_help_text = "help"
+        click_stream_results = True
+
+        @staticmethod
+        def click_command():
+            RESULTS.append(Result("crit 1", True, "justification 1"))
+            print("between results")
+            RESULTS.append(Result("crit 2", False, "justification 2"))
+
+        click_evaluator_callback = DEFAULT_EVALUATOR
+
+    app = make_autopilot_app(StreamingProvider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app)
+
+    assert result.exit_code == 0, result.stdout
+    lines = result.stdout.splitlines()
+    # the results are printed after the status, like without streaming
+    assert lines[0] == "between results"
+    assert '"status": "RED"' in lines[1]
+    assert "crit 1" in lines[2]
+    assert "crit 2" in lines[3]
+    assert len(lines) == 4
+    assert_result_status(
+        result.stdout, "RED", reason="Criterion is: crit 2\nBut: justification 2"
+    )
+
+
+@protect_results
+def test_streamed_results_are_not_printed_if_command_fails():
+    class FailingStreamingProvider:
+        click_name = "streaming"
+        click_help_text = "help"
+        click_stream_results = True
+
+        @staticmethod
+        def click_command():
+            RESULTS.append(Result("crit 1", True, "justification 1"))
+            raise AutopilotFailure("something is missing")
+
+        click_evaluator_callback = DEFAULT_EVALUATOR
+
+    app = make_autopilot_app(FailingStreamingProvider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app)
+
+    assert result.exit_code == 0, result.stdout
+    assert "crit 1" not in result.stdout
+    assert '"result"' not in result.stdout
+    assert_result_status(result.stdout, "FAILED", reason="something is missing")
+
+
+@protect_results
+@pytest.mark.parametrize(
+    "mode,expected_files",
+    [
+        ("cprofile", ["profile-profiled.pstats", "profile-profiled.txt"]),
+        ("tracemalloc", ["allocations-profiled.txt"]),
+    ],
+)
+def test_app_is_profiled_if_requested(monkeypatch, tmp_path, mode, expected_files):
+    evaluator_callback = mock.Mock(return_value=("GREEN", "all fine!"))
+
+    class ProfiledProvider:
+        click_name = "profiled"
+        click_help_text = "help"
+
+        @staticmethod
+        def click_command():
+            RESULTS.append(Result("crit", True, "justification"))
+
+        click_evaluator_callback = evaluator_callback
+
+    monkeypatch.setenv("evidence_path", str(tmp_path))
+    app = make_autopilot_app(ProfiledProvider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app, ["--profile", mode])
+
+    assert result.exit_code == 0, result.output
+    assert_result_status(result.output, "GREEN")
+    assert sorted(p.name for p in tmp_path.iterdir()) == expected_files
+    if mode == "cprofile":
+        assert "click_command" in (tmp_path / "profile-profiled.txt").read_text()
+
+
+@protect_results
+def test_app_profiling_can_be_enabled_by_environment(monkeypatch, tmp_path):
+    class SubProvider:
+        click_name = "sub"
+
+        @staticmethod
+        def click_command():
+            pass
+
+    class MainProvider:
+        click_name = "main"
+        click_help_text = "help"
+        click_subcommands = [SubProvider]
+
+    monkeypatch.setenv("evidence_path", str(tmp_path))
+    monkeypatch.setenv("AUTOPILOT_PROFILE", "cprofile")
+    app = make_autopilot_app(MainProvider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app, ["sub"])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "profile-main.pstats").exists()
+
+
+def test_app_is_not_profiled_by_default(monkeypatch, tmp_path):
+    class Provider:
+        click_name = "not_profiled"
+
+        @staticmethod
+        def click_command():
+            pass
+
+    monkeypatch.setenv("evidence_path", str(tmp_path))
+    monkeypatch.delenv("AUTOPILOT_PROFILE", raising=False)
+    app = make_autopilot_app(Provider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app, [])
+
+    assert result.exit_code == 0, result.output
+    assert list(tmp_path.iterdir()) == []
+
+
+@protect_results
+def test_metrics_are_printed_if_requested(monkeypatch, tmp_path):
+    class MeasuredProvider:
+        click_name = "measured"
+        click_help_text = "help"
+
+        @staticmethod
+        def click_command():
+            with METRICS.span("phase"):
+                METRICS.increment("requests", 2)
+            RESULTS.append(Result("crit", True, "justification"))
+
+        click_evaluator_callback = DEFAULT_EVALUATOR
+
+    metrics_file = tmp_path / "metrics.json"
+    monkeypatch.setenv("AUTOPILOT_METRICS", "1")
+    monkeypatch.setenv("AUTOPILOT_METRICS_FILE", str(metrics_file))
+    app = make_autopilot_app(MeasuredProvider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app, [])
+
+    assert result.exit_code == 0, result.output
+    assert_result_status(result.output, "GREEN")
+    metrics = json.loads(result.output.splitlines()[-1])["metrics"]
+    assert metrics["counters"] == {"requests": 2}
+    assert set(metrics["spans"]) == {"phase", "total"}
+    assert json.loads(metrics_file.read_text()) == metrics
+    assert not METRICS.enabled
+
+
+@protect_results
+def test_metrics_are_not_printed_by_default(monkeypatch):
+    class Provider:
+        click_name = "not_measured"
+
+        @staticmethod
+        def click_command():
+            assert not METRICS.enabled
+
+    monkeypatch.delenv("AUTOPILOT_METRICS", raising=False)
+    monkeypatch.delenv("AUTOPILOT_METRICS_FILE", raising=False)
+    app = make_autopilot_app(Provider, version_callback=lambda: "1")
+
+    result = click.testing.CliRunner().invoke(app, [])
+
+    assert result.exit_code == 0, result.output
+    assert "metrics" not in result.output
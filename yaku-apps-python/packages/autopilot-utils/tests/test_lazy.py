@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import subprocess
+import sys
+
+import pytest
+from yaku.autopilot_utils.lazy import LazyCallable, lazy_callable
+
+
+def test_lazy_callable_imports_module_only_when_called(monkeypatch):
+    monkeypatch.delitem(sys.modules, "json.tool", raising=False)
+    lazy_main = lazy_callable("json.tool:main")
+    assert "json.tool" not in sys.modules
+    assert not lazy_main.is_resolved
+
+    resolved = lazy_main.resolve()
+
+    assert "json.tool" in sys.modules
+    assert lazy_main.is_resolved
+    assert resolved is sys.modules["json.tool"].main
+
+
+def test_lazy_callable_forwards_arguments():
+    lazy_join = lazy_callable("os.path:join")
+    assert lazy_join("a", "b") == "a/b"
+
+
+def test_lazy_callable_raises_import_errors_on_first_call():
+    lazy_missing = lazy_callable("yaku.does_not_exist:function")
+    with pytest.raises(ModuleNotFoundError):
+        lazy_missing()
+    assert not lazy_missing.is_resolved
+
+
+def test_lazy_callable_raises_for_missing_attribute():
+    with pytest.raises(AttributeError):
+        lazy_callable("os.path:does_not_exist")()
+
+
+@pytest.mark.parametrize("target", ["os.path", "os.path:", ":join", ""])
+def test_lazy_callable_rejects_invalid_targets(target):
+    with pytest.raises(ValueError, match="package.module:attribute"):
+        LazyCallable(target)
+
+
+def test_cli_base_does_not_import_pydantic():
+    code = (
+        "import sys; import yaku.autopilot_utils.cli_base; "
+        "print('pydantic' in sys.modules, 'yaku.autopilot_utils.subprocess' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    ).stdout
+    assert output.strip() == "False False"
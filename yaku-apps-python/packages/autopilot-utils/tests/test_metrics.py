@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from yaku.autopilot_utils.metrics import MetricsCollector
+
+
+@pytest.fixture
+def metrics():
+    collector = MetricsCollector()
+    collector.enable()
+    return collector
+
+
+def test_nothing_is_collected_if_disabled():
+    metrics = MetricsCollector()
+    with metrics.span("phase"):
+        pass
+    metrics.increment("requests")
+    metrics.record("phase", 1.0)
+
+    assert metrics.to_dict() == {"spans": {}, "counters": {}}
+
+
+def test_disabled_spans_are_shared():
+    metrics = MetricsCollector()
+    assert metrics.span("a") is metrics.span("b")
+
+
+def test_spans_are_aggregated_by_name(metrics, mocker):
+    mocker.patch(
+        "yaku.autopilot_utils.metrics.time.perf_counter", side_effect=[1.0, 3.0, 10.0, 10.5]
+    )
+    with metrics.span("download"):
+        pass
+    with metrics.span("download"):
+        pass
+
+    assert metrics.to_dict()["spans"] == {
+        "download": {"count": 2, "total_seconds": 2.5, "max_seconds": 2.0}
+    }
+
+
+def test_span_is_recorded_if_exception_is_raised(metrics):
+    with pytest.raises(ValueError):
+        with metrics.span("failing"):
+            raise ValueError()
+
+    assert metrics.spans["failing"].count == 1
+
+
+def test_timed_decorator_records_calls(metrics):
+    @metrics.timed("work")
+    def work(x):
+        return x * 2
+
+    @metrics.timed()
+    def other_work():
+        pass
+
+    assert work(2) == 4
+    other_work()
+
+    assert metrics.spans["work"].count == 1
+    assert "test_timed_decorator_records_calls.<locals>.other_work" in metrics.spans
+
+
+def test_counters_are_incremented_from_threads(metrics):
+    def count():
+        for _ in range(1000):
+            metrics.increment("requests")
+        metrics.increment("bytes", 0.5)
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.counters == {"requests": 4000, "bytes": 2.0}
+
+
+def test_clear_removes_all_metrics(metrics):
+    metrics.increment("requests")
+    metrics.record("phase", 1.0)
+    metrics.clear()
+    assert metrics.to_dict() == {"spans": {}, "counters": {}}
+
+
+def test_metrics_are_emitted_as_json_line(metrics):
+    metrics.increment("requests", 3)
+    stream = io.StringIO()
+
+    metrics.emit(stream)
+
+    assert stream.getvalue().endswith("\n")
+    assert json.loads(stream.getvalue()) == {
+        "metrics": {"spans": {}, "counters": {"requests": 3}}
+    }
+
+
+def test_metrics_are_written_to_file(metrics, tmp_path: Path):
+    metrics.record("phase", 0.25)
+    metrics.write(tmp_path / "metrics.json")
+
+    assert json.loads((tmp_path / "metrics.json").read_text()) == {
+        "spans": {"phase": {"count": 1, "total_seconds": 0.25, "max_seconds": 0.25}},
+        "counters": {},
+    }
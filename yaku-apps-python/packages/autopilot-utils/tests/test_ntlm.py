@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from requests_ntlm import HttpNtlmAuth
+from yaku.autopilot_utils.ntlm import (
+    ConnectionStats,
+    CountingNtlmAuth,
+    PooledAdapter,
+    create_ntlm_session,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(server_url):
+    stats = ConnectionStats()
+    session = create_ntlm_session("user", "password", connection_stats=stats)
+
+    for _ in range(3):
+        assert session.get(server_url).text == "ok"
+
+    assert stats.requests == 3
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 2
+    assert stats.handshakes == 0
+
+
+def test_pool_is_not_exceeded_by_concurrent_requests(server_url):
+    stats = ConnectionStats()
+    session = create_ntlm_session("user", "password", pool_size=2, connection_stats=stats)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: session.get(server_url), range(40)))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert stats.requests == 40
+    assert stats.connections_opened <= 2
+
+
+def test_custom_adapter_is_used():
+    adapter = PooledAdapter(pool_size=4)
+    session = create_ntlm_session("user", "password", adapter=adapter)
+
+    assert session.get_adapter("https://some.server") is adapter
+    assert session.auth.connection_stats is adapter.connection_stats
+    assert session.verify is False
+
+
+def test_handshakes_are_counted():
+    stats = ConnectionStats()
+    auth = CountingNtlmAuth("user", "password", stats)
+    response = mock.Mock(status_code=401, headers={"www-authenticate": "NTLM"})
+
+    with mock.patch.object(
+        HttpNtlmAuth, "retry_using_http_NTLM_auth", return_value="authenticated"
+    ) as retry:
+        assert auth.response_hook(response) == "authenticated"
+        assert auth.response_hook(mock.Mock(status_code=200)) is not None
+
+    retry.assert_called_once()
+    assert stats.handshakes == 1
+    assert "1 NTLM handshakes" in stats.summary()
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2024 grow platform GmbH
+#
+# SPDX-License-Identifier: MIT
+
+import pstats
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from yaku.autopilot_utils.profiling import AppProfiler, get_profile_output_path
+
+
+def _busy_function():
+    return sum(len(str(i)) for i in range(10_000))
+
+
+def test_profile_output_path_is_evidence_path(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("evidence_path", str(tmp_path))
+    assert get_profile_output_path() == tmp_path
+
+
+def test_profile_output_path_defaults_to_working_directory(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("evidence_path", raising=False)
+    monkeypatch.chdir(tmp_path)
+    assert get_profile_output_path() == tmp_path
+
+
+def test_unknown_profile_mode_is_rejected(tmp_path: Path):
+    with pytest.raises(ValueError, match="Unknown profile mode 'perf'"):
+        AppProfiler("perf", "app", output_path=tmp_path)
+
+
+def test_cprofile_writes_stats_and_summary(tmp_path: Path):
+    profiler = AppProfiler("cprofile", "app", output_path=tmp_path, top_entries=5)
+    profiler.start()
+    _busy_function()
+    files = profiler.stop()
+
+    assert files == [tmp_path / "profile-app.pstats", tmp_path / "profile-app.txt"]
+    stats = pstats.Stats(str(files[0]))
+    assert any(name == "_busy_function" for (_, _, name) in stats.stats)  # type: ignore
+    assert "_busy_function" in files[1].read_text()
+
+
+def test_top_entries_can_be_set_by_environment(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("AUTOPILOT_PROFILE_TOP", "3")
+    assert AppProfiler("cprofile", "app", output_path=tmp_path).top_entries == 3
+    monkeypatch.setenv("AUTOPILOT_PROFILE_TOP", "many")
+    assert AppProfiler("cprofile", "app", output_path=tmp_path).top_entries == 30
+
+
+def test_tracemalloc_writes_allocation_summary(tmp_path: Path):
+    profiler = AppProfiler("tracemalloc", "app", output_path=tmp_path, top_entries=3)
+    profiler.start()
+    data = [str(i) * 10 for i in range(10_000)]
+    files = profiler.stop()
+
+    assert files == [tmp_path / "allocations-app.txt"]
+    summary = files[0].read_text()
+    assert "Peak traced memory:" in summary
+    assert "test_profiling.py" in summary
+    assert len(summary.splitlines()) <= 4 + 3
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_tracemalloc_is_not_stopped_if_it_was_already_running(tmp_path: Path):
+    tracemalloc.start()
+    try:
+        profiler = AppProfiler("tracemalloc", "app", output_path=tmp_path)
+        profiler.start()
+        profiler.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
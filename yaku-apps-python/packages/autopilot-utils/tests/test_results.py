@@ -2,12 +2,19 @@
 #
 # SPDX-License-Identifier: MIT
 
+import io
 import json
 import random
 from typing import List, Optional
 
 import pytest
-from yaku.autopilot_utils.results import Output, Result, ResultsCollector
+from yaku.autopilot_utils.results import (
+    CompactResult,
+    Output,
+    Result,
+    ResultsCollector,
+    results_to_json,
+)
 
 
 def test_output_dataclass():
@@ -133,3 +140,96 @@ def test_collector_can_export_to_json():
     for nr, line in enumerate(json_string.split("\n")):
         data = json.loads(line)
         assert Result(**data["result"]) == results[nr]
+
+
+def test_streaming_collector_writes_results_when_they_are_appended():
+    collector = ResultsCollector()
+    r1 = Result(criterion="foo", fulfilled=False, justification="bar")
+    r2 = Result(criterion="other foo", fulfilled=True, justification="some bar")
+    r3 = Result(criterion="third foo", fulfilled=True, justification="more bar")
+    collector.append(r1)
+    stream = io.StringIO()
+
+    collector.stream_to(stream)
+    assert stream.getvalue() == json.dumps({"result": r1.__dict__}) + "\n"
+    collector.extend([r2, r3])
+
+    lines = stream.getvalue().splitlines()
+    assert [Result(**json.loads(line)["result"]) for line in lines] == [r1, r2, r3]
+    assert "\n".join(lines) == ResultsCollector([r1, r2, r3]).to_json()
+    assert collector.to_json() == ""
+
+
+def test_streaming_collector_only_keeps_counters_and_unfulfilled_results():
+    collector = ResultsCollector()
+    collector.stream_to(io.StringIO())
+    r1 = Result(criterion="foo", fulfilled=False, justification="bar")
+    collector.append(Result(criterion="other foo", fulfilled=True, justification="some bar"))
+    collector.append(r1)
+
+    assert list(collector) == [r1]
+    assert collector.unfulfilled() == [r1]
+    assert collector.fulfilled_count == 1
+    assert collector.unfulfilled_count == 1
+    assert collector.result_count == 2
+    assert not collector
+
+    collector.stop_streaming()
+    assert not collector.is_streaming
+    assert collector.result_count == 1
+
+
+def test_buffering_collector_writes_results_on_request():
+    collector = ResultsCollector()
+    r1 = Result(criterion="foo", fulfilled=False, justification="bar")
+    r2 = Result(criterion="other foo", fulfilled=True, justification="some bar")
+    collector.stream_to_buffer(max_memory=10)
+    collector.extend([r1, r2])
+    assert collector.is_buffering
+    assert collector.result_count == 2
+
+    output = io.StringIO()
+    collector.write_buffer(output)
+    assert output.getvalue() == ResultsCollector([r1, r2]).to_json() + "\n"
+
+    collector.stop_streaming()
+    assert not collector.is_buffering
+    output = io.StringIO()
+    collector.write_buffer(output)
+    assert output.getvalue() == ""
+
+
+def test_compact_result_is_immutable_and_interns_criterion():
+    r1 = CompactResult("".join(["some ", "criterion"]), "true", "justification")
+    r2 = CompactResult("".join(["some ", "criterion"]), 0, "justification")
+    assert r1.fulfilled is True
+    assert r2.fulfilled is False
+    assert r1.criterion is r2.criterion
+    assert not hasattr(r1, "__dict__")
+    with pytest.raises(AttributeError):
+        r1.fulfilled = False  # type: ignore
+    with pytest.raises(ValueError):
+        CompactResult("c", "maybe", "j")
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(criterion="foo", fulfilled=False, justification="bar"),
+        dict(criterion='quoted "foo"\n', fulfilled=True, justification="bär ✓"),
+        dict(criterion="foo", fulfilled=True, justification="bar", metadata={"a": [1, None]}),
+        dict(criterion=None, fulfilled=True, justification=1.5, metadata=None),
+    ],
+)
+def test_results_are_serialized_like_json_dumps(kwargs):
+    expected = json.dumps({"result": Result(**kwargs).__dict__})
+    assert results_to_json([Result(**kwargs)]) == expected
+    assert results_to_json([CompactResult(**kwargs)]) == expected
+
+
+def test_collector_accepts_compact_results():
+    collector = ResultsCollector()
+    collector.append(CompactResult("foo", False, "bar"))
+    collector.append(Result("foo", True, "bar"))
+    assert collector.unfulfilled_count == 1
+    assert len(collector.to_json().splitlines()) == 2
@@ -2,7 +2,14 @@
 #
 # SPDX-License-Identifier: MIT
 
+import json
+import os
+import subprocess
+import sys
+import time
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
 
 import pytest
 from _pytest.logging import LogCaptureFixture
@@ -15,8 +22,14 @@ from yaku.autopilot_utils.subprocess import (
     ResultsCollector,
     gen_exit_for_returncode,
     gen_raise_for_status,
+    merge_process_results,
+    parse_autopilot_output,
+    parse_json_lines,
     parse_json_lines_into_list,
     parse_json_lines_into_map,
+    run,
+    run_many,
+    run_streaming,
 )
 
 
@@ -214,3 +227,160 @@ def test_gen_raise_for_status_does_not_ignore_none_status_if_not_ignored():
     raise_for_status = gen_raise_for_status(DummyProcessResult(returncode=0, status=None))
     with pytest.raises(AutopilotSubprocessFailure):
         raise_for_status(ignore_no_status=False)
+
+
+AUTOPILOT_STDOUT = os.linesep.join(
+    [
+        "INFO  | starting",
+        json.dumps({"output": {"key1": "value1"}}),
+        json.dumps({"status": "RED", "reason": "first reason"}),
+        "  some indented log line  ",
+        json.dumps({"result": {"criterion": "c1", "fulfilled": False, "justification": "j1"}}),
+        json.dumps({"result": {}}),
+        "{not json",
+        json.dumps({"output": {"key1": "value2", "key2": "value3"}}),
+        json.dumps({"result": {"criterion": "c2", "fulfilled": True, "justification": "j2"}}),
+        json.dumps({"status": "GREEN"}),
+        "",
+        "INFO  | done",
+    ]
+)
+
+
+def test_parse_autopilot_output_gives_same_results_as_separate_parsers():
+    parsed = parse_autopilot_output(AUTOPILOT_STDOUT)
+
+    assert parsed.status == parse_json_lines(AUTOPILOT_STDOUT, "status") == "GREEN"
+    assert parsed.reason == parse_json_lines(AUTOPILOT_STDOUT, "reason") == "first reason"
+    assert parsed.results == parse_json_lines_into_list(AUTOPILOT_STDOUT, "result", cls=Result)
+    assert [r.criterion for r in parsed.results] == ["c1", "c2"]
+    assert parsed.outputs == parse_json_lines_into_map(AUTOPILOT_STDOUT, "output")
+    assert parsed.outputs == {"key1": "value2", "key2": "value3"}
+    assert parsed.clean_stdout == os.linesep.join(
+        ["INFO  | starting", "  some indented log line  ", "{not json", "", "INFO  | done"]
+    )
+
+
+def test_parse_autopilot_output_ignores_json_lines_without_object():
+    parsed = parse_autopilot_output(os.linesep.join(["42", "null", '"text"', "[1, 2]", "log"]))
+    assert parsed.status is None
+    assert parsed.results == []
+    assert parsed.clean_stdout == "log"
+
+
+CHILD_SCRIPT = """
+import json, sys
+print("log line 1")
+print(json.dumps({"output": {"key": "value"}}))
+print("error line", file=sys.stderr)
+print(json.dumps({"result": {"criterion": "c", "fulfilled": True, "justification": "j"}}))
+print(json.dumps({"status": "GREEN", "reason": "all good"}))
+print("log line 2", end="")
+"""
+
+
+@pytest.mark.parametrize("script", [CHILD_SCRIPT, CHILD_SCRIPT + "print()", "", "exit(3)"])
+def test_run_streaming_gives_same_result_as_run(script):
+    command = [sys.executable, "-c", script]
+    expected = run(command)
+    result = run_streaming(command, forward_output=False)
+
+    for attribute in (
+        "returncode",
+        "stdout",
+        "stderr",
+        "status",
+        "reason",
+        "clean_stdout",
+        "results",
+        "outputs",
+    ):
+        assert getattr(result, attribute) == getattr(expected, attribute), attribute
+
+
+def test_run_streaming_forwards_output_only_once(capsys):
+    result = run_streaming([sys.executable, "-c", CHILD_SCRIPT])
+
+    captured = capsys.readouterr()
+    assert captured.out == "log line 1\nlog line 2\n"
+    assert captured.err == "error line\n"
+    assert result.status == "GREEN"
+
+    result.exit_for_returncode()
+    assert capsys.readouterr().out == ""
+
+
+def test_run_streaming_kills_subprocess_after_timeout():
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming(
+            [
+                sys.executable,
+                "-c",
+                "import time; print('started', flush=True); time.sleep(10)",
+            ],
+            forward_output=False,
+            timeout=0.5,
+        )
+
+
+def _child(name: str, sleep: float = 0.0, output: str = "value") -> List[str]:
+    script = f"""
+import json, time
+time.sleep({sleep})
+print(json.dumps({{"output": {{"key": "{output}", "{name}": "{name}"}}}}))
+print(json.dumps({{"result": {{"criterion": "{name}", "fulfilled": True, "justification": ""}}}}))
+print(json.dumps({{"status": "GREEN"}}))
+"""
+    return [sys.executable, "-c", script]
+
+
+def _parallel_child(name: str, barrier_path: Path, count: int, sleep: float) -> List[str]:
+    """Child which only succeeds if all `count` children are running at the same time."""
+    script = f"""
+import json, os, time
+barrier_path = {str(barrier_path)!r}
+open(os.path.join(barrier_path, {name!r}), "w").close()
+deadline = time.monotonic() + 30
+while len(os.listdir(barrier_path)) < {count} and time.monotonic() < deadline:
+    time.sleep(0.01)
+all_running = len(os.listdir(barrier_path)) >= {count}
+time.sleep({sleep})
+print(json.dumps({{"result": {{"criterion": "{name}", "fulfilled": all_running, "justification": ""}}}}))
+print(json.dumps({{"status": "GREEN"}}))
+"""
+    return [sys.executable, "-c", script]
+
+
+def test_run_many_runs_in_parallel_and_keeps_order(tmp_path: Path):
+    # the children finish in reverse order
+    results = run_many(
+        [
+            _parallel_child("first", tmp_path, 3, sleep=0.4),
+            _parallel_child("second", tmp_path, 3, sleep=0.2),
+            _parallel_child("third", tmp_path, 3, sleep=0.0),
+        ],
+        max_workers=3,
+    )
+
+    assert [r.status for r in results] == ["GREEN"] * 3
+    assert [r.results[0].criterion for r in results] == ["first", "second", "third"]
+    assert all(r.results[0].fulfilled for r in results)
+
+
+def test_run_many_limits_parallel_processes():
+    start = time.perf_counter()
+    run_many([_child("a", sleep=0.3), _child("b", sleep=0.3)], max_workers=1)
+    assert time.perf_counter() - start >= 0.6
+
+
+def test_run_many_raises_first_error_after_all_processes_have_finished():
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_many([_child("fast"), _child("slow", sleep=5)], timeout=0.5)
+
+
+def test_merge_process_results():
+    results, outputs = merge_process_results(
+        run_many([_child("first", output="1"), _child("second", output="2")])
+    )
+    assert [r.criterion for r in results] == ["first", "second"]
+    assert outputs == {"key": "2", "first": "first", "second": "second"}